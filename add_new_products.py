@@ -4,9 +4,10 @@ Add new products from Excel to products.json with images from extracted archives
 """
 
 import json
-import pandas as pd
 from pathlib import Path
+from catalog_store import write_json_atomic
 from fix_products_json import load_products_json
+from supplier_feed import FeedIndex, load_feed
 
 # Product mappings from our analysis
 PRODUCT_MAPPINGS = {
@@ -52,18 +53,13 @@ def load_image_mapping():
     with open('backend/image_mapping.json', 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def load_excel_products():
-    """Load products from Excel file"""
-    df = pd.read_excel('products/b2b-109838-products-22-01-2026.xlsx')
-    df['product_id_from_url'] = df['Image'].astype(str).str.extract(r'/p(\d+)/')
-    return df
-
-def find_excel_product(df, search_term):
-    """Find product in Excel by search term"""
-    matches = df[df['Product'].str.contains(search_term, case=False, na=False)]
-    if not matches.empty:
-        return matches.iloc[0]
-    return None
+def find_excel_product(feed_index, search_term):
+    """Find product in Excel by search term (exact name first, then first match)"""
+    match = feed_index.resolve(name=search_term, pick_first=True)
+    if match.status == 'ambiguous':
+        print(f"  NOTE: '{search_term}' matches {len(match.candidates)} products in Excel, "
+              f"using '{match.row['Product']}'")
+    return match.row
 
 def parse_product_name(product_name):
     """Extract capsule count, dose count, and weight from product name"""
@@ -177,7 +173,7 @@ def main():
     products_data = load_products_json('backend/products.json')
     
     # Load Excel and image mapping
-    excel_df = load_excel_products()
+    feed_index = FeedIndex(load_feed())
     image_mapping = load_image_mapping()
     
     # Find the fat-burners category
@@ -200,7 +196,7 @@ def main():
         print(f"\nProcessing product ID {product_id}...")
         
         # Find in Excel
-        excel_product = find_excel_product(excel_df, mapping['search_term'])
+        excel_product = find_excel_product(feed_index, mapping['search_term'])
         if excel_product is None:
             print(f"  WARNING: Could not find '{mapping['search_term']}' in Excel")
             continue
@@ -245,8 +241,7 @@ def main():
     
     # For now, save to a new file
     output_file = 'backend/products_updated.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(products_data, f, ensure_ascii=False, indent=2)
+    write_json_atomic(output_file, products_data)
     
     print(f"Saved to {output_file}")
     print("\nPlease review the file and then rename it to products.json")
@@ -6,8 +6,7 @@ Update products based on user feedback:
 3. Optimize and improve code quality
 """
 
-import json
-from fix_products_json import load_products_json
+from fix_products_json import load_products_json, save_products_json
 
 # BGN to EUR conversion rate (1 EUR = 1.95583 BGN, fixed rate)
 BGN_TO_EUR = 1.95583
@@ -135,30 +134,7 @@ def update_products_with_feedback():
     categories = data.get('categories', [])
     footer = data.get('footer', {})
     
-    lines = []
-    
-    # Write categories with 4-space indentation
-    for i, cat in enumerate(categories):
-        cat_json = json.dumps(cat, ensure_ascii=False, indent=2)
-        cat_lines = cat_json.split('\n')
-        for line in cat_lines:
-            lines.append('    ' + line)
-        
-        if i < len(categories) - 1:
-            lines[-1] = lines[-1] + ','
-    
-    # Add footer
-    lines.append('  ],')
-    footer_json = json.dumps(footer, ensure_ascii=False, indent=2)
-    footer_lines = footer_json.split('\n')
-    for i, line in enumerate(footer_lines):
-        if i == 0:
-            lines.append('  "footer": ' + line)
-        else:
-            lines.append('  ' + line)
-    
-    with open('backend/products.json', 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    save_products_json('backend/products.json', categories, footer)
     
     print("\n✓ Updated backend/products.json")
     
@@ -0,0 +1,59 @@
+"""Loading and saving the catalog files"""
+
+import os
+import shutil
+
+from catalog_serializer import dumps
+from catalog_store import CatalogStore, snapshot_path
+from fix_products_json import load_products_json
+
+
+def bench_load_products_json(benchmark, products_json_file):
+    data = benchmark(load_products_json, str(products_json_file))
+    assert data['categories']
+
+
+def bench_catalog_load_json(benchmark, page_content_file):
+    store = benchmark(CatalogStore.load, str(page_content_file), use_snapshot=False)
+    assert len(store)
+
+
+def bench_catalog_load_snapshot(benchmark, page_content_file):
+    CatalogStore.load(str(page_content_file))
+    assert os.path.exists(snapshot_path(str(page_content_file)))
+    store = benchmark(CatalogStore.load, str(page_content_file))
+    assert len(store)
+
+
+def bench_serialize_catalog(benchmark, page_content_doc):
+    text = benchmark(dumps, page_content_doc)
+    assert text.endswith('\n')
+
+
+def _copy_store(page_content_file, tmp_path):
+    path = tmp_path / 'page_content.json'
+    shutil.copy(page_content_file, path)
+    return CatalogStore.load(str(path), use_snapshot=False)
+
+
+def bench_catalog_save_full(benchmark, page_content_file, tmp_path):
+    store = _copy_store(page_content_file, tmp_path)
+
+    def save():
+        store.mark_dirty()
+        store.save()
+
+    benchmark(save)
+
+
+def bench_catalog_save_one_edit(benchmark, page_content_file, tmp_path):
+    store = _copy_store(page_content_file, tmp_path)
+    product_id = next(iter(store.iter_products()))[1]['product_id']
+    price = [0]
+
+    def edit_and_save():
+        price[0] += 1
+        with store.transaction():
+            store.update_product_field(product_id, 'public_data.price', price[0])
+
+    benchmark(edit_and_save)
@@ -0,0 +1,36 @@
+"""Unified effect mapping and scoring"""
+
+from effect_scoring import build_score_matrix, top_effects
+from unified_effects import analyze_product_effects, get_top_3_effects, invalidate_effect_cache
+
+
+def bench_analyze_product_effects(benchmark, catalog_products):
+    def analyze_all():
+        return [
+            get_top_3_effects(analyze_product_effects(product, is_bestseller))
+            for product, is_bestseller in catalog_products
+        ]
+
+    assert len(benchmark(analyze_all)) == len(catalog_products)
+
+
+def bench_analyze_product_effects_cold(benchmark, catalog_products):
+    """Same as above with the label/inference caches emptied each round"""
+    def analyze_all():
+        invalidate_effect_cache()
+        return [
+            get_top_3_effects(analyze_product_effects(product, is_bestseller))
+            for product, is_bestseller in catalog_products
+        ]
+
+    benchmark(analyze_all)
+
+
+def bench_score_matrix(benchmark, catalog_products):
+    products = [product for product, _ in catalog_products]
+    flags = [is_bestseller for _, is_bestseller in catalog_products]
+
+    def score():
+        return top_effects(build_score_matrix(products, flags))
+
+    assert len(benchmark(score)) == len(products)
@@ -0,0 +1,46 @@
+"""Supplier feed ingestion (.xlsx parse, Parquet cache, lookup index)"""
+
+import pytest
+
+from conftest import make_feed_frame
+
+pytest.importorskip('pandas')
+pytest.importorskip('openpyxl')
+
+from supplier_feed import FeedIndex, load_feed, parse_feed  # noqa: E402
+
+FEED_ROWS = [1000, 6000]
+
+
+@pytest.fixture(scope='module', params=FEED_ROWS)
+def feed_file(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp(f'feed-{request.param}') / 'b2b-bench.xlsx'
+    make_feed_frame(request.param).to_excel(path, index=False)
+    return path
+
+
+def bench_parse_feed(benchmark, feed_file):
+    df = benchmark.pedantic(parse_feed, args=(feed_file,), rounds=3, iterations=1)
+    assert len(df)
+
+
+def bench_load_feed_cached(benchmark, feed_file):
+    df = load_feed(feed_file)
+    if not any(feed_file.parent.glob('.*.feed-cache.parquet')):
+        pytest.skip('Parquet engine not installed')
+    assert len(benchmark(load_feed, feed_file)) == len(df)
+
+
+def bench_feed_index_build(benchmark, feed_file):
+    df = load_feed(feed_file)
+    benchmark(FeedIndex, df)
+
+
+def bench_feed_index_resolve(benchmark, feed_file):
+    index = FeedIndex(load_feed(feed_file))
+    names = list(index.df['Product'][::25])
+
+    def resolve_all():
+        return [index.resolve(name=name[:20]) for name in names]
+
+    benchmark(resolve_all)
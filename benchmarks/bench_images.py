@@ -0,0 +1,74 @@
+"""Image pipeline: archive import, classification, fingerprints, derivatives"""
+
+import random
+
+import pytest
+
+from conftest import SEED, make_archives, make_image_bytes
+
+pytest.importorskip('PIL')
+
+from image_classifier import extract_features  # noqa: E402
+from image_derivatives import available_formats, generate_derivatives  # noqa: E402
+from image_similarity import build_index, fingerprint_images, pick_best_copies  # noqa: E402
+from image_store import ImageStore  # noqa: E402
+from process_product_images import stream_archive_images  # noqa: E402
+
+ARCHIVES = 20
+
+
+@pytest.fixture(scope='module')
+def archives(tmp_path_factory):
+    return make_archives(tmp_path_factory.mktemp('archives'), ARCHIVES)
+
+
+@pytest.fixture(scope='module')
+def image_files(tmp_path_factory):
+    rng = random.Random(SEED)
+    directory = tmp_path_factory.mktemp('images')
+    paths = []
+    for n in range(ARCHIVES * 4):
+        path = directory / f'image{n}.jpg'
+        path.write_bytes(make_image_bytes(rng, label=n % 4 == 3))
+        paths.append(str(path))
+    return paths
+
+
+def bench_stream_archives(benchmark, archives, tmp_path):
+    def import_all():
+        store = ImageStore(tmp_path / 'store', tmp_path / 'index.json')
+        images = [stream_archive_images(zip_file, tmp_path / zip_file.stem, store) for zip_file in archives]
+        store.save()
+        return images
+
+    assert len(benchmark(import_all)) == len(archives)
+
+
+def bench_classifier_features(benchmark, image_files):
+    features = benchmark(extract_features, image_files, 1)
+    assert len(features) == len(image_files)
+
+
+def bench_fingerprint_and_dedupe(benchmark, image_files):
+    def dedupe():
+        fingerprints = fingerprint_images(image_files, 1)
+        tree = build_index(fingerprints)
+        return pick_best_copies(image_files, fingerprints, tree)
+
+    kept, dropped = benchmark(dedupe)
+    assert len(kept) + len(dropped) == len(image_files)
+
+
+def bench_derivatives(benchmark, image_files, tmp_path):
+    formats = [fmt for fmt in available_formats() if fmt[0] == 'WEBP']
+    if not formats:
+        pytest.skip('Pillow has no WebP encoder')
+    source = image_files[0]
+    counter = [0]
+
+    def generate():
+        # A fresh directory each round so nothing is skipped as existing
+        counter[0] += 1
+        return generate_derivatives(source, formats, tmp_path / str(counter[0]))
+
+    benchmark.pedantic(generate, rounds=5, iterations=1)
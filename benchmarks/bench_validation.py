@@ -0,0 +1,18 @@
+"""Product validation"""
+
+from process_product_images import validate_product_fields
+from validate_products import validate_product
+
+
+def bench_validate_product(benchmark, catalog_products):
+    def validate_all():
+        return [validate_product(product, is_bestseller) for product, is_bestseller in catalog_products]
+
+    assert len(benchmark(validate_all)) == len(catalog_products)
+
+
+def bench_validate_product_fields(benchmark, catalog_products):
+    def validate_all():
+        return [validate_product_fields(product, 'bench') for product, _ in catalog_products]
+
+    benchmark(validate_all)
@@ -0,0 +1,146 @@
+"""
+Shared fixtures and synthetic data for the catalog tooling benchmarks.
+
+Catalog sizes come from the BENCH_SIZES environment variable (comma
+separated product counts, default "46,1000,10000"); add 100000 for the
+full-scale runs. Every benchmark taking a `catalog_size` argument is run
+once per size.
+"""
+
+import io
+import os
+import random
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PAGE_CONTENT = REPO_ROOT / 'backend' / 'page_content.json'
+DEFAULT_SIZES = '46,1000,10000'
+SEED = 20260122
+
+
+def bench_sizes():
+    return [int(size) for size in os.environ.get('BENCH_SIZES', DEFAULT_SIZES).split(',') if size.strip()]
+
+
+def pytest_generate_tests(metafunc):
+    if 'catalog_size' in metafunc.fixturenames:
+        metafunc.parametrize('catalog_size', bench_sizes(), scope='session')
+
+
+def make_page_content(n_products, seed=SEED):
+    """page_content.json document with n_products generated products (see catalog_generator)"""
+    from catalog_generator import generate_page_content
+
+    return generate_page_content(n_products, seed, PAGE_CONTENT)
+
+
+def products_json_from(doc):
+    """products.json layout ({"product_categories", "footer"}) for a page_content document"""
+    return {
+        'product_categories': [c for c in doc['page_content'] if c.get('type') == 'product_category'],
+        'footer': doc.get('footer', {})
+    }
+
+
+def make_feed_frame(n_rows, seed=SEED):
+    """Supplier feed DataFrame with the columns of the B2B export"""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    words = ['Fat', 'Burner', 'Thermo', 'Caps', 'Lipo', 'Black', 'Whey', 'Protein',
+             'L-Carnitine', 'Green', 'Tea', 'Extreme', 'Max', 'Ultra', 'Shred', 'Lean']
+    rows = []
+    for i in range(n_rows):
+        product_id = 10000 + i // 3
+        name = ' '.join(rng.sample(words, 3)) + f' {product_id}'
+        price = round(rng.uniform(10, 120), 2)
+        rows.append({
+            'SKU': f'SKU-{i}',
+            'Product': name,
+            'Option': rng.choice(['', '60 caps', '120 caps', 'Lemon', 'Cola']),
+            'Price': price,
+            'Discount': 0,
+            'B2B price': round(price * 0.7, 2),
+            'EAN': str(3800000000000 + i),
+            'Available': rng.choice(['Yes', 'No']),
+            'Label': '',
+            'Image': f'https://cdn.example.com/products/v3/p{product_id}/image.jpg'
+        })
+    return pd.DataFrame(rows)
+
+
+def make_image_bytes(rng, label, size=(480, 640)):
+    """A JPEG that looks like a label (white, text-like lines) or a packshot"""
+    from PIL import Image, ImageDraw
+
+    if label:
+        image = Image.new('RGB', size, 'white')
+        draw = ImageDraw.Draw(image)
+        for y in range(20, size[1] - 20, 14):
+            draw.line((20, y, rng.randint(size[0] // 2, size[0] - 20), y), fill='black', width=2)
+    else:
+        image = Image.new('RGB', size, tuple(rng.randint(0, 255) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((size[0] // 4, size[1] // 6, 3 * size[0] // 4, 5 * size[1] // 6),
+                       fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    out = io.BytesIO()
+    image.save(out, 'JPEG', quality=85)
+    return out.getvalue()
+
+
+def make_archives(directory, n_archives, images_per_archive=4, seed=SEED):
+    """Write f1_b2b_<id>.zip supplier archives into directory"""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for n in range(n_archives):
+        with zipfile.ZipFile(directory / f'f1_b2b_{10000 + n}.zip', 'w') as zf:
+            for k in range(images_per_archive):
+                label = k == images_per_archive - 1
+                # Every other label is only recognisable by its content
+                name = f'supp-facts{n}.jpg' if label and n % 2 else f'image{n}-{k}.jpg'
+                zf.writestr(name, make_image_bytes(rng, label))
+    return sorted(directory.glob('*.zip'))
+
+
+@pytest.fixture(scope='session')
+def page_content_doc(catalog_size):
+    return make_page_content(catalog_size)
+
+
+@pytest.fixture(scope='session')
+def page_content_file(tmp_path_factory, page_content_doc, catalog_size):
+    from catalog_store import write_json_atomic
+
+    path = tmp_path_factory.mktemp(f'catalog-{catalog_size}') / 'page_content.json'
+    write_json_atomic(path, page_content_doc)
+    return path
+
+
+@pytest.fixture(scope='session')
+def products_json_file(tmp_path_factory, page_content_doc, catalog_size):
+    from catalog_store import write_json_atomic
+
+    path = tmp_path_factory.mktemp(f'products-{catalog_size}') / 'products.json'
+    write_json_atomic(path, products_json_from(page_content_doc))
+    return path
+
+
+@pytest.fixture(scope='session')
+def catalog_products(page_content_doc):
+    """(product, is_bestseller) pairs of the synthetic catalog"""
+    pairs = []
+    for category in page_content_doc['page_content']:
+        if category.get('type') != 'product_category':
+            continue
+        title = (category.get('title') or '').lower()
+        # Same rule as validate_products.main()
+        is_bestseller = 'bestseller' in title or 'бестселър' in title
+        pairs.extend((product, is_bestseller) for product in category.get('products', []))
+    return pairs
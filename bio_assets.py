@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Move the inline base64 images of bio_content.json out into asset files.
+
+The bio admin stores uploaded pictures and icons as data: URLs inside the
+document (`images`, `iconOverrides`), which makes bio_content.json several
+MB of base64 that every load parses and every save rewrites.
+
+extract_images() writes each embedded image to images/bio/ under a
+content hash (identical uploads share one file) and replaces the data URL
+with that path, which bio.html can use as an <img src> directly.
+inline_images() reverses this, e.g. to export a self-contained document.
+
+Usage:
+    python bio_assets.py extract [--recompress] [bio_content.json]
+    python bio_assets.py inline [bio_content.json] [-o OUTPUT]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import re
+import sys
+from io import BytesIO
+from pathlib import Path
+from catalog_store import write_json_atomic
+
+BIO_CONTENT = Path('bio_content.json')
+ASSET_DIR = Path('images/bio')
+HASH_LENGTH = 16
+
+DATA_URL_RE = re.compile(r'^data:(image/[\w.+-]+);base64,(.*)$', re.DOTALL)
+ASSET_REF_RE = re.compile(r'^images/bio/[0-9a-f]{%d}\.\w+$' % HASH_LENGTH)
+
+# Magic bytes -> (mime type, extension); admin uploads are not always
+# labelled correctly (PNGs saved as data:image/jpeg)
+SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'image/png', '.png'),
+    (b'\xff\xd8\xff', 'image/jpeg', '.jpg'),
+    (b'GIF8', 'image/gif', '.gif'),
+]
+MIME_EXTENSIONS = {
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/avif': '.avif',
+    'image/svg+xml': '.svg',
+}
+# Extension of an extracted asset -> the mime type it was stored under
+EXTENSION_MIMES = {ext: mime for mime, ext in MIME_EXTENSIONS.items() if mime != 'image/jpg'}
+
+
+def sniff_type(data, declared=None):
+    """(mime type, extension) from the file contents, else the declared mime type"""
+    for magic, mime, ext in SIGNATURES:
+        if data.startswith(magic):
+            return mime, ext
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp', '.webp'
+    if declared in MIME_EXTENSIONS:
+        return declared, MIME_EXTENSIONS[declared]
+    return 'application/octet-stream', '.bin'
+
+
+def recompress(data, mime):
+    """
+    Losslessly re-encode PNGs with maximum compression.
+
+    Other formats are returned as they are: re-saving a JPEG decodes and
+    re-quantizes it and drops its ICC profile and EXIF. Returns the smaller
+    of the original and re-encoded bytes. Needs Pillow; without it the data
+    is returned unchanged.
+    """
+    if mime != 'image/png':
+        return data
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+
+    try:
+        with Image.open(BytesIO(data)) as image:
+            out = BytesIO()
+            image.save(out, 'PNG', optimize=True)
+    except (OSError, ValueError):
+        return data
+    encoded = out.getvalue()
+    return encoded if len(encoded) < len(data) else data
+
+
+def _walk(value, replace):
+    """Rebuild value with replace() applied to every string"""
+    if isinstance(value, dict):
+        return {key: _walk(item, replace) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_walk(item, replace) for item in value]
+    if isinstance(value, str):
+        return replace(value)
+    return value
+
+
+def extract_images(doc, asset_dir=ASSET_DIR, optimize=False):
+    """
+    Replace every data:image URL in doc with a content-hashed asset path.
+
+    Returns (new_doc, stats) where stats has 'images', 'files_written' and
+    'bytes_inline' (base64 characters removed from the document).
+    """
+    asset_dir = Path(asset_dir)
+    stats = {'images': 0, 'files_written': 0, 'bytes_inline': 0}
+
+    def replace(value):
+        match = DATA_URL_RE.match(value)
+        if not match:
+            return value
+        data = base64.b64decode(match.group(2))
+        mime, ext = sniff_type(data, match.group(1))
+        if optimize:
+            data = recompress(data, mime)
+
+        path = asset_dir / (hashlib.sha256(data).hexdigest()[:HASH_LENGTH] + ext)
+        if not path.exists():
+            asset_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name('.' + path.name + '.tmp')
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+            stats['files_written'] += 1
+
+        stats['images'] += 1
+        stats['bytes_inline'] += len(value)
+        return path.as_posix()
+
+    return _walk(doc, replace), stats
+
+
+def inline_images(doc, base_dir='.'):
+    """
+    Turn asset paths written by extract_images() back into data URLs.
+
+    Paths whose file is missing are left as they are.
+    """
+    base_dir = Path(base_dir)
+
+    def replace(value):
+        if not ASSET_REF_RE.match(value):
+            return value
+        path = base_dir / value
+        if not path.exists():
+            print(f"Warning: missing asset {value}")
+            return value
+        data = path.read_bytes()
+        mime, _ = sniff_type(data, EXTENSION_MIMES.get(path.suffix))
+        return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+    return _walk(doc, replace)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Externalize or inline bio_content.json images')
+    parser.add_argument('command', choices=['extract', 'inline'])
+    parser.add_argument('path', nargs='?', default=str(BIO_CONTENT))
+    parser.add_argument('-o', '--output', help='write here instead of overwriting path')
+    parser.add_argument('--recompress', action='store_true',
+                        help='losslessly shrink PNG assets (needs Pillow)')
+    args = parser.parse_intermixed_args(argv)
+
+    with open(args.path, 'r', encoding='utf-8') as f:
+        doc = json.load(f)
+
+    if args.command == 'extract':
+        doc, stats = extract_images(doc, optimize=args.recompress)
+        print(f"Externalized {stats['images']} images "
+              f"({stats['files_written']} new files in {ASSET_DIR}), "
+              f"removed {stats['bytes_inline'] / 1024:.0f} KB of base64")
+    else:
+        doc = inline_images(doc)
+
+    output = args.output or args.path
+    write_json_atomic(output, doc)
+    print(f"Saved {output} ({Path(output).stat().st_size / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Structural diff and KV sync planning for page_content.json.
+
+build_tree() hashes a catalog Merkle-style: every field of a product gets
+a hash, a product's hash covers its fields, a category's hash covers its
+header fields and its products in order, and the root covers everything.
+diff_trees() walks two trees and only descends where hashes differ, so
+the work is proportional to what changed; it yields ('add' | 'remove' |
+'change' | 'reorder', path) with paths such as
+('page_content', 'fat-burners', 'products', '1234', 'public_data', 'price').
+
+The same hashes drive the KV sync planner. The catalog is split into one
+KV value per top-level section, component and product (see kv_entries());
+a manifest of {key: hash} is kept next to them, and plan_sync() compares
+it with the local tree to list only the keys to put or delete. LocalKV is
+an in-memory (optionally file-backed) stand-in with the get/put/delete
+interface of the Worker's KV namespace.
+
+Usage:
+    python catalog_diff.py diff HEAD:backend/page_content.json backend/page_content.json
+    python catalog_diff.py sync backend/page_content.json --kv-file /tmp/kv.json [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+from catalog_store import write_json_atomic
+
+PAGE_CONTENT_FILE = 'backend/page_content.json'
+HASH_LENGTH = 16
+
+# Levels of product fields hashed separately (product.public_data.price)
+PRODUCT_FIELD_DEPTH = 2
+# Levels of other sections hashed separately (settings.<key>)
+SECTION_FIELD_DEPTH = 1
+
+KV_PREFIX = 'page_content'
+MANIFEST_KEY = f'{KV_PREFIX}:manifest'
+LAYOUT_KEY = f'{KV_PREFIX}:layout'
+
+
+def _digest(*parts):
+    return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+_encode = _ENCODER.encode
+
+
+class Node:
+    """Merkle tree node: hash, children by key (None for leaves), child order for lists"""
+
+    __slots__ = ('hash', 'children', 'order')
+
+    def __init__(self, hash, children=None, order=None):
+        self.hash = hash
+        self.children = children
+        self.order = order
+
+
+def _leaf(value):
+    # Strings (most leaves) are hashed as-is; the prefix keeps "1" and 1 apart
+    if isinstance(value, str):
+        return Node(_digest('s', value))
+    return Node(_digest('=', _encode(value)))
+
+
+def _node(value, depth):
+    if depth <= 0 or not isinstance(value, dict):
+        return _leaf(value)
+    children = {key: _node(item, depth - 1) for key, item in value.items()}
+    return Node(_digest('{', *(f'{key}:{children[key].hash}' for key in sorted(children))), children)
+
+
+def _keyed_list(items, key_of, node_of):
+    """Node for a list whose items have identities (components, products)"""
+    children = {}
+    for index, item in enumerate(items):
+        key = key_of(item, index)
+        while key in children:
+            key += '+'
+        children[key] = node_of(item)
+    order = list(children)
+    return Node(_digest('[', *(f'{key}:{children[key].hash}' for key in order)), children, order)
+
+
+def component_key(component, index):
+    return component.get('id') or f'#{index}' if isinstance(component, dict) else f'#{index}'
+
+
+def product_key(product, index):
+    return str(product.get('product_id') or f'#{index}') if isinstance(product, dict) else f'#{index}'
+
+
+def _is_category(component):
+    return (
+        isinstance(component, dict)
+        and component.get('type') == 'product_category'
+        and isinstance(component.get('products'), list)
+    )
+
+
+def _component_node(component):
+    if not _is_category(component):
+        return _node(component, SECTION_FIELD_DEPTH)
+    children = {
+        key: _leaf(value) if key != 'products' else
+        _keyed_list(value, product_key, lambda product: _node(product, PRODUCT_FIELD_DEPTH))
+        for key, value in component.items()
+    }
+    return Node(_digest('{', *(f'{key}:{children[key].hash}' for key in sorted(children))), children)
+
+
+def build_tree(data):
+    """Merkle tree of a page_content document"""
+    children = {}
+    for key, value in data.items():
+        if key == 'page_content' and isinstance(value, list):
+            children[key] = _keyed_list(value, component_key, _component_node)
+        else:
+            children[key] = _node(value, SECTION_FIELD_DEPTH)
+    return Node(_digest('{', *(f'{key}:{children[key].hash}' for key in sorted(children))), children)
+
+
+def diff_trees(old, new, path=()):
+    """Yield (op, path) for the differences, descending only into changed subtrees"""
+    if old.hash == new.hash:
+        return
+    if old.children is None or new.children is None:
+        yield 'change', path
+        return
+    for key in old.children:
+        if key not in new.children:
+            yield 'remove', path + (key,)
+    for key, child in new.children.items():
+        if key not in old.children:
+            yield 'add', path + (key,)
+        else:
+            yield from diff_trees(old.children[key], child, path + (key,))
+    if old.order is not None and new.order is not None:
+        if [key for key in old.order if key in new.children] != [key for key in new.order if key in old.children]:
+            yield 'reorder', path
+
+
+def diff_catalogs(old_data, new_data):
+    """List of (op, path) between two page_content documents"""
+    return list(diff_trees(build_tree(old_data), build_tree(new_data)))
+
+
+def summarize(changes):
+    """Group changes into added/removed/changed products and other paths"""
+    summary = {'added_products': [], 'removed_products': [], 'changed_products': {}, 'other': []}
+    for op, path in changes:
+        is_product = len(path) >= 4 and path[0] == 'page_content' and path[2] == 'products'
+        if is_product and len(path) == 4 and op in ('add', 'remove'):
+            summary['added_products' if op == 'add' else 'removed_products'].append(path[1:4:2])
+        elif is_product and len(path) > 4:
+            fields = summary['changed_products'].setdefault(path[1:4:2], [])
+            fields.append((op, '.'.join(path[4:])))
+        else:
+            summary['other'].append((op, '/'.join(path)))
+    return summary
+
+
+def kv_entries(data, tree=None):
+    """
+    {key: (hash, value thunk)} of the KV layout of a document.
+
+    Keys: LAYOUT_KEY (section and component order), '<prefix>:<section>'
+    per top-level section, '<prefix>:component:<key>' per component (a
+    category's products replaced by their product keys) and
+    '<prefix>:product:<component>:<product>' per product. Hashes come from
+    the Merkle tree; values are only built when a key has to be written.
+    """
+    tree = tree or build_tree(data)
+    entries = {}
+    sections = list(data)
+    page_content = tree.children.get('page_content')
+    # None when there is no component list to split
+    components = page_content.order if page_content is not None else None
+
+    layout = {'sections': sections, 'components': components}
+    entries[LAYOUT_KEY] = (_digest('layout', _encode(layout)), lambda: layout)
+
+    for section, value in data.items():
+        if section == 'page_content' and components is not None:
+            continue
+        entries[f'{KV_PREFIX}:{section}'] = (tree.children[section].hash, lambda value=value: value)
+
+    if components is None:
+        return entries
+
+    for key, component in zip(components, data['page_content']):
+        node = page_content.children[key]
+        if not _is_category(component):
+            entries[f'{KV_PREFIX}:component:{key}'] = (node.hash, lambda component=component: component)
+            continue
+
+        products = node.children['products']
+        header_hashes = [
+            f'{field}:{child.hash}' for field, child in sorted(node.children.items()) if field != 'products'
+        ]
+        header = _digest('component', *header_hashes, *products.order)
+
+        def header_value(component=component, order=products.order):
+            return {field: (order if field == 'products' else value) for field, value in component.items()}
+
+        entries[f'{KV_PREFIX}:component:{key}'] = (header, header_value)
+        for pkey, product in zip(products.order, component['products']):
+            entries[f'{KV_PREFIX}:product:{key}:{pkey}'] = (
+                products.children[pkey].hash, lambda product=product: product
+            )
+    return entries
+
+
+def plan_sync(data, remote_manifest, tree=None):
+    """
+    Keys to write and delete so a KV store holding remote_manifest matches data.
+
+    Returns {'put': {key: json string}, 'delete': [keys], 'manifest': {key: hash}}.
+    """
+    entries = kv_entries(data, tree)
+    manifest = {key: entry_hash for key, (entry_hash, _) in entries.items()}
+    put = {
+        key: json.dumps(value(), ensure_ascii=False)
+        for key, (entry_hash, value) in entries.items()
+        if remote_manifest.get(key) != entry_hash
+    }
+    delete = sorted(key for key in remote_manifest if key not in manifest)
+    return {'put': put, 'delete': delete, 'manifest': manifest}
+
+
+def read_manifest(kv):
+    raw = kv.get(MANIFEST_KEY)
+    try:
+        return json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+
+
+def apply_sync(kv, plan):
+    """
+    Write a plan so that readers never see a layout or manifest pointing at
+    missing values: new values first, then the layout that references them,
+    then the manifest, and only then delete the keys nothing points at any more.
+    """
+    for key, value in plan['put'].items():
+        if key != LAYOUT_KEY:
+            kv.put(key, value)
+    if LAYOUT_KEY in plan['put']:
+        kv.put(LAYOUT_KEY, plan['put'][LAYOUT_KEY])
+    if plan['put'] or plan['delete']:
+        kv.put(MANIFEST_KEY, json.dumps(plan['manifest'], ensure_ascii=False, sort_keys=True))
+    for key in plan['delete']:
+        kv.delete(key)
+
+
+def sync(kv, data, dry_run=False):
+    """Push only the changed keys of data to kv; returns the plan"""
+    plan = plan_sync(data, read_manifest(kv))
+    if not dry_run:
+        apply_sync(kv, plan)
+    return plan
+
+
+def assemble(kv):
+    """Rebuild the page_content document from the KV layout"""
+    layout = json.loads(kv.get(LAYOUT_KEY))
+    data = {}
+    for section in layout['sections']:
+        if section != 'page_content' or layout['components'] is None:
+            data[section] = json.loads(kv.get(f'{KV_PREFIX}:{section}'))
+            continue
+        components = []
+        for key in layout['components']:
+            component = json.loads(kv.get(f'{KV_PREFIX}:component:{key}'))
+            if _is_category(component):
+                component['products'] = [
+                    json.loads(kv.get(f'{KV_PREFIX}:product:{key}:{pkey}')) for pkey in component['products']
+                ]
+            components.append(component)
+        data[section] = components
+    return data
+
+
+class LocalKV:
+    """In-memory stand-in for a Workers KV namespace, optionally saved to a JSON file"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.values = {}
+        self.writes = 0
+        self.deletes = 0
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.values = json.load(f)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def put(self, key, value):
+        self.values[key] = value
+        self.writes += 1
+
+    def delete(self, key):
+        if self.values.pop(key, None) is not None:
+            self.deletes += 1
+
+    def list(self, prefix=''):
+        return sorted(key for key in self.values if key.startswith(prefix))
+
+    def save(self):
+        if self.path:
+            write_json_atomic(self.path, self.values)
+
+
+def load_catalog(spec):
+    """Load a catalog from a file, or from git when spec is REV:path"""
+    if not os.path.exists(spec) and ':' in spec:
+        text = subprocess.run(['git', 'show', spec], check=True, capture_output=True).stdout
+        return json.loads(text.decode('utf-8'))
+    with open(spec, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff catalogs and plan KV syncs')
+    commands = parser.add_subparsers(dest='command', required=True)
+    diff_parser = commands.add_parser('diff', help='structural diff of two catalogs')
+    diff_parser.add_argument('old', help='old catalog (file or REV:path)')
+    diff_parser.add_argument('new', nargs='?', default=PAGE_CONTENT_FILE)
+    sync_parser = commands.add_parser('sync', help='push changed keys to a local KV stand-in')
+    sync_parser.add_argument('catalog', nargs='?', default=PAGE_CONTENT_FILE)
+    sync_parser.add_argument('--kv-file', required=True, help='JSON file holding the local KV store')
+    sync_parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.command == 'diff':
+        summary = summarize(diff_catalogs(load_catalog(args.old), load_catalog(args.new)))
+        for component, product in summary['added_products']:
+            print(f"+ {component}/{product}")
+        for component, product in summary['removed_products']:
+            print(f"- {component}/{product}")
+        for (component, product), fields in summary['changed_products'].items():
+            print(f"~ {component}/{product}: " + ', '.join(
+                field if op == 'change' else f'{op} {field}' for op, field in fields
+            ))
+        for op, path in summary['other']:
+            print(f"~ {path} ({op})")
+        print(f"\n{len(summary['added_products'])} added, {len(summary['removed_products'])} removed, "
+              f"{len(summary['changed_products'])} changed products, {len(summary['other'])} other changes")
+        return 0
+
+    kv = LocalKV(args.kv_file)
+    plan = sync(kv, load_catalog(args.catalog), args.dry_run)
+    for key in plan['put']:
+        print(f"PUT    {key}")
+    for key in plan['delete']:
+        print(f"DELETE {key}")
+    print(f"\n{len(plan['put'])} puts, {len(plan['delete'])} deletes of {len(plan['manifest'])} keys"
+          + (" (dry run)" if args.dry_run else ""))
+    if not args.dry_run:
+        kv.save()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
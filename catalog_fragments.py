@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Encoded-fragment cache for partial re-serialization of page_content.json.
+
+The catalog is split into units: each top-level value (settings,
+navigation, footer, ...), each page_content component and each product of
+a product_category. parse_with_spans() parses the file and records where
+every unit's text lies; write_document() then writes the document again,
+copying the text of units that were not touched since and encoding only
+the touched ones. Editing one product costs encoding that product (and
+the small keys of its category), not the whole catalog.
+
+Units keep their text exactly as it was in the file, so the output matches
+the canonical layout of catalog_serializer whenever the input did.
+"""
+
+import hashlib
+import json
+import re
+
+from catalog_serializer import INDENT, encode_value
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def is_category(component):
+    """True for page_content components that hold a products list"""
+    return isinstance(component, dict) and isinstance(component.get('products'), list)
+
+
+def unit_paths(data):
+    """Yield (path, unit) for every cached unit of a page_content document"""
+    for key, value in data.items():
+        if key != 'page_content' or not isinstance(value, list):
+            yield (key,), value
+            continue
+        for i, component in enumerate(value):
+            yield ('page_content', i), component
+            if is_category(component):
+                for j, product in enumerate(component['products']):
+                    yield ('page_content', i, j), product
+
+
+class _Scanner:
+    """Walks JSON text with raw_decode, reporting where values start and end"""
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def peek(self):
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()
+        return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """(value, start, end) of the next JSON value"""
+        self.peek()
+        start = self.pos
+        obj, self.pos = self._decoder.raw_decode(self.text, self.pos)
+        return obj, start, self.pos
+
+    def members(self, close):
+        """Consume ',' between members; False once the closing char is reached"""
+        if self.peek() == ',':
+            self.pos += 1
+            return True
+        self.expect(close)
+        return False
+
+
+def _parse_component(scanner, i, spans):
+    """Parse one page_content component, recording its products' spans"""
+    if scanner.peek() != '{':
+        return scanner.value()
+
+    start = scanner.pos
+    scanner.expect('{')
+    component = {}
+    if scanner.peek() == '}':
+        scanner.expect('}')
+        return component, start, scanner.pos
+
+    more = True
+    while more:
+        key, _, _ = scanner.value()
+        scanner.expect(':')
+        if key == 'products' and scanner.peek() == '[':
+            scanner.expect('[')
+            products = []
+            if scanner.peek() == ']':
+                scanner.expect(']')
+            else:
+                more_products = True
+                while more_products:
+                    product, product_start, product_end = scanner.value()
+                    spans[('page_content', i, len(products))] = (product_start, product_end)
+                    products.append(product)
+                    more_products = scanner.members(']')
+            component[key] = products
+        else:
+            component[key], _, _ = scanner.value()
+        more = scanner.members('}')
+
+    return component, start, scanner.pos
+
+
+def parse_with_spans(text):
+    """
+    Parse a page_content document and locate its units.
+
+    Returns (data, spans) where spans maps unit paths (see unit_paths) to
+    (start, end) character offsets in text. Raises ValueError on invalid
+    JSON.
+    """
+    scanner = _Scanner(text)
+    spans = {}
+    data = {}
+
+    scanner.expect('{')
+    if scanner.peek() == '}':
+        scanner.expect('}')
+    else:
+        more = True
+        while more:
+            key, _, _ = scanner.value()
+            scanner.expect(':')
+            if key == 'page_content' and scanner.peek() == '[':
+                # A later duplicate key replaces the value, like json.loads
+                spans = {path: span for path, span in spans.items() if path[0] != 'page_content'}
+                scanner.expect('[')
+                components = []
+                if scanner.peek() == ']':
+                    scanner.expect(']')
+                else:
+                    more_components = True
+                    while more_components:
+                        i = len(components)
+                        component, start, end = _parse_component(scanner, i, spans)
+                        spans[('page_content', i)] = (start, end)
+                        components.append(component)
+                        more_components = scanner.members(']')
+                data[key] = components
+            else:
+                data[key], start, end = scanner.value()
+                spans[(key,)] = (start, end)
+            more = scanner.members('}')
+
+    if scanner.peek() != '':
+        raise ValueError(f"Extra data at offset {scanner.pos}")
+    return data, spans
+
+
+class FragmentCache:
+    """
+    Encoded text of unchanged units, taken from the last file read or written.
+
+    Entries are keyed by the unit object's identity, so replaced or moved
+    objects never pick up stale text. The source text is read lazily and
+    only used while the file still has the SHA-256 it was indexed with.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Forget all fragments"""
+        self._entries = {}
+        self._touched = set()
+        self._all_dirty = False
+        self._text = None
+        self._source_path = None
+        self._source_sha256 = None
+
+    def attach(self, data, spans, source_path, sha256, text=None):
+        """Index the units of data at the given spans of source_path"""
+        self.clear()
+        self._source_path = source_path
+        self._source_sha256 = sha256
+        self._text = text
+        for path, unit in unit_paths(data):
+            span = spans.get(path)
+            if span is not None:
+                self._entries[id(unit)] = (unit, span[0], span[1])
+
+    def touch(self, *units):
+        """Mark units as modified so their cached text is not reused"""
+        self._touched.update(id(unit) for unit in units)
+
+    def touch_all(self):
+        """Mark everything as modified (edits made outside the store API)"""
+        self._all_dirty = True
+
+    def _source_text(self):
+        if self._text is None and self._source_path is not None:
+            try:
+                with open(self._source_path, 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                raw = None
+            if raw is None or hashlib.sha256(raw).digest() != self._source_sha256:
+                # The file changed under us; its offsets are meaningless now
+                self._entries = {}
+                self._source_path = None
+                return None
+            self._text = raw.decode('utf-8')
+        return self._text
+
+    def span(self, unit):
+        """(start, end) of an untouched unit in the source, or None"""
+        if self._all_dirty or id(unit) in self._touched:
+            return None
+        entry = self._entries.get(id(unit))
+        if entry is None or entry[0] is not unit:
+            return None
+        return entry[1], entry[2]
+
+    def fragment(self, unit):
+        """Cached text of an untouched unit, or None"""
+        span = self.span(unit)
+        if span is None:
+            return None
+        text = self._source_text()
+        return None if text is None else text[span[0]:span[1]]
+
+    def prepare(self):
+        """Load the source text now, before the file gets replaced"""
+        if self._entries and not self._all_dirty:
+            self._source_text()
+
+
+def write_document(data, write, cache):
+    """
+    Write data in the canonical layout through write(chunk), reusing the
+    cached text of untouched units.
+
+    Returns the spans of every unit in the written text, for the next
+    FragmentCache.attach().
+    """
+    spans = {}
+    offset = [0]
+
+    def out(chunk):
+        write(chunk)
+        offset[0] += len(chunk)
+
+    def unit(value, path, level, text=None, children=()):
+        start = offset[0]
+        if text is None:
+            text = cache.fragment(value)
+        if text is None:
+            out(encode_value(value, level))
+        else:
+            out(text)
+            # Spliced text moves its children along with it
+            old_start = cache.span(value)[0]
+            for child_path, child in children:
+                child_span = cache.span(child)
+                if child_span is not None:
+                    spans[child_path] = (child_span[0] - old_start + start, child_span[1] - old_start + start)
+        spans[path] = (start, offset[0])
+
+    def category(component, i, level):
+        start = offset[0]
+        inner = '\n' + INDENT * (level + 1)
+        out('{')
+        for n, (key, value) in enumerate(component.items()):
+            out((',' if n else '') + inner + json.dumps(key, ensure_ascii=False) + ': ')
+            if key != 'products':
+                out(encode_value(value, level + 1))
+            elif not value:
+                out('[]')
+            else:
+                product_inner = '\n' + INDENT * (level + 2)
+                out('[')
+                for j, product in enumerate(value):
+                    out((',' if j else '') + product_inner)
+                    unit(product, ('page_content', i, j), level + 2)
+                out('\n' + INDENT * (level + 1) + ']')
+        out('\n' + INDENT * level + '}')
+        spans[('page_content', i)] = (start, offset[0])
+
+    if not data:
+        out('{}\n')
+        return spans
+
+    out('{')
+    for n, (key, value) in enumerate(data.items()):
+        out((',' if n else '') + '\n' + INDENT + json.dumps(key, ensure_ascii=False) + ': ')
+        if key != 'page_content' or not isinstance(value, list):
+            unit(value, (key,), 1)
+        elif not value:
+            out('[]')
+        else:
+            out('[')
+            for i, component in enumerate(value):
+                out((',' if i else '') + '\n' + INDENT * 2)
+                path = ('page_content', i)
+                if not is_category(component):
+                    unit(component, path, 2)
+                    continue
+                text = cache.fragment(component)
+                if text is None:
+                    category(component, i, 2)
+                else:
+                    children = [(('page_content', i, j), product) for j, product in enumerate(component['products'])]
+                    unit(component, path, 2, text, children)
+            out('\n' + INDENT + ']')
+    out('\n}\n')
+    return spans
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Synthetic catalog generator for load and scale testing.
+
+CatalogProfile learns the shape of the real products in
+backend/page_content.json: per field path it records text lengths, number
+ranges, list lengths, the values of categorical fields (effect labels,
+brands, goals, ...) and the pool of image URLs, plus a word-level bigram
+model of the Bulgarian copy. generate_product() then builds product i from
+a real product's structure with every value re-sampled from those
+statistics.
+
+Each product is derived from its own seed (seed, i), so product i is the
+same no matter how many are generated, and write_page_content() streams
+products straight into the file in the canonical layout, so a
+million-product catalog never has to fit in memory.
+
+Usage:
+    python catalog_generator.py 100000 -o /tmp/page_content_100k.json
+    python catalog_generator.py 5000 --seed 7 --products-json -o /tmp/products.json
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from catalog_serializer import INDENT, encode_value, iterencode
+
+PAGE_CONTENT_PATH = Path('backend/page_content.json')
+DEFAULT_SEED = 20260122
+
+# A string field is categorical when it repeats this much across products
+CATEGORICAL_RATIO = 0.5
+_WORD_RE = re.compile(r"[^\s]+")
+_IMAGE_RE = re.compile(r'^https?://\S+\.(?:jpe?g|png|webp|gif|avif)$', re.IGNORECASE)
+_SENTENCE_END = ('.', '!', '?')
+
+
+def _path_key(path, key):
+    return f'{path}.{key}' if path else key
+
+
+def _is_image_field(value):
+    lines = [line for line in value.split('\n') if line.strip()]
+    return bool(lines) and all(_IMAGE_RE.match(line.strip()) for line in lines)
+
+
+class CatalogProfile:
+    """Field statistics of a set of real products"""
+
+    def __init__(self, products):
+        if not products:
+            raise ValueError('Cannot learn a catalog profile from zero products')
+        self.templates = products
+        self.text_lengths = {}
+        self.numbers = {}
+        self.list_lengths = {}
+        self.list_items = {}
+        self.values = {}
+        self.image_urls = []
+        self.image_line_counts = {}
+        self._bigrams = {}
+        self._starts = []
+
+        for product in products:
+            self._learn(product, '')
+
+        self.categorical = {
+            path for path, counts in self.values.items()
+            if sum(counts.values()) > 1 and len(counts) / sum(counts.values()) <= CATEGORICAL_RATIO
+        }
+        self.image_urls = sorted(set(self.image_urls))
+        # Sorted so the model does not depend on set/dict iteration order
+        self._starts.sort()
+        for word in self._bigrams:
+            self._bigrams[word].sort()
+        self._words = sorted(self._bigrams)
+
+    @classmethod
+    def from_page_content(cls, path=PAGE_CONTENT_PATH):
+        """Profile of every product_category product in a page_content file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            doc = json.load(f)
+        return cls([
+            product
+            for component in doc.get('page_content', [])
+            if component.get('type') == 'product_category'
+            for product in component.get('products', [])
+        ])
+
+    def _learn(self, value, path):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                self._learn(item, _path_key(path, key))
+        elif isinstance(value, list):
+            self.list_lengths.setdefault(path, []).append(len(value))
+            self.list_items.setdefault(path, []).extend(value)
+            for item in value:
+                self._learn(item, path + '[]')
+        elif isinstance(value, str):
+            self.values.setdefault(path, Counter())[value] += 1
+            if value and _is_image_field(value):
+                urls = [line.strip() for line in value.split('\n') if line.strip()]
+                self.image_urls.extend(urls)
+                self.image_line_counts.setdefault(path, []).append(len(urls))
+            elif value:
+                self.text_lengths.setdefault(path, []).append(len(value))
+                self._learn_text(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.numbers.setdefault(path, []).append(value)
+
+    def _learn_text(self, text):
+        words = _WORD_RE.findall(text)
+        previous = None
+        for word in words:
+            if previous is None or previous.endswith(_SENTENCE_END):
+                self._starts.append(word)
+            if previous is not None:
+                self._bigrams.setdefault(previous, []).append(word)
+            self._bigrams.setdefault(word, [])
+            previous = word
+
+    def text(self, rng, length):
+        """Bulgarian-looking text of about length characters"""
+        words = []
+        size = 0
+        word = None
+        while size < length:
+            followers = self._bigrams.get(word) if word else None
+            if followers:
+                word = rng.choice(followers)
+            elif self._starts:
+                word = rng.choice(self._starts)
+            else:
+                word = rng.choice(self._words) if self._words else 'текст'
+            words.append(word)
+            size += len(word) + 1
+        text = ' '.join(words)
+        return text[:1].upper() + text[1:]
+
+    def generate(self, value, path, rng):
+        """Re-sample value (taken from a template product) at path"""
+        if isinstance(value, dict):
+            return {key: self.generate(item, _path_key(path, key), rng) for key, item in value.items()}
+
+        if isinstance(value, list):
+            lengths = self.list_lengths.get(path)
+            items = self.list_items.get(path)
+            if not lengths or not items:
+                return []
+            length = rng.choice(lengths)
+            return [self.generate(rng.choice(items), path + '[]', rng) for _ in range(length)]
+
+        if isinstance(value, str):
+            if not value:
+                return value
+            if path in self.image_line_counts:
+                count = rng.choice(self.image_line_counts[path])
+                return '\n'.join(rng.choice(self.image_urls) for _ in range(count))
+            if path in self.categorical:
+                counts = self.values[path]
+                choices = sorted(counts)
+                return rng.choices(choices, weights=[counts[choice] for choice in choices])[0]
+            lengths = self.text_lengths.get(path) or [len(value)]
+            return self.text(rng, max(1, int(rng.choice(lengths) * rng.uniform(0.85, 1.15))))
+
+        if isinstance(value, bool) or value is None:
+            return value
+
+        if isinstance(value, int):
+            return rng.choice(self.numbers.get(path) or [value])
+
+        if isinstance(value, float):
+            sample = rng.choice(self.numbers.get(path) or [value])
+            return round(sample * rng.uniform(0.9, 1.1), 2)
+
+        return value
+
+
+def generate_product(profile, index, seed=DEFAULT_SEED):
+    """Product number index; the same (profile, index, seed) always gives the same product"""
+    rng = random.Random(f'{seed}:{index}')
+    template = rng.choice(profile.templates)
+    product = profile.generate(template, '', rng)
+    product['product_id'] = f'gen-{index}'
+    public_data = product.get('public_data')
+    if isinstance(public_data, dict) and isinstance(public_data.get('name'), str):
+        public_data['name'] = f"{public_data['name'][:60].rstrip()} #{index}"
+    return product
+
+
+def split_counts(total, weights):
+    """Split total into len(weights) integer parts proportional to weights"""
+    if not weights:
+        return []
+    if not sum(weights):
+        weights = [1] * len(weights)
+    weight_sum = sum(weights)
+    shares = [total * weight / weight_sum for weight in weights]
+    counts = [int(share) for share in shares]
+    remainders = sorted(range(len(weights)), key=lambda i: counts[i] - shares[i])
+    for i in remainders[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _category_plan(doc, n_products):
+    """(component, product count) per product_category, proportional to the real catalog"""
+    categories = [c for c in doc.get('page_content', []) if c.get('type') == 'product_category']
+    counts = split_counts(n_products, [len(c.get('products', [])) for c in categories])
+    return dict(zip(map(id, categories), counts))
+
+
+def _write_category(write, component, count, first_index, profile, seed, level):
+    inner = '\n' + INDENT * (level + 1)
+    write('{')
+    for n, (key, value) in enumerate(component.items()):
+        write((',' if n else '') + inner + json.dumps(key, ensure_ascii=False) + ': ')
+        if key != 'products':
+            write(encode_value(value, level + 1))
+        elif not count:
+            write('[]')
+        else:
+            write('[')
+            for offset in range(count):
+                product = generate_product(profile, first_index + offset, seed)
+                write((',' if offset else '') + '\n' + INDENT * (level + 2))
+                write(encode_value(product, level + 2))
+            write('\n' + INDENT * (level + 1) + ']')
+    write('\n' + INDENT * level + '}')
+
+
+def write_page_content(f, n_products, seed=DEFAULT_SEED, template_path=PAGE_CONTENT_PATH, profile=None):
+    """
+    Stream a page_content.json document with n_products generated products.
+
+    Settings, navigation, footer and the non-product components are copied
+    from the template file; products are generated one at a time.
+    """
+    with open(template_path, 'r', encoding='utf-8') as template_file:
+        doc = json.load(template_file)
+    profile = profile or CatalogProfile([
+        product
+        for component in doc.get('page_content', [])
+        if component.get('type') == 'product_category'
+        for product in component.get('products', [])
+    ])
+    plan = _category_plan(doc, n_products)
+
+    next_index = 0
+    f.write('{')
+    for n, (key, value) in enumerate(doc.items()):
+        f.write((',' if n else '') + '\n' + INDENT + json.dumps(key, ensure_ascii=False) + ': ')
+        if key != 'page_content' or not isinstance(value, list) or not value:
+            for chunk in iterencode(value, 1):
+                f.write(chunk)
+            continue
+        f.write('[')
+        for i, component in enumerate(value):
+            f.write((',' if i else '') + '\n' + INDENT * 2)
+            if id(component) in plan:
+                count = plan[id(component)]
+                _write_category(f.write, component, count, next_index, profile, seed, 2)
+                next_index += count
+            else:
+                f.write(encode_value(component, 2))
+        f.write('\n' + INDENT + ']')
+    # '{' is already out, so an empty template closes as '{}'
+    f.write('\n}\n' if doc else '}\n')
+
+
+def generate_page_content(n_products, seed=DEFAULT_SEED, template_path=PAGE_CONTENT_PATH):
+    """In-memory page_content document (for small catalogs and tests)"""
+    import io
+
+    buffer = io.StringIO()
+    write_page_content(buffer, n_products, seed, template_path)
+    return json.loads(buffer.getvalue())
+
+
+def write_products_json(f, n_products, seed=DEFAULT_SEED, template_path=PAGE_CONTENT_PATH):
+    """Stream the same catalog in the products.json layout"""
+    with open(template_path, 'r', encoding='utf-8') as template_file:
+        doc = json.load(template_file)
+    profile = CatalogProfile.from_page_content(template_path)
+    categories = [c for c in doc.get('page_content', []) if c.get('type') == 'product_category']
+    plan = _category_plan(doc, n_products)
+
+    next_index = 0
+    f.write('{\n' + INDENT + '"product_categories": ')
+    if not categories:
+        f.write('[]')
+    else:
+        f.write('[')
+        for i, component in enumerate(categories):
+            f.write((',' if i else '') + '\n' + INDENT * 2)
+            count = plan[id(component)]
+            _write_category(f.write, component, count, next_index, profile, seed, 2)
+            next_index += count
+        f.write('\n' + INDENT + ']')
+    f.write(',\n' + INDENT + '"footer": ' + encode_value(doc.get('footer', {}), 1) + '\n}\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic catalog')
+    parser.add_argument('products', type=int, help='number of products')
+    parser.add_argument('-o', '--output', help='output file (default: stdout)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--template', default=str(PAGE_CONTENT_PATH),
+                        help='page_content.json to learn from')
+    parser.add_argument('--products-json', action='store_true',
+                        help='write the products.json layout instead of page_content.json')
+    args = parser.parse_args(argv)
+
+    writer = write_products_json if args.products_json else write_page_content
+    if args.output:
+        from catalog_store import atomic_write
+        with atomic_write(args.output) as f:
+            writer(f, args.products, args.seed, args.template)
+        print(f"Wrote {args.products} products to {args.output}", file=sys.stderr)
+    else:
+        writer(sys.stdout, args.products, args.seed, args.template)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Canonical JSON serializer for the catalog files.
+
+All catalog JSON (page_content.json, products.json, image_mapping.json, ...)
+is written in one layout: 2-space indentation, UTF-8 characters left
+unescaped, keys in insertion order, trailing newline - byte-for-byte what
+json.dumps(data, ensure_ascii=False, indent=2) + '\\n' produces.
+
+dump() streams the document to the file handle: the outer levels are
+written piece by piece and only one element (a category, a component) is
+encoded at a time, so no full-document string or list of lines is built.
+Elements are encoded with orjson when it is installed and the element
+holds only values orjson encodes exactly like json.dumps (no floats, which
+it formats differently - 1e-07 vs 1e-7, NaN as null - no non-string keys,
+no integers beyond 64 bits); everything else goes through the stdlib json
+module.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+INDENT = '  '
+
+# Levels streamed element by element; deeper values are encoded whole
+STREAM_DEPTH = 2
+
+
+def _orjson_safe(value):
+    """True if orjson's output for value is identical to json.dumps'"""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str) or item is None or isinstance(item, bool):
+            continue
+        if isinstance(item, int):
+            if not -2**63 <= item < 2**64:
+                return False
+        elif isinstance(item, dict):
+            if not all(type(key) is str for key in item):
+                return False
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        else:
+            return False
+    return True
+
+
+def encode_value(value, level=0):
+    """
+    Encode one value as indented JSON, nested at the given level.
+
+    JSON strings cannot contain raw newlines, so re-indenting the encoded
+    text by replacing '\\n' is safe.
+    """
+    if orjson is not None and _orjson_safe(value):
+        text = orjson.dumps(value, option=orjson.OPT_INDENT_2).decode('utf-8')
+    else:
+        text = json.dumps(value, ensure_ascii=False, indent=2)
+    if level:
+        text = text.replace('\n', '\n' + INDENT * level)
+    return text
+
+
+def iterencode(value, level=0, depth=STREAM_DEPTH):
+    """Yield the canonical encoding of value in chunks"""
+    if depth <= 0 or not isinstance(value, (dict, list)) or not value:
+        yield encode_value(value, level)
+        return
+
+    inner = '\n' + INDENT * (level + 1)
+    if isinstance(value, dict):
+        yield '{'
+        for i, (key, item) in enumerate(value.items()):
+            yield (',' if i else '') + inner + json.dumps(key, ensure_ascii=False) + ': '
+            yield from iterencode(item, level + 1, depth - 1)
+        yield '\n' + INDENT * level + '}'
+    else:
+        yield '['
+        for i, item in enumerate(value):
+            yield (',' if i else '') + inner
+            yield from iterencode(item, level + 1, depth - 1)
+        yield '\n' + INDENT * level + ']'
+
+
+def dump(value, f):
+    """Write value to the text file handle f in the canonical layout"""
+    for chunk in iterencode(value):
+        f.write(chunk)
+    f.write('\n')
+
+
+def dumps(value):
+    """The canonical layout as a string"""
+    return ''.join(iterencode(value)) + '\n'
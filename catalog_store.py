@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Indexed in-memory catalog store for backend/page_content.json.
+
+The batch scripts (improve_product_data.py, improve_descriptions.py,
+add_packaging_info.py, ...) used to re-read and rewrite the whole catalog
+for every single edit. CatalogStore loads the file once, keeps hash indexes
+over the products and lets a script apply any number of edits in memory
+before writing the file back a single time.
+
+Writes go through atomic_write(): the document is serialized into a temp
+file in the same directory, fsynced and moved over the target with
+os.replace(), so a crash or Ctrl-C mid-write never leaves a truncated
+catalog behind for the Worker to serve.
+
+Next to the JSON, save() also writes a binary snapshot
+(.page_content.json.snapshot, marshal format) tagged with the JSON's size
+and SHA-256. load() uses the snapshot when both still match, which skips JSON parsing entirely; page_content.json stays the source of truth
+and a stale or unreadable snapshot is simply ignored and rebuilt.
+
+Saves are incremental: the store remembers where every top-level value,
+page_content component and product sits in the file (catalog_fragments.py)
+and which products were edited, and only re-encodes those; everything
+else is copied from the previous file's text.
+"""
+
+import copy
+import hashlib
+import marshal
+import os
+import shutil
+import struct
+import tempfile
+from contextlib import contextmanager
+from catalog_fragments import FragmentCache, parse_with_spans, write_document
+from catalog_serializer import iterencode
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGE_CONTENT_PATH = os.path.join(SCRIPT_DIR, 'backend', 'page_content.json')
+
+SNAPSHOT_MAGIC = b'CATSNAP3'
+# magic, marshal version, JSON size, JSON sha256
+_SNAPSHOT_HEADER = struct.Struct('<8sBQ32s')
+
+
+@contextmanager
+def atomic_write(path, encoding='utf-8', binary=False):
+    """
+    Yield a file handle whose contents replace path atomically.
+
+    The data is written to a temp file next to path and only moved into
+    place once the block finishes without an exception; on failure the
+    temp file is removed and path is left untouched.
+    """
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory
+    )
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding=encoding)) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+def _fsync_directory(directory):
+    """Persist the rename itself (not supported on Windows)"""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def write_json_atomic(path, data):
+    """
+    Stream data as canonical JSON to path via atomic_write().
+
+    Returns the SHA-256 digest of the bytes written.
+    """
+    digest = hashlib.sha256()
+    with atomic_write(path) as f:
+        for chunk in iterencode(data):
+            f.write(chunk)
+            digest.update(chunk.encode('utf-8'))
+        f.write('\n')
+        digest.update(b'\n')
+    return digest.digest()
+
+def snapshot_path(path):
+    """Hidden snapshot file next to a JSON file"""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, '.' + name + '.snapshot')
+
+def write_snapshot(path, data, sha256=None, spans=None):
+    """
+    Write the binary snapshot of data for the JSON file at path.
+
+    sha256 is the digest of the file's content if the caller has it at
+    hand; otherwise the file is read to hash it. spans are the unit offsets
+    from catalog_fragments, stored so incremental saves work after loading
+    from the snapshot too.
+    """
+    if sha256 is None:
+        with open(path, 'rb') as f:
+            sha256 = hashlib.sha256(f.read()).digest()
+    header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, marshal.version, os.stat(path).st_size, sha256)
+    with atomic_write(snapshot_path(path), binary=True) as f:
+        f.write(header)
+        f.write(marshal.dumps((data, spans or {})))
+
+def read_snapshot(path):
+    """
+    Return (data, spans, sha256) from the snapshot of the JSON file at path,
+    or None if there is no snapshot or it does not match the file.
+
+    The JSON is always hashed rather than trusting its mtime, which an
+    edit within the filesystem's timestamp granularity (or one that
+    restores it) leaves unchanged. Hashing still costs far less than
+    parsing the JSON.
+    """
+    try:
+        with open(snapshot_path(path), 'rb') as f:
+            header = f.read(_SNAPSHOT_HEADER.size)
+            if len(header) != _SNAPSHOT_HEADER.size:
+                return None
+            magic, version, size, sha256 = _SNAPSHOT_HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC or version != marshal.version:
+                return None
+
+            if os.stat(path).st_size != size:
+                return None
+            with open(path, 'rb') as json_file:
+                if hashlib.sha256(json_file.read()).digest() != sha256:
+                    return None
+            data, spans = marshal.loads(f.read())
+            return data, spans, sha256
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+class CatalogStore:
+    """page_content.json held in memory with product, category and manufacturer indexes"""
+
+    def __init__(self, data, path=PAGE_CONTENT_PATH):
+        self.path = path
+        self.data = data
+        self.dirty = False
+        self._in_transaction = False
+        self._undo = None
+        self._fragments = FragmentCache()
+        self._build_indexes()
+
+    @classmethod
+    def load(cls, path=PAGE_CONTENT_PATH, use_snapshot=True):
+        """Read page_content.json once (or its snapshot) and index it"""
+        if use_snapshot:
+            snapshot = read_snapshot(path)
+            if snapshot is not None:
+                data, spans, sha256 = snapshot
+                store = cls(data, path)
+                store._fragments.attach(data, spans, path, sha256)
+                return store
+
+        with open(path, 'rb') as f:
+            json_bytes = f.read()
+        sha256 = hashlib.sha256(json_bytes).digest()
+        text = json_bytes.decode('utf-8')
+        data, spans = parse_with_spans(text)
+        store = cls(data, path)
+        store._fragments.attach(data, spans, path, sha256, text)
+        if use_snapshot:
+            try:
+                write_snapshot(path, data, sha256, spans)
+            except OSError:
+                pass
+        return store
+
+    def _build_indexes(self):
+        """Build product_id, category and manufacturer lookups in one pass"""
+        self._products = {}
+        self._product_category = {}
+        self._categories = {}
+        self._manufacturers = {}
+
+        for component in self.data.get('page_content', []):
+            if component.get('type') != 'product_category' or 'products' not in component:
+                continue
+
+            category_id = component.get('id', '')
+            self._categories.setdefault(category_id, component)
+
+            for product in component['products']:
+                product_id = product.get('product_id')
+                # The old linear scans stopped at the first match, keep that
+                if not product_id or product_id in self._products:
+                    continue
+                self._products[product_id] = product
+                self._product_category[product_id] = component
+                self._index_manufacturer(product)
+
+    def _index_manufacturer(self, product):
+        manufacturer = product.get('system_data', {}).get('manufacturer') or ''
+        self._manufacturers.setdefault(manufacturer, []).append(product)
+
+    def _unindex_manufacturer(self, product):
+        manufacturer = product.get('system_data', {}).get('manufacturer') or ''
+        products = self._manufacturers.get(manufacturer, [])
+        for i, indexed in enumerate(products):
+            if indexed is product:
+                del products[i]
+                break
+        if not products:
+            self._manufacturers.pop(manufacturer, None)
+
+    def __contains__(self, product_id):
+        return product_id in self._products
+
+    def __len__(self):
+        return len(self._products)
+
+    def get_product(self, product_id):
+        """Return the product dict for product_id, or None"""
+        return self._products.get(product_id)
+
+    def category_of(self, product_id):
+        """Return the product_category component that holds product_id, or None"""
+        return self._product_category.get(product_id)
+
+    def get_category(self, category_id):
+        """Return the product_category component with the given id, or None"""
+        return self._categories.get(category_id)
+
+    def categories(self):
+        """List all product_category components in page order"""
+        return list(self._categories.values())
+
+    def products_in_category(self, category_id):
+        """List the products of a category (empty if the category is unknown)"""
+        category = self._categories.get(category_id)
+        return list(category.get('products', [])) if category else []
+
+    def products_by_manufacturer(self, manufacturer):
+        """List the products whose system_data.manufacturer equals manufacturer"""
+        return list(self._manufacturers.get(manufacturer, []))
+
+    def iter_products(self):
+        """Yield (category, product) pairs for every indexed product"""
+        for product_id, product in self._products.items():
+            yield self._product_category[product_id], product
+
+    def update_product_field(self, product_id, field_path, value):
+        """
+        Set a dotted field path (e.g. 'public_data.effects') on a product.
+
+        Missing intermediate objects are created. Returns False when the
+        product is not in the catalog.
+        """
+        product = self._products.get(product_id)
+        if product is None:
+            return False
+
+        if self._undo is not None and id(product) not in self._undo:
+            self._undo[id(product)] = (product, copy.deepcopy(product))
+        self._fragments.touch(product, self._product_category[product_id])
+
+        reindex_manufacturer = field_path == 'system_data.manufacturer' or field_path == 'system_data'
+        if reindex_manufacturer:
+            self._unindex_manufacturer(product)
+
+        obj = product
+        keys = field_path.split('.')
+        for key in keys[:-1]:
+            if key not in obj:
+                obj[key] = {}
+            obj = obj[key]
+        obj[keys[-1]] = value
+
+        if reindex_manufacturer:
+            self._index_manufacturer(product)
+
+        self.dirty = True
+        return True
+
+    def mark_dirty(self, product_id=None):
+        """
+        Flag edits made directly on the data so the next save writes them.
+
+        With a product_id only that product is re-encoded; without one the
+        whole catalog is.
+        """
+        if product_id is None:
+            self._fragments.touch_all()
+        elif product_id in self._products:
+            self._fragments.touch(self._products[product_id], self._product_category[product_id])
+        self.dirty = True
+
+    @contextmanager
+    def transaction(self, rollback=True):
+        """
+        Stage edits and flush them with a single atomic write.
+
+        Usage:
+            with catalog.transaction():
+                catalog.update_product_field(...)
+                ...
+
+        If the block raises, nothing is written. With rollback=True the
+        products edited through update_product_field() are also restored in
+        place to their state before the block; only those products are
+        copied, so a transaction costs as much as its edits.
+        """
+        if self._in_transaction:
+            raise RuntimeError('CatalogStore transactions cannot be nested')
+
+        self._undo = {} if rollback else None
+        was_dirty = self.dirty
+        self._in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            if rollback:
+                for product, original in self._undo.values():
+                    product.clear()
+                    product.update(original)
+                self.dirty = was_dirty
+                self._build_indexes()
+            raise
+        finally:
+            self._in_transaction = False
+            self._undo = None
+
+        self.save()
+
+    def save(self):
+        """Write the catalog back if anything changed. Returns True if written."""
+        if not self.dirty:
+            return False
+
+        self._fragments.prepare()
+        digest = hashlib.sha256()
+        with atomic_write(self.path) as f:
+            def write(chunk):
+                f.write(chunk)
+                digest.update(chunk.encode('utf-8'))
+            spans = write_document(self.data, write, self._fragments)
+
+        sha256 = digest.digest()
+        self._fragments.attach(self.data, spans, self.path, sha256)
+        try:
+            write_snapshot(self.path, self.data, sha256, spans)
+        except OSError:
+            pass
+        self.dirty = False
+        return True
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Batch effect-scoring engine.
+
+Builds a products x unified-categories score matrix in one pass over the
+catalog, applies INFERENCE_RULES as boolean masks and picks the top effects
+per row with argpartition. Produces the same effects as
+get_top_3_effects(analyze_product_effects(product, is_bestseller)) for each
+product, but scales to full supplier feeds.
+"""
+
+import numpy as np
+from unified_effects import INFERENCE_RULES, map_effect_to_unified
+
+# Inferred effects sort after every effect the product already lists
+_INFERRED_ORDER_OFFSET = 1 << 20
+
+
+def _as_number(value):
+    """Turn a float cell back into an int when it holds a whole number"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def build_score_matrix(products, bestseller_flags, with_sources=False):
+    """
+    Score every product against every unified effect label.
+
+    Args:
+        products: Sequence of product dicts
+        bestseller_flags: Sequence of bools, one per product
+        with_sources: Also collect the original labels behind each cell
+
+    Returns:
+        Dict with:
+        - 'labels':  column labels (unified labels, plus unmapped originals)
+        - 'values':  float matrix (products x labels), NaN where absent
+        - 'order':   int matrix with the position each effect was first seen
+                     in the product (used to break ties like the stable sort
+                     of the per-product path)
+        - 'keys':    int matrix ranking the cells of each row, 0 where absent
+        - 'sources': {(row, col): [original labels]} if with_sources
+    """
+    columns = {}
+    rows, cols, values, orders = [], [], [], []
+    sources = {}
+
+    # One pass over the listed effects
+    for row, product in enumerate(products):
+        effects = product.get('public_data', {}).get('effects', [])
+        for position, effect in enumerate(effects):
+            unified_label, original_label = map_effect_to_unified(effect.get('label', ''))
+            col = columns.setdefault(unified_label, len(columns))
+            rows.append(row)
+            cols.append(col)
+            values.append(effect.get('value', 0))
+            orders.append(position)
+            if with_sources:
+                cell_sources = sources.setdefault((row, col), [])
+                if original_label not in cell_sources:
+                    cell_sources.append(original_label)
+
+    for label, _, _, _ in INFERENCE_RULES:
+        columns.setdefault(label, len(columns))
+
+    n_products = len(products)
+    matrix = np.full((n_products, len(columns)), -np.inf)
+    order = np.full((n_products, len(columns)), np.iinfo(np.int64).max, dtype=np.int64)
+    if rows:
+        index = (np.asarray(rows), np.asarray(cols))
+        np.maximum.at(matrix, index, np.asarray(values, dtype=float))
+        np.minimum.at(order, index, np.asarray(orders, dtype=np.int64))
+    present = np.isfinite(matrix)
+
+    # Name/goal inference as masks over the whole catalog
+    names = np.array(
+        [product.get('public_data', {}).get('name', '').lower() for product in products],
+        dtype=str
+    ) if n_products else np.array([], dtype=str)
+    goals = [product.get('system_data', {}).get('goals', []) for product in products]
+    eligible = ~np.asarray(bestseller_flags, dtype=bool).reshape(n_products)
+
+    for rule_index, (label, value, goal, name_parts) in enumerate(INFERENCE_RULES):
+        mask = np.zeros(n_products, dtype=bool)
+        if goal is not None:
+            mask |= np.fromiter((goal in g for g in goals), dtype=bool, count=n_products)
+        for part in name_parts:
+            mask |= np.char.find(names, part) >= 0
+
+        col = columns[label]
+        mask &= eligible & ~present[:, col]
+        matrix[mask, col] = value
+        order[mask, col] = _INFERRED_ORDER_OFFSET + rule_index
+        present[mask, col] = True
+        if with_sources:
+            for row in np.flatnonzero(mask):
+                sources[(int(row), col)] = ['inferred']
+
+    matrix[~present] = np.nan
+    result = {
+        'labels': list(columns),
+        'values': matrix,
+        'order': order
+    }
+    result['keys'] = _rank_keys(result)
+    if with_sources:
+        result['sources'] = sources
+    return result
+
+
+def _rank_keys(scores):
+    """
+    Integer sort key per cell: higher value first, then earlier order.
+    Absent cells get 0 so they always lose.
+    """
+    values = scores['values']
+    present = ~np.isnan(values)
+    order = scores['order']
+
+    # Dense ranks keep the comparison exact for any numeric values
+    dense = np.zeros(values.shape, dtype=np.int64)
+    if present.any():
+        _, inverse = np.unique(values[present], return_inverse=True)
+        dense[present] = inverse + 1
+
+    order_span = int(order[present].max()) + 1 if present.any() else 1
+    keys = dense * order_span - np.where(present, order, 0) + order_span
+    keys[~present] = 0
+    return keys
+
+
+def top_effects(scores, n=3):
+    """
+    Pick the n strongest effects per product.
+
+    Returns one list of {'label', 'value'} dicts per product, ordered like
+    unified_effects.get_top_3_effects (value descending, ties in the order
+    the effect was first seen).
+    """
+    keys = scores['keys']
+    n_products, n_labels = keys.shape
+    if n_products == 0 or n_labels == 0:
+        return [[] for _ in range(n_products)]
+
+    n = min(n, n_labels)
+    if n < n_labels:
+        candidates = np.argpartition(-keys, n - 1, axis=1)[:, :n]
+    else:
+        candidates = np.tile(np.arange(n_labels), (n_products, 1))
+    candidate_keys = np.take_along_axis(keys, candidates, axis=1)
+    ranked = np.take_along_axis(candidates, np.argsort(-candidate_keys, axis=1, kind='stable'), axis=1)
+
+    labels = scores['labels']
+    values = scores['values']
+    results = []
+    for row in range(n_products):
+        row_effects = []
+        for col in ranked[row]:
+            if keys[row, col] == 0:
+                break
+            row_effects.append({
+                'label': labels[col],
+                'value': _as_number(values[row, col])
+            })
+        results.append(row_effects)
+    return results
+
+
+def ranked_effects(scores, row):
+    """All effects of one product as (label, value) pairs, strongest first"""
+    keys = scores['keys'][row]
+    labels = scores['labels']
+    values = scores['values'][row]
+    return [
+        (labels[col], _as_number(values[col]))
+        for col in np.argsort(-keys, kind='stable')
+        if keys[col] > 0
+    ]
+
+
+def score_catalog(products, bestseller_flags, n=3):
+    """Top-n unified effects for every product in one batch"""
+    return top_effects(build_score_matrix(products, bestseller_flags), n)
@@ -3,10 +3,10 @@
 Fix product issues by adding missing fields from Excel data and PDFs.
 """
 
-import json
-import pandas as pd
 from pathlib import Path
-from fix_products_json import load_products_json
+from catalog_store import write_json_atomic
+from fix_products_json import load_products_json, save_products_json
+from supplier_feed import FeedIndex, load_feed, supplier_id_for_product
 
 def parse_product_name_detailed(product_name):
     """Extract detailed info from product name"""
@@ -115,8 +115,7 @@ def update_products_with_missing_info():
     
     # Load data
     data = load_products_json('backend/products.json')
-    df = pd.read_excel('products/b2b-109838-products-22-01-2026.xlsx')
-    df['product_id_from_url'] = df['Image'].astype(str).str.extract(r'/p(\d+)/')
+    feed_index = FeedIndex(load_feed())
     
     # Updates to apply
     updates_count = 0
@@ -135,10 +134,17 @@ def update_products_with_missing_info():
             updated = False
             
             # Find in Excel to get complete info
-            excel_match = df[df['Product'].str.contains(product_name[:20], case=False, na=False)]
+            match = feed_index.resolve(
+                name=product_name[:20],
+                supplier_id=supplier_id_for_product(product)
+            )
+            if match.status == 'ambiguous':
+                print(f"⚠️  Ambiguous Excel match for {product_name} ({len(match.candidates)} products):")
+                for candidate in match.candidates[:5]:
+                    print(f"     - {candidate}")
             
-            if not excel_match.empty:
-                excel_product = excel_match.iloc[0]
+            if match.row is not None:
+                excel_product = match.row
                 full_name = excel_product['Product']
                 
                 # Parse full product name
@@ -200,37 +206,13 @@ def update_products_with_missing_info():
     print(f"\n✅ Updated {updates_count} products")
     
     # Save updated data
-    with open('backend/products_updated.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_json_atomic('backend/products_updated.json', data)
     
     # Create properly formatted version
     categories = data.get('categories', [])
     footer = data.get('footer', {})
     
-    lines = []
-    
-    # Write categories with 4-space indentation
-    for i, cat in enumerate(categories):
-        cat_json = json.dumps(cat, ensure_ascii=False, indent=2)
-        cat_lines = cat_json.split('\n')
-        for line in cat_lines:
-            lines.append('    ' + line)
-        
-        if i < len(categories) - 1:
-            lines[-1] = lines[-1] + ','
-    
-    # Add footer
-    lines.append('  ],')
-    footer_json = json.dumps(footer, ensure_ascii=False, indent=2)
-    footer_lines = footer_json.split('\n')
-    for i, line in enumerate(footer_lines):
-        if i == 0:
-            lines.append('  "footer": ' + line)
-        else:
-            lines.append('  ' + line)
-    
-    with open('backend/products.json', 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    save_products_json('backend/products.json', categories, footer)
     
     print("\n✅ Saved updated products.json")
     
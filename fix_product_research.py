@@ -10,7 +10,7 @@ IMPORTANT: This script works ONLY with backend/page_content.json (single source
 backend/products.json has been DEPRECATED to eliminate duplicate data.
 """
 
-import json
+from catalog_store import CatalogStore
 
 # Product categorization based on actual ingredients and mechanisms
 PRODUCT_CONFIG = {
@@ -149,37 +149,32 @@ def update_products_json(filepath):
 
 def update_page_content_json(filepath):
     """Update page_content.json with corrected data"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    catalog = CatalogStore.load(filepath)
     
     updated_count = 0
     
-    for item in data.get('page_content', []):
-        if item.get('type') == 'product_category':
-            for product in item.get('products', []):
-                product_id = product.get('product_id')
-                if product_id and product_id in PRODUCT_CONFIG:
-                    config = PRODUCT_CONFIG[product_id]
-                    public_data = product.get('public_data', {})
-                    
-                    # Update tagline
-                    if public_data.get('tagline') != config['tagline']:
-                        print(f"Updating {product_id}: {public_data.get('name')}")
-                        print(f"  Old tagline: {public_data.get('tagline')}")
-                        print(f"  New tagline: {config['tagline']}")
-                        public_data['tagline'] = config['tagline']
-                        updated_count += 1
-                    
-                    # Update effects
-                    if 'effects' in config:
-                        old_effects = public_data.get('effects', [])
-                        print(f"  Old effects: {[e.get('label') for e in old_effects]}")
-                        print(f"  New effects: {[e['label'] for e in config['effects']]}")
-                        public_data['effects'] = config['effects']
-    
-    # Write back
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # All corrections are written with a single atomic flush at the end
+    with catalog.transaction():
+        for product_id, config in PRODUCT_CONFIG.items():
+            product = catalog.get_product(product_id)
+            if product is None:
+                continue
+            public_data = product.get('public_data', {})
+            
+            # Update tagline
+            if public_data.get('tagline') != config['tagline']:
+                print(f"Updating {product_id}: {public_data.get('name')}")
+                print(f"  Old tagline: {public_data.get('tagline')}")
+                print(f"  New tagline: {config['tagline']}")
+                catalog.update_product_field(product_id, 'public_data.tagline', config['tagline'])
+                updated_count += 1
+            
+            # Update effects
+            if 'effects' in config:
+                old_effects = public_data.get('effects', [])
+                print(f"  Old effects: {[e.get('label') for e in old_effects]}")
+                print(f"  New effects: {[e['label'] for e in config['effects']]}")
+                catalog.update_product_field(product_id, 'public_data.effects', config['effects'])
     
     print(f"\n✅ Updated {updated_count} products in {filepath}")
     return updated_count
@@ -2,81 +2,264 @@
 """
 Load the products.json file structure.
 The file now has the correct structure: {"product_categories": [...]}
+
+The file is parsed incrementally from the file handle: iter_products_json()
+yields products and categories one at a time, so peak memory is bounded by
+the largest single product instead of the whole document.
+
+Only products.json is read here. life_page_content.json is loaded by the
+Worker (JS) only, and bio_assets.py rewrites bio_content.json as a whole,
+so neither has a products.json layout to stream.
+
+save_products_json() writes the file back in the current layout with the
+canonical serializer (catalog_serializer.py).
 """
 import json
+from catalog_store import write_json_atomic
+
+# How much text is pulled from the file handle at a time
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\r\n'
+
+
+class _StreamReader:
+    """Minimal pull parser over a text file handle built on JSONDecoder.raw_decode"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, grow=False):
+        """Append the next chunk, dropping what has already been consumed"""
+        if self._eof:
+            return False
+        # A value that did not fit is retried with a read at least as large
+        # as the buffer, so long values cost O(n) reads instead of O(n^2)
+        size = max(self._chunk_size, len(self._buf)) if grow else self._chunk_size
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        """Consume char or raise ValueError"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(grow=True):
+                    raise
+                continue
+            # A number (or anything else) touching the end of the buffer
+            # may continue in the next chunk
+            if end == len(self._buf) and self._fill(grow=True):
+                continue
+            self._pos = end
+            return obj
+
+    def items(self):
+        """Yield the elements of the JSON array at the current position"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.expect(']')
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.expect(',')
+                continue
+            self.expect(']')
+            return
+
+
+def _iter_category(reader, index):
+    """Stream one category object, yielding its products before the category itself"""
+    category = {}
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        yield ('category', index, category)
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'products' and reader.peek() == '[':
+            category['products'] = []
+            for product in reader.items():
+                yield ('product', index, product)
+        else:
+            category[key] = reader.value()
+
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect('}')
+        break
+
+    yield ('category', index, category)
+
+
+def _iter_category_list(reader):
+    """Stream category objects up to and including the closing ']'"""
+    index = 0
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+    while True:
+        yield from _iter_category(reader, index)
+        index += 1
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect(']')
+        return
+
+
+def _iter_current_format(reader, state):
+    """Stream {"product_categories": [...], "footer": {...}}"""
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'product_categories' and reader.peek() == '[':
+            state['found_categories'] = True
+            reader.expect('[')
+            yield from _iter_category_list(reader)
+        elif key == 'footer':
+            yield ('footer', None, reader.value())
+        else:
+            reader.value()
+
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect('}')
+        return
+
+
+def _iter_legacy_format(reader):
+    """
+    Stream the old malformed layout written by the line-joining scripts:
+    bare category objects separated by commas, a '  ],' line, then
+    '  "footer": {...}'.
+    """
+    yield from _iter_category_list(reader)
+    reader.expect(',')
+    key = reader.value()
+    if key != 'footer':
+        raise ValueError("Could not parse old format")
+    reader.expect(':')
+    yield ('footer', None, reader.value())
+
+
+def iter_products_json(filepath, chunk_size=CHUNK_SIZE):
+    """
+    Stream products.json without materializing the whole document.
+
+    Yields (kind, category_index, value) tuples:
+        ('product', i, product)    - each product of category i as it is parsed
+        ('category', i, category)  - category i once its object closes; its
+                                     'products' list is left empty because the
+                                     products were already yielded
+        ('footer', None, footer)
+
+    Raises ValueError (json.JSONDecodeError) if the file is in neither the
+    current nor the legacy layout.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = _StreamReader(f, chunk_size)
+        state = {'found_categories': False}
+        yield from _iter_current_format(reader, state)
+
+        if reader.peek() == '':
+            if not state['found_categories']:
+                raise ValueError("No product_categories in document")
+            return
+
+        # Anything after the first object means the legacy layout, where
+        # that object was really the first category. Nothing has been
+        # yielded for it yet, so start over in legacy mode.
+        if state['found_categories'] or reader.peek() != ',':
+            raise ValueError("Unexpected data after document")
+        f.seek(0)
+        yield from _iter_legacy_format(_StreamReader(f, chunk_size))
+
 
 def load_products_json(filepath):
     """Load the products.json file with the correct structure."""
-    # Read the file content first
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Try to parse as JSON first
+    categories = []
+    footer = None
+    pending_products = []
+
     try:
-        data = json.loads(content)
-    except json.JSONDecodeError:
-        # If JSON parsing fails, return empty structure
+        for kind, _, value in iter_products_json(filepath):
+            if kind == 'product':
+                pending_products.append(value)
+            elif kind == 'category':
+                if 'products' in value:
+                    value['products'] = pending_products
+                pending_products = []
+                categories.append(value)
+            else:
+                footer = value
+    except ValueError:
+        # If parsing fails, return empty structure
         return {
             'categories': [],
             'footer': None
         }
-    
-    # Handle both old malformed structure and new correct structure
-    if 'product_categories' in data:
-        # New correct structure: {"product_categories": [...]}
-        categories = data['product_categories']
-        footer = data.get('footer', None)
-    else:
-        # Try to handle old malformed structure if it still exists
-        # (This is a fallback for legacy data that shouldn't normally be needed)
-        try:
-            lines = content.split('\n')
-            
-            # Find the line that ends the main array (2-space indent + "],")
-            main_array_end = None
-            for i, line in enumerate(lines):
-                if line == '  ],':
-                    main_array_end = i
-                    break
-            
-            if main_array_end is None:
-                raise ValueError("Could not parse old format")
-            
-            # Split content
-            array_part = '\n'.join(lines[:main_array_end])
-            
-            # De-indent array part by 4 spaces
-            array_lines = []
-            for line in array_part.split('\n'):
-                if line.startswith('    '):
-                    array_lines.append(line[4:])
-                elif line.strip():
-                    array_lines.append(line)
-                else:
-                    array_lines.append(line)
-            
-            # Construct valid JSON
-            array_json = '[\n' + '\n'.join(array_lines) + '\n]'
-            categories = json.loads(array_json)
-            footer = None
-        except:
-            # If all else fails, return empty
-            categories = []
-            footer = None
-    
+
     # Return structured data
     return {
         'categories': categories,
         'footer': footer
     }
 
+def save_products_json(filepath, categories, footer):
+    """Write categories and footer as {"product_categories": [...], "footer": {...}}"""
+    write_json_atomic(filepath, {
+        'product_categories': categories,
+        'footer': footer
+    })
+
 if __name__ == '__main__':
     data = load_products_json('backend/products.json')
     print(f"Loaded {len(data['categories'])} categories")
-    
+
     for cat in data['categories']:
         if cat.get('type') == 'product_category':
             print(f"  - {cat.get('title')}: {len(cat.get('products', []))} products")
-    
+
     if data['footer']:
         print(f"\nFooter: {list(data['footer'].keys())}")
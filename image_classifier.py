@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Content-based main-vs-label image classification.
+
+Supplier archives rarely name their label shots 'supp-facts...', so the
+filename alone misses most of them. Label images (supplement facts panels,
+ingredient tables, screenshots of them) look very different from product
+shots though: mostly white, almost no colour and dense with text edges.
+
+image_features() measures that on a downscaled thumbnail (JPEG draft mode
+keeps decoding cheap), and label_score() combines the measurements into a
+single score; extract_features() runs it over a batch of files in a
+process pool.
+
+Needs Pillow and NumPy; without Pillow no features are produced and
+callers fall back to the filename.
+"""
+
+import os
+
+import numpy as np
+
+from image_utils import IMAGE_ERRORS, flatten_alpha, map_images
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+THUMBNAIL_SIZE = 256
+CLASSIFIER_WORKERS = os.cpu_count() or 4
+
+# Scores above this are labels. Calibrated on the supplier archives in
+# products/: labels score 0.9-1.3, product shots -4.5-0.2.
+LABEL_THRESHOLD = 0.5
+
+WHITE_LEVEL = 0.9
+EDGE_STEP = 0.25
+TALL_ASPECT_RATIO = 1.75
+
+
+def image_features(path):
+    """
+    Cheap features of one image, computed on a thumbnail.
+
+    Returns a dict with:
+    - aspect_ratio:      height / width of the original
+    - saturation:        mean HSV saturation of non-dark pixels (0-1)
+    - white_fraction:    share of near-white pixels
+    - edge_density:      share of strong horizontal/vertical steps (text)
+    - border_brightness: mean brightness of the outermost pixels
+    """
+    with Image.open(path) as image:
+        width, height = image.size
+        image.draft('RGB', (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        image = flatten_alpha(image).convert('RGB')
+
+    hsv = np.asarray(image.convert('HSV'), dtype=np.float32) / 255
+    gray = np.asarray(image.convert('L'), dtype=np.float32) / 255
+
+    steps_x = np.abs(np.diff(gray, axis=1)) > EDGE_STEP
+    steps_y = np.abs(np.diff(gray, axis=0)) > EDGE_STEP
+    border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+
+    return {
+        'aspect_ratio': height / width,
+        'saturation': float((hsv[..., 1] * (hsv[..., 2] > 0.15)).mean()),
+        'white_fraction': float((gray > WHITE_LEVEL).mean()),
+        'edge_density': float((steps_x.mean() + steps_y.mean()) / 2),
+        'border_brightness': float(border.mean())
+    }
+
+
+def label_score(features):
+    """Linear score; positive evidence for a label, negative for a product shot"""
+    return (
+        2 * (features['white_fraction'] - 0.5)
+        - 10 * features['saturation']
+        + 5 * features['edge_density']
+        + (features['border_brightness'] - 0.7)
+        # Bottles and jars are tall, label crops rarely are
+        - 0.5 * max(0.0, features['aspect_ratio'] - TALL_ASPECT_RATIO)
+    )
+
+
+def is_label(features):
+    """True if the features look like a label / supplement facts image"""
+    return label_score(features) > LABEL_THRESHOLD
+
+
+def extract_features(paths, workers=CLASSIFIER_WORKERS):
+    """
+    image_features() for many files in a process pool.
+
+    Returns {path: features}; unreadable files map to None and an empty
+    dict is returned when Pillow is not installed.
+    """
+    if Image is None:
+        print("   Image classifier disabled (Pillow is not installed)")
+        return {}
+
+    return map_images(image_features, paths, workers, IMAGE_ERRORS + (ZeroDivisionError,))
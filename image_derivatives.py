@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Responsive derivatives for imported product images.
+
+Every main and label image in image_mapping.json is resized to a fixed
+set of width buckets and encoded as WebP (plus AVIF when the Pillow build
+has an AVIF encoder). EXIF orientation is applied and all metadata is
+dropped. Derivatives are written to images/derived/ named after the
+source file and width, so existing files are skipped on later runs.
+Sources outside the content-addressed store also get a hash of their path
+in the name, so product folders that share file names (1.jpg) do not
+overwrite each other's derivatives. An image that cannot be decoded is
+reported and skipped without stopping the run.
+
+The variants and their dimensions are recorded per product under
+'derivatives' in image_mapping.json for the frontend's srcset.
+
+Needs Pillow; without it the stage is skipped.
+"""
+
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from image_store import STORE_DIR
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+DERIVED_DIR = Path('images/derived')
+WIDTH_BUCKETS = (320, 640, 960, 1280)
+DERIVATIVE_WORKERS = os.cpu_count() or 4
+
+# (format, extension, save options)
+WEBP_OPTIONS = ('WEBP', '.webp', {'quality': 80, 'method': 4})
+AVIF_OPTIONS = ('AVIF', '.avif', {'quality': 60, 'speed': 6})
+
+
+def available_formats():
+    """Output formats the installed Pillow can encode"""
+    if Image is None:
+        return []
+    formats = [WEBP_OPTIONS] if features.check('webp') else []
+    if features.check('avif'):
+        formats.append(AVIF_OPTIONS)
+    return formats
+
+
+def target_widths(width):
+    """Buckets not wider than the source; small sources keep their own width"""
+    widths = [bucket for bucket in WIDTH_BUCKETS if bucket <= width]
+    return widths or [width]
+
+
+def _source_key(source):
+    """Store blobs are already named by content; other sources add a hash of their path"""
+    source = Path(source)
+    if source.parent.as_posix().endswith(STORE_DIR.as_posix()):
+        return source.stem
+    path_hash = hashlib.sha256(source.as_posix().encode('utf-8')).hexdigest()[:8]
+    return f"{source.stem}-{path_hash}"
+
+
+def derivative_path(source, width, ext, derived_dir=DERIVED_DIR):
+    """images/derived/<source key>-<width>w<ext>"""
+    return Path(derived_dir) / f"{_source_key(source)}-{width}w{ext}"
+
+
+def _prepare(image):
+    """Apply EXIF orientation and drop everything but the pixels"""
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    clean = image.convert('RGBA' if has_alpha else 'RGB')
+    clean.info = {}
+    return clean
+
+
+def generate_derivatives(source, formats, derived_dir=DERIVED_DIR):
+    """
+    Write the derivatives of one source image (runs in a worker process).
+
+    Returns {'width', 'height', 'variants': [{'path', 'format', 'width',
+    'height'}]}; variants already on disk are listed without re-encoding.
+    """
+    derived_dir = Path(derived_dir)
+    derived_dir.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as original:
+        image = _prepare(original)
+    width, height = image.size
+
+    variants = []
+    for target in target_widths(width):
+        target_height = max(1, round(height * target / width))
+        resized = None
+        for format_name, ext, options in formats:
+            path = derivative_path(source, target, ext, derived_dir)
+            if not path.exists():
+                if resized is None:
+                    resized = image if target == width else image.resize((target, target_height), Image.LANCZOS)
+                # A unique temp name, so concurrent runs never share one
+                fd, tmp_path = tempfile.mkstemp(prefix='.' + path.name + '.', suffix='.tmp', dir=derived_dir)
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        resized.save(f, format_name, **options)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            variants.append({
+                'path': path.as_posix(),
+                'format': format_name.lower(),
+                'width': target,
+                'height': target_height
+            })
+
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def _safe_generate(source, formats, derived_dir=DERIVED_DIR):
+    """generate_derivatives() returning (record, None), or (None, error) for a bad image"""
+    try:
+        return generate_derivatives(source, formats, derived_dir), None
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        return None, f"{e.__class__.__name__}: {e}"
+
+
+def _is_complete(source, record, formats, derived_dir=DERIVED_DIR):
+    """True if the recorded variants cover every bucket and format and exist on disk"""
+    if not record or not record.get('variants'):
+        return False
+    recorded = {variant['path'] for variant in record['variants']}
+    expected = {
+        derivative_path(source, width, ext, derived_dir).as_posix()
+        for width in target_widths(record['width']) for _, ext, _ in formats
+    }
+    return expected <= recorded and all(Path(path).exists() for path in recorded)
+
+
+def update_mapping_derivatives(image_mapping, workers=DERIVATIVE_WORKERS, derived_dir=DERIVED_DIR):
+    """
+    Generate missing derivatives for every main/label image in the mapping.
+
+    Results are stored in entry['derivatives'][source path] of every entry
+    listing the source. Returns the number of source images that were
+    (re)processed; images that fail to
+    decode are reported and left without derivatives.
+    """
+    formats = available_formats()
+    if not formats:
+        print("   Derivatives disabled (Pillow with WebP support is not installed)")
+        return 0
+
+    # Entries share store blobs, so each source is generated once and its
+    # record attached to every entry that lists it
+    jobs = {}
+    missing = set()
+    for entry in image_mapping.values():
+        derivatives = entry.setdefault('derivatives', {})
+        for source in entry['images'].get('main', []) + entry['images'].get('label', []):
+            if _is_complete(source, derivatives.get(source), formats, derived_dir) or source in missing:
+                continue
+            if source not in jobs and not Path(source).exists():
+                print(f"   Warning: missing source image {source}")
+                missing.add(source)
+                continue
+            jobs.setdefault(source, []).append(entry)
+
+    if not jobs:
+        return 0
+
+    sources = list(jobs)
+    # Decoding and resizing are CPU bound, so use processes
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(
+            _safe_generate,
+            sources,
+            [formats] * len(sources),
+            [derived_dir] * len(sources)
+        )
+        processed = 0
+        for source, (record, error) in zip(sources, results):
+            if error:
+                print(f"   Warning: skipped {source} ({error})")
+                continue
+            for entry in jobs[source]:
+                entry['derivatives'][source] = record
+            processed += 1
+            print(f"   {source}: {len(record['variants'])} variants")
+
+    return processed
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Check that every image the catalog references exists and is sane.
+
+References come from each product's image_url, label_image, label_url and
+newline-separated additional_images, and from the image and derivative
+paths in backend/image_mapping.json. URLs that point into this repository
+(raw.githubusercontent.com/.../main/...) are mapped back to local paths;
+other hosts are counted as remote and not checked.
+
+Every directory that holds a referenced file is listed once with parallel
+os.scandir instead of one lookup per reference, dimensions are read from the file header only
+(Pillow opens lazily and nothing is decoded), and results are cached in
+backend/image_check_cache.json by path, size and mtime.
+
+Usage:
+    python image_refs.py [--catalog backend/page_content.json] [--workers 8]
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+from urllib.parse import unquote, urlparse
+
+from catalog_store import write_json_atomic
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+PAGE_CONTENT_FILE = 'backend/page_content.json'
+MAPPING_FILE = 'backend/image_mapping.json'
+CACHE_FILE = 'backend/image_check_cache.json'
+SCAN_WORKERS = 8
+
+# URL prefixes served from this repository's tree
+LOCAL_URL_PREFIXES = [
+    'https://raw.githubusercontent.com/Radilovk/otslabvai/main/',
+    'https://raw.githubusercontent.com/Radilovk/otslabvai/refs/heads/main/',
+]
+PRODUCT_IMAGE_FIELDS = ['image_url', 'label_image', 'label_url', 'additional_images']
+
+# Larger files or dimensions are reported as oversized
+MAX_IMAGE_BYTES = 1_500_000
+MAX_IMAGE_DIMENSION = 2560
+
+
+def iter_image_refs(data, mapping=None):
+    """(owner, field, reference) for every image reference in the catalog and mapping"""
+    for component in data.get('page_content', []):
+        if component.get('type') != 'product_category':
+            continue
+        for product in component.get('products', []):
+            owner = product.get('product_id', '')
+            public_data = product.get('public_data', {})
+            for field in PRODUCT_IMAGE_FIELDS:
+                value = public_data.get(field)
+                if not isinstance(value, str):
+                    continue
+                for ref in value.split('\n'):
+                    if ref.strip():
+                        yield owner, field, ref.strip()
+
+    for key, entry in (mapping or {}).items():
+        owner = f'image_mapping:{key}'
+        for kind, paths in entry.get('images', {}).items():
+            for path in paths:
+                yield owner, f'images.{kind}', path
+        for source, derived in entry.get('derivatives', {}).items():
+            for variant in derived.get('variants', []):
+                yield owner, 'derivatives', variant['path']
+
+
+def resolve_ref(ref):
+    """Repository-relative path for a reference, or None if it is remote"""
+    for prefix in LOCAL_URL_PREFIXES:
+        if ref.startswith(prefix):
+            return unquote(ref[len(prefix):].split('?', 1)[0])
+    parsed = urlparse(ref)
+    if parsed.scheme or parsed.netloc:
+        return None
+    path = PurePosixPath(ref.removeprefix('./'))
+    # The site is served from the repository root, so /images/... is images/...
+    if path.is_absolute():
+        path = path.relative_to('/')
+    return str(path)
+
+
+def _scan_dir(path):
+    """(files {path: (size, mtime_ns)}, subdirectories) of one directory ('.' for the root)"""
+    prefix = '' if path == '.' else path + '/'
+    files = {}
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(prefix + entry.name)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[prefix + entry.name] = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def scan_files(roots, workers=SCAN_WORKERS, recursive=True):
+    """{path: (size, mtime_ns)} for every file in (or below) roots, one directory per task"""
+    files = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = [pool.submit(_scan_dir, root) for root in roots if os.path.isdir(root)]
+        while pending:
+            future = pending.pop()
+            found, subdirs = future.result()
+            files.update(found)
+            if recursive:
+                pending.extend(pool.submit(_scan_dir, subdir) for subdir in subdirs)
+    return files
+
+
+def ref_dirs(paths):
+    """Directories holding the given repository-relative paths ('.' for the root)"""
+    return sorted({posixpath.dirname(path) or '.' for path in paths})
+
+
+def read_dimensions(path):
+    """(format, width, height) from the image header, or None if unreadable"""
+    try:
+        with Image.open(path) as image:
+            return image.format, image.width, image.height
+    except Exception:
+        return None
+
+
+def load_json(path=CACHE_FILE):
+    """Parsed JSON file, or {} if missing or invalid"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def image_info(paths, files, cache, workers=SCAN_WORKERS):
+    """
+    {path: {size, mtime_ns, format, width, height}} for existing files.
+
+    Cached entries are reused while size and mtime are unchanged; headers
+    of the other files are read in a thread pool. Returns (info, read)
+    where read is the number of headers actually read.
+    """
+    info = {}
+    stale = []
+    for path in paths:
+        size, mtime_ns = files[path]
+        entry = cache.get(path)
+        if entry and entry['size'] == size and entry['mtime_ns'] == mtime_ns:
+            info[path] = entry
+        else:
+            stale.append(path)
+
+    if Image is None:
+        if stale:
+            print("   Image dimension check disabled (Pillow is not installed)")
+        for path in stale:
+            size, mtime_ns = files[path]
+            info[path] = {'size': size, 'mtime_ns': mtime_ns, 'format': None, 'width': None, 'height': None}
+        return info, 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, header in zip(stale, pool.map(read_dimensions, stale)):
+            size, mtime_ns = files[path]
+            image_format, width, height = header or (None, None, None)
+            info[path] = {'size': size, 'mtime_ns': mtime_ns, 'format': image_format,
+                          'width': width, 'height': height}
+    return info, len(stale)
+
+
+def check_images(data, mapping=None, workers=SCAN_WORKERS, cache_file=CACHE_FILE):
+    """
+    Resolve and check every image reference.
+
+    Returns a dict with:
+    - 'problems': list of {owner, field, ref, path, problem}, problem being
+      'missing', 'empty', 'unreadable' or 'oversized (...)'
+    - 'checked', 'remote': number of local and remote references
+    - 'headers_read': headers read (the rest came from the cache)
+    """
+    refs = list(iter_image_refs(data, mapping))
+    local = [(owner, field, ref, resolve_ref(ref)) for owner, field, ref in refs]
+    remote = sum(1 for *_, path in local if path is None)
+    local = [item for item in local if item[3] is not None]
+    files = scan_files(ref_dirs(path for *_, path in local), workers, recursive=False)
+
+    existing = sorted({path for *_, path in local if path in files})
+    cache = load_json(cache_file)
+    info, headers_read = image_info(existing, files, cache, workers)
+    if headers_read or cache.keys() != info.keys():
+        write_json_atomic(cache_file, dict(sorted(info.items())))
+
+    problems = []
+    for owner, field, ref, path in local:
+        entry = info.get(path)
+        if entry is None:
+            problem = 'missing'
+        elif entry['size'] == 0:
+            problem = 'empty'
+        elif Image is not None and entry['width'] is None:
+            problem = 'unreadable'
+        elif entry['size'] > MAX_IMAGE_BYTES:
+            problem = f"oversized ({entry['size'] / 1_000_000:.1f} MB)"
+        elif max(entry['width'] or 0, entry['height'] or 0) > MAX_IMAGE_DIMENSION:
+            problem = f"oversized ({entry['width']}x{entry['height']})"
+        else:
+            continue
+        problems.append({'owner': owner, 'field': field, 'ref': ref, 'path': path, 'problem': problem})
+
+    return {'problems': problems, 'checked': len(local), 'remote': remote, 'headers_read': headers_read}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check catalog image references')
+    parser.add_argument('--catalog', default=PAGE_CONTENT_FILE)
+    parser.add_argument('--mapping', default=MAPPING_FILE)
+    parser.add_argument('--workers', type=int, default=SCAN_WORKERS)
+    args = parser.parse_args(argv)
+
+    with open(args.catalog, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    mapping = load_json(args.mapping) if os.path.exists(args.mapping) else {}
+
+    print("="*80)
+    print("IMAGE REFERENCE CHECK")
+    print("="*80)
+    result = check_images(data, mapping, args.workers)
+
+    for problem in result['problems']:
+        print(f"⚠️  {problem['owner']} {problem['field']}: {problem['problem']} - {problem['path']}")
+
+    print(f"\nLocal references checked: {result['checked']} "
+          f"({result['headers_read']} headers read, rest cached)")
+    print(f"Remote references (not checked): {result['remote']}")
+    print(f"Problems: {len(result['problems'])}")
+    return not any(p['problem'] == 'missing' for p in result['problems'])
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
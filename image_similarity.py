@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash near-duplicate detection for product images.
+
+Supplier archives often ship the same packshot twice: another resolution,
+format or re-encode. Byte-level dedup (image_store.py) misses those, so
+each image gets a 64-bit difference hash (dHash) that survives resizing
+and recompression, and the hashes go into a BK-tree keyed on Hamming
+distance. Looking up everything within a few bits of an image then only
+visits a small part of the tree instead of comparing against every image.
+
+Needs Pillow; without it no fingerprints are produced and nothing is
+treated as a duplicate.
+"""
+
+import os
+
+from image_utils import flatten_alpha, map_images
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+HASH_SIZE = 8
+SIMILARITY_WORKERS = os.cpu_count() or 4
+
+# Re-encodes and resizes of one packshot differ by 0-5 bits here, different
+# products in similar bottles by 15+ (Lipo 6 variants: 4, see
+# pick_best_copies for why that is still safe)
+MAX_DISTANCE = 6
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    """64-bit difference hash: is each pixel darker than its right neighbour"""
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = value << 1 | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def image_fingerprint(path):
+    """{'dhash', 'width', 'height', 'bytes'} for one image file"""
+    with Image.open(path) as image:
+        width, height = image.size
+        image.draft('RGB', (64, 64))
+        value = dhash(flatten_alpha(image))
+    return {
+        'dhash': value,
+        'width': width,
+        'height': height,
+        'bytes': os.path.getsize(path)
+    }
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with Hamming distance"""
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value, item):
+        """Insert item under hash value"""
+        node = [value, item, {}]
+        self._size += 1
+        if self._root is None:
+            self._root = node
+            return
+        current = self._root
+        while True:
+            distance = hamming(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value, radius):
+        """List (distance, item) for every entry within radius of value"""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                found.append((distance, item))
+            # Triangle inequality: only subtrees at distance-radius..distance+radius
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def fingerprint_images(paths, workers=SIMILARITY_WORKERS):
+    """
+    image_fingerprint() for many files in a process pool.
+
+    Returns {path: fingerprint}; unreadable files map to None and an empty
+    dict is returned when Pillow is not installed.
+    """
+    if Image is None:
+        print("   Near-duplicate detection disabled (Pillow is not installed)")
+        return {}
+
+    return map_images(image_fingerprint, paths, workers)
+
+
+def build_index(fingerprints):
+    """BK-tree of every fingerprinted path"""
+    tree = BKTree()
+    for path, fingerprint in fingerprints.items():
+        if fingerprint:
+            tree.add(fingerprint['dhash'], path)
+    return tree
+
+
+def _quality(fingerprint):
+    """Prefer more pixels, then the larger (less compressed) file"""
+    if not fingerprint:
+        return (0, 0)
+    return (fingerprint['width'] * fingerprint['height'], fingerprint['bytes'])
+
+
+def pick_best_copies(paths, fingerprints, tree, max_distance=MAX_DISTANCE):
+    """
+    Reduce paths to one image per visual.
+
+    Near-duplicates are looked up in the BK-tree but only grouped with
+    other members of paths, so similar packshots of different products
+    (which live in other mapping entries) are never merged. Each group is
+    represented by its highest-resolution copy, placed where the group's
+    first image was.
+
+    Returns (kept, dropped) lists of paths.
+    """
+    paths = list(dict.fromkeys(paths))
+    members = set(paths)
+    assigned = set()
+    kept = []
+    dropped = []
+
+    for path in paths:
+        if path in assigned:
+            continue
+        group = {path}
+        fingerprint = fingerprints.get(path)
+        if fingerprint:
+            group.update(
+                item for _, item in tree.search(fingerprint['dhash'], max_distance)
+                if item in members and item not in assigned
+            )
+        best = max(sorted(group), key=lambda item: _quality(fingerprints.get(item)))
+        assigned |= group
+        kept.append(best)
+        dropped.extend(item for item in paths if item in group and item != best)
+
+    return kept, dropped
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for product images.
+
+Every image is saved once under images/store/ as <sha256 prefix><ext>, no
+matter how many archives or products it arrives with. An index
+(backend/image_store_index.json, outside the served images/ tree) maps
+each logical name - the path the image would have had in its product
+folder - to that canonical file, so the import path can dedupe identical
+images and image_mapping.json points to canonical paths.
+
+`ingest` moves existing images into the store: references in the catalog
+JSON files are rewritten to the canonical paths and every original is
+replaced by a hard link to its blob, so nothing is stored twice and paths
+built at runtime (JS/HTML) or URL-encoded keep working. Originals that no
+file seems to refer to any more are only listed; they are deleted with
+--prune, since a plain-text search can miss references. `gc` deletes blobs
+that no file in the repository refers to any more.
+
+Usage:
+    python image_store.py scan [DIR]                           # report byte-identical files
+    python image_store.py ingest [DIR] [--prune] [--dry-run]   # move DIR's images into the store
+    python image_store.py gc [--dry-run]                       # delete unreferenced blobs
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from catalog_store import atomic_write, write_json_atomic
+
+STORE_DIR = Path('images/store')
+INDEX_FILE = Path('backend/image_store_index.json')
+# Where the index lived before it moved out of the served tree
+LEGACY_INDEX_FILE = STORE_DIR / 'index.json'
+INDEX_VERSION = 1
+INGEST_DIR = Path('images/products')
+
+# Files searched for image references by ingest and gc
+REFERENCE_EXTENSIONS = ('.json', '.html', '.js', '.mjs', '.css', '.md', '.txt', '.xml')
+REFERENCE_SKIP_DIRS = {'.git', 'node_modules', '__pycache__', 'images', '.results'}
+# Caches and indexes that list images without using them
+REFERENCE_IGNORED_FILES = {
+    INDEX_FILE.as_posix(),
+    'backend/image_check_cache.json',
+    'backend/image_import_manifest.json',
+}
+
+# 64 bits of the digest keep names short and collisions out of reach
+HASH_LENGTH = 16
+COPY_BUFFER_SIZE = 1024 * 1024
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif')
+
+
+def _load_index(index_file):
+    """names dict from the index file, empty if missing or outdated"""
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != INDEX_VERSION:
+        return {}
+    return data.get('names', {})
+
+
+class ImageStore:
+    """Hash-named image files plus a name -> canonical path index"""
+
+    def __init__(self, store_dir=STORE_DIR, index_file=INDEX_FILE):
+        self.store_dir = Path(store_dir)
+        self.index_file = Path(index_file)
+        self.names = _load_index(self.index_file)
+        self.dirty = False
+        self._legacy_index = self.store_dir / LEGACY_INDEX_FILE.name
+        if not self.names and self._legacy_index.exists():
+            self.names = _load_index(self._legacy_index)
+            self.dirty = bool(self.names)
+        self._lock = threading.Lock()
+
+    def canonical_path(self, name):
+        """Canonical path stored for a logical name, or None"""
+        return self.names.get(Path(name).as_posix())
+
+    def put_stream(self, src, name):
+        """
+        Store the bytes read from src under the logical name.
+
+        The data is hashed while it is copied into a temp file in the store;
+        if a blob with the same hash exists the temp file is dropped,
+        otherwise it is renamed into place. Safe to call from several
+        threads at once.
+
+        Returns the canonical path (e.g. 'images/store/3fa2...c1.jpg').
+        """
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(prefix='.blob.', suffix='.tmp', dir=self.store_dir)
+        try:
+            with os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+
+            ext = Path(name).suffix.lower()
+            blob = self.store_dir / (digest.hexdigest()[:HASH_LENGTH] + ext)
+            if blob.exists():
+                os.unlink(tmp_path)
+            else:
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, blob)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        canonical = blob.as_posix()
+        with self._lock:
+            key = Path(name).as_posix()
+            if self.names.get(key) != canonical:
+                self.names[key] = canonical
+                self.dirty = True
+        return canonical
+
+    def put_file(self, path, name=None):
+        """Store a file from disk (name defaults to its path)"""
+        with open(path, 'rb') as src:
+            return self.put_stream(src, name or path)
+
+    def blobs(self):
+        """{canonical path: [logical names]} for everything in the index"""
+        blobs = {}
+        for name, canonical in sorted(self.names.items()):
+            blobs.setdefault(canonical, []).append(name)
+        return blobs
+
+    def forget(self, canonical_paths):
+        """Drop every logical name that points at one of canonical_paths"""
+        canonical_paths = set(canonical_paths)
+        with self._lock:
+            for name in [name for name, canonical in self.names.items() if canonical in canonical_paths]:
+                del self.names[name]
+                self.dirty = True
+
+    def save(self):
+        """Write the index back if anything changed. Returns True if written."""
+        if not self.dirty:
+            return False
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.index_file, {
+            'version': INDEX_VERSION,
+            'names': dict(sorted(self.names.items()))
+        })
+        if self._legacy_index.exists():
+            os.unlink(self._legacy_index)
+        self.dirty = False
+        return True
+
+
+def iter_image_files(root):
+    """Yield image files below root, skipping the store itself"""
+    store = STORE_DIR.resolve()
+    for dirpath, dirnames, filenames in os.walk(root):
+        if Path(dirpath).resolve() == store:
+            dirnames[:] = []
+            continue
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if Path(filename).suffix.lower() in IMAGE_EXTENSIONS:
+                yield Path(dirpath) / filename
+
+
+def find_duplicates(root):
+    """
+    Group byte-identical images below root.
+
+    Files are bucketed by size first, so only same-sized files are hashed.
+    Returns a list of path lists, each with two or more identical files.
+    """
+    by_size = {}
+    for path in iter_image_files(root):
+        by_size.setdefault(path.stat().st_size, []).append(path)
+
+    groups = []
+    for paths in by_size.values():
+        if len(paths) < 2:
+            continue
+        by_hash = {}
+        for path in paths:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+                    digest.update(chunk)
+            by_hash.setdefault(digest.hexdigest(), []).append(path)
+        groups.extend(group for group in by_hash.values() if len(group) > 1)
+    return groups
+
+
+def iter_reference_files(root='.'):
+    """Text files below root that may refer to images (see REFERENCE_EXTENSIONS)"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in REFERENCE_SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            path = Path(os.path.relpath(Path(dirpath) / filename, root))
+            if path.suffix.lower() in REFERENCE_EXTENSIONS and path.as_posix() not in REFERENCE_IGNORED_FILES:
+                yield Path(root) / path
+
+
+def find_references(paths, files):
+    """{path: [files whose text contains path]} for the given image paths"""
+    references = {path: [] for path in paths}
+    for file in files:
+        try:
+            text = Path(file).read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        for path in paths:
+            if path in text:
+                references[path].append(Path(file).as_posix())
+    return references
+
+
+def rewrite_references(replacements, files):
+    """Replace old paths with new ones in files; returns the files changed"""
+    # Longest first so a path is never rewritten through one of its prefixes
+    ordered = sorted(replacements.items(), key=lambda item: len(item[0]), reverse=True)
+    changed = []
+    for file in files:
+        text = Path(file).read_text(encoding='utf-8')
+        new_text = text
+        for old, new in ordered:
+            new_text = new_text.replace(old, new)
+        if new_text != text:
+            with atomic_write(file) as f:
+                f.write(new_text)
+            changed.append(Path(file).as_posix())
+    return changed
+
+
+def _link_to_blob(path, blob):
+    """Replace path with a hard link to blob; False if the filesystem refuses"""
+    tmp_path = path.with_name('.' + path.name + '.link.tmp')
+    try:
+        os.link(blob, tmp_path)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        if tmp_path.exists():
+            os.unlink(tmp_path)
+        return False
+
+
+def ingest(root=INGEST_DIR, store=None, catalog_files=None, repo_root='.', dry_run=False, prune=False):
+    """
+    Move the images below root into the store.
+
+    References in catalog_files (default: backend/*.json) are rewritten to
+    the canonical paths and each original is replaced by a hard link to its
+    blob. Originals no file in the repository still refers to are listed as
+    'unreferenced'; with prune=True they are deleted instead of linked.
+
+    Returns {'files', 'rewritten', 'linked', 'unreferenced', 'removed'}
+    where linked maps each linked original to the files referring to it.
+    """
+    store = store or ImageStore()
+    if catalog_files is None:
+        catalog_files = [
+            path for path in sorted(Path(repo_root, 'backend').glob('*.json'))
+            if Path(os.path.relpath(path, repo_root)).as_posix() not in REFERENCE_IGNORED_FILES
+        ]
+    catalog_set = {Path(file).as_posix() for file in catalog_files}
+    originals = {}
+    for path in iter_image_files(root):
+        key = Path(os.path.relpath(path, repo_root)).as_posix()
+        originals[key] = None if dry_run else store.put_file(path, key)
+
+    if not dry_run:
+        store.save()
+        rewritten = rewrite_references(originals, catalog_files)
+    references = find_references(list(originals), iter_reference_files(repo_root))
+    if dry_run:
+        # What the catalog rewrite would leave behind
+        rewritten = sorted({file for files in references.values() for file in files if file in catalog_set})
+        references = {path: [f for f in files if f not in catalog_set] for path, files in references.items()}
+
+    result = {'files': len(originals), 'rewritten': rewritten, 'linked': {}, 'unreferenced': [], 'removed': []}
+    for path, canonical in originals.items():
+        original = Path(repo_root, path)
+        if not references[path]:
+            result['unreferenced'].append(path)
+            if prune:
+                if not dry_run:
+                    os.unlink(original)
+                result['removed'].append(path)
+                continue
+        if dry_run or _link_to_blob(original, Path(repo_root, canonical)):
+            result['linked'][path] = references[path]
+    return result
+
+
+def collect_garbage(store=None, repo_root='.', dry_run=False):
+    """
+    Delete blobs in the store that no file in the repository refers to.
+
+    Their index entries are dropped too. Returns the deleted blob paths.
+    """
+    store = store or ImageStore()
+    if not store.store_dir.is_dir():
+        return []
+    blobs = sorted(
+        Path(os.path.relpath(path, repo_root)).as_posix()
+        for path in store.store_dir.iterdir()
+        if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    references = find_references(blobs, iter_reference_files(repo_root))
+    garbage = [blob for blob in blobs if not references[blob]]
+    if not dry_run:
+        for blob in garbage:
+            os.unlink(Path(repo_root, blob))
+        store.forget(garbage)
+        store.save()
+    return garbage
+
+
+def main(argv):
+    dry_run = '--dry-run' in argv
+    prune = '--prune' in argv
+    argv = [arg for arg in argv if arg not in ('--dry-run', '--prune')]
+    command = argv[1] if len(argv) > 1 else 'scan'
+    root = Path(argv[2]) if len(argv) > 2 else None
+
+    if command == 'scan':
+        groups = find_duplicates(root or Path('images'))
+        wasted = 0
+        for group in groups:
+            size = group[0].stat().st_size
+            wasted += size * (len(group) - 1)
+            print(f"{len(group)} x {size:,} bytes:")
+            for path in group:
+                print(f"   {path}")
+        print(f"\n{len(groups)} duplicate groups, {wasted / 1024 / 1024:.1f} MB reclaimable")
+    elif command == 'ingest':
+        result = ingest(root or INGEST_DIR, dry_run=dry_run, prune=prune)
+        for path, files in result['linked'].items():
+            if files:
+                print(f"   still referenced: {path} ({', '.join(files[:3])})")
+        for file in result['rewritten']:
+            print(f"   {'would rewrite' if dry_run else 'rewrote'} {file}")
+        prefix = 'Would move' if dry_run else 'Moved'
+        print(f"{prefix} {result['files']} files into {STORE_DIR}: "
+              f"{len(result['linked'])} {'to be ' if dry_run else ''}hard-linked, "
+              f"{len(result['removed'])} {'to be ' if dry_run else ''}removed")
+        if result['unreferenced'] and not prune:
+            print(f"{len(result['unreferenced'])} originals look unreferenced; "
+                  f"re-run with --prune to delete them (check with --dry-run first)")
+    elif command == 'gc':
+        garbage = collect_garbage(dry_run=dry_run)
+        for blob in garbage:
+            print(f"   {blob}")
+        print(f"{'Would delete' if dry_run else 'Deleted'} {len(garbage)} unreferenced blobs")
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the per-image analysis modules (image_classifier.py,
+image_similarity.py).
+
+flatten_alpha() renders transparency onto white the way the site shows it,
+and map_images() runs a per-file function over many images in a process
+pool, turning unreadable files into None instead of aborting the batch.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Errors a corrupt or unsupported image file raises while decoding
+IMAGE_ERRORS = (OSError, ValueError)
+
+
+def flatten_alpha(image):
+    """Composite transparent images onto white; other modes are returned unchanged"""
+    # Transparent backgrounds count as white, like they render on the site
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image)
+    return image
+
+
+def _safe_call(func, errors, path):
+    try:
+        return func(path)
+    except errors:
+        return None
+
+
+def map_images(func, paths, workers, errors=IMAGE_ERRORS):
+    """
+    {path: func(path)} for unique paths, in a process pool when workers > 1.
+
+    func must be a module-level function (it is pickled to the workers);
+    paths it fails on with one of errors map to None.
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+    safe = partial(_safe_call, func, errors)
+    if workers <= 1 or len(paths) == 1:
+        return {path: safe(path) for path in paths}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(paths) // (workers * 4))
+        return dict(zip(paths, pool.map(safe, paths, chunksize=chunksize)))
@@ -4,216 +4,196 @@ Script to improve product descriptions for products with poor/minimal content.
 Focus on: Fat No More, Thermo Caps, Essential Fat Burner, Fat Transporter, Lipo 6, Lipo 6 Black
 """
 
-import json
+from catalog_store import CatalogStore
 
-def load_page_content():
-    """Load the page_content.json file"""
-    with open('/home/runner/work/otslabvai/otslabvai/backend/page_content.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_page_content(data):
-    """Save the page_content.json file"""
-    with open('/home/runner/work/otslabvai/otslabvai/backend/page_content.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def update_product_description(product_id, description):
+def update_product_description(catalog, product_id, description):
     """Update description for a specific product"""
-    data = load_page_content()
-    
-    for component in data['page_content']:
-        if component.get('type') == 'product_category' and 'products' in component:
-            for product in component['products']:
-                if product.get('product_id') == product_id:
-                    product['public_data']['description'] = description
-                    print(f"✓ Updated description for {product['public_data']['name']}")
-                    save_page_content(data)
-                    return True
+    if catalog.update_product_field(product_id, 'public_data.description', description):
+        print(f"✓ Updated description for {catalog.get_product(product_id)['public_data']['name']}")
+        return True
     return False
 
-def update_faq(product_id, faq_list):
+def update_faq(catalog, product_id, faq_list):
     """Update FAQ for a specific product"""
-    data = load_page_content()
-    
-    for component in data['page_content']:
-        if component.get('type') == 'product_category' and 'products' in component:
-            for product in component['products']:
-                if product.get('product_id') == product_id:
-                    product['public_data']['faq'] = faq_list
-                    print(f"✓ Updated FAQ for {product['public_data']['name']}")
-                    save_page_content(data)
-                    return True
+    if catalog.update_product_field(product_id, 'public_data.faq', faq_list):
+        print(f"✓ Updated FAQ for {catalog.get_product(product_id)['public_data']['name']}")
+        return True
     return False
 
 def main():
     """Improve descriptions and FAQs for products with minimal content"""
     
-    # 1. Fat No More - Enhanced description
-    update_product_description('prod-16905', 
-        "Fat No More е мощен термогенен комплекс, създаден за жени, които искат да ускорят отслабването си чрез интензивно изгаряне на калории и повишаване на метаболизма. Формулата комбинира проверени термогенни съставки като екстракт от зелено кафе, L-карнитин и синефрин, които работят синергично за превръщане на натрупаните мазнини в енергия. Продуктът е идеален за жени с активен начин на живот, които спортуват редовно и искат да максимизират резултатите си. Освен изгарянето на мазнини, Fat No More дава мощен енергиен тласък, който помага да издържите на интензивни тренировки и да останете активни през целия ден. Подходящ е за тези, които искат видима промяна в проблемните зони - корем, бедра, седалище.")
-    
-    # Fat No More FAQ
-    update_faq('prod-16905', [
-        {
-            "question": "Какво прави Fat No More толкова ефективен?",
-            "answer": "Комбинацията от L-карнитин (за транспорт на мазнини към митохондриите), зелено кафе (за блокиране усвояването на въглехидрати) и синефрин (за термогенеза) създава тройно действие, което атакува мазнините от различни посоки."
-        },
-        {
-            "question": "Трябва ли да тренирам, докато приемам Fat No More?",
-            "answer": "За оптимални резултати да. Продуктът значително увеличава изгарянето на калории по време на физическа активност. Дори 30 минути ходене дневно ще даде много по-добри резултати в комбинация с продукта."
-        },
-        {
-            "question": "Кога ще видя първите резултати?",
-            "answer": "При редовен прием и поне 3-4 тренировки седмично, първите промени се забелязват след 2-3 седмици. Оптималните резултати се постигат след 8-12 седмици."
-        },
-        {
-            "question": "Може ли да се комбинира с други продукти?",
-            "answer": "Да, работи отлично в комбинация с L-карнитин за още по-силен ефект. Не комбинирайте с други термогенни продукти или високи дози кофеин."
-        }
-    ])
-    
-    # 2. Thermo Caps - Enhanced description
-    update_product_description('prod-24527',
-        "Thermo Caps е специално разработена термогенна формула за жени, която комбинира силата на натуралните екстракти за максимално ускоряване на метаболизма и изгаряне на мазнини. Продуктът съдържа мощна комбинация от екстракт от зелен чай (богат на катехини EGCG), кофеин, L-тирозин и екстракт от кайенски пипер, които работят заедно за повишаване на телесната температура и стимулиране на липолизата - процеса на разграждане на мазнините. Формулата е обогатена с витамини от група В, които подпомагат енергийния метаболизъм и намаляват умората. Thermo Caps е идеален за жени, които искат да постигнат по-стройна фигура, да намалят целулита и да имат повече енергия за ежедневните си дейности. Подходящ е както за активни жени, които тренират, така и за тези с по-заседнал начин на живот.")
-    
-    # Thermo Caps FAQ
-    update_faq('prod-24527', [
-        {
-            "question": "Защо Thermo Caps е специално за жени?",
-            "answer": "Формулата е балансирана да отговори на специфичните нужди на женския метаболизъм, който естествено е по-бавен от мъжкия. Съставките са подбрани да работят ефективно дори при хормонални колебания."
-        },
-        {
-            "question": "Ще усетя ли повишена температура?",
-            "answer": "Да, това е нормално - продуктът работи като повишава термогенезата (производството на топлина в тялото). Може да усетите леко затопляне, особено след хранене или по време на активност. Това е знак, че работи."
-        },
-        {
-            "question": "Мога ли да го приемам дългосрочно?",
-            "answer": "Препоръчва се курсове от 8-10 седмици с 2-4 седмици почивка между тях. Това позволява на тялото да не се адаптира към съставките и да запази ефективността."
-        },
-        {
-            "question": "Има ли ефект върху целулита?",
-            "answer": "Да, като ускорява изгарянето на мазнини и подобрява кръвообращението, Thermo Caps помага за намаляване на целулита, особено в комбинация с антицелулитен масаж и достатъчно вода."
-        }
-    ])
-    
-    # 3. Essential Fat Burner - Enhanced description
-    update_product_description('prod-37086',
-        "Essential Fat Burner от RAW Nutrition е премиум термогенна формула, създадена с акцент върху качеството и ефективността. Този продукт е предназначен за жени, които искат сериозни резултати без компромис с качеството на съставките. Формулата включва висококачествени екстракти от зелен чай, кофеин, йохимбин, синефрин и L-тирозин - комбинация, която стимулира метаболизма, увеличава изгарянето на калории и подпомага разграждането на упоритите мазнини в проблемните зони. Essential Fat Burner също така работи за контрол на апетита чрез стабилизиране на кръвната захар и намаляване на желанието за сладко. Подходящ е за жени, които водят здравословен начин на живот, обръщат внимание на произхода на съставките и искат да инвестират в качествен продукт. Перфектен за тези, които комбинират здравословно хранене със спорт и търсят допълнителен тласък към целите си.")
-    
-    # Essential Fat Burner FAQ
-    update_faq('prod-37086', [
-        {
-            "question": "Какво отличава Essential Fat Burner от другите термогенни продукти?",
-            "answer": "RAW Nutrition залага на прозрачност и качество. Всички съставки са с ясно посочени дози (не се крият зад 'патентовани смеси'), екстрактите са стандартизирани и с доказан произход. Това гарантира постоянно качество и ефективност."
-        },
-        {
-            "question": "Подходящ ли е за начинаещи?",
-            "answer": "Да, Essential Fat Burner е с умерена сила - по-силен от натуралните билкови продукти, но не толкова агресивен като екстремните термогеници. Идеален баланс за стартиране."
-        },
-        {
-            "question": "Може ли да помогне ако имам резистентност към инсулин?",
-            "answer": "Формулата подпомага чувствителността към инсулин чрез екстракт от канела и хром, което помага за по-стабилна кръвна захар. Винаги консултирайте с лекар ако имате диабет или предиабет."
-        },
-        {
-            "question": "Колко капсули има в опаковката?",
-            "answer": "60 капсули, което е достатъчно за 30 дни при прием от 2 капсули дневно."
-        }
-    ])
-    
-    # 4. Burn4All Extreme - Enhanced description  
-    update_product_description('prod-24605',
-        "Burn4All Extreme е един от най-силните термогенни продукти на пазара, създаден за жени с опит в използването на фет бърнъри, които търсят екстремни резултати. Това не е продукт за начинаещи - формулата съдържа високи дози стимуланти и термогенни съставки, които предизвикват интензивна термогенеза, драстично ускоряване на метаболизма и мощно потискане на апетита. Сред активните съставки са синефрин, йохимбин HCL, кофеин, екстракт от горчив портокал и черен пипер, които работят в синергия за максимално изгаряне на калории и мобилизиране на упоритите мазнинни депа. Burn4All Extreme е идеален за финалната фаза на оформяне - последните 3-5 кг, които са най-трудни за сваляне, или за подготовка за специално събитие. Изисква се добра толерантност към стимуланти и задължително спазване на препоръчителните дози.")
-    
-    # Burn4All Extreme FAQ
-    update_faq('prod-24605', [
-        {
-            "question": "Защо се нарича 'Extreme'?",
-            "answer": "Заради високите концентрации на активни съставки. Това е продукт за опитни потребители, които вече са пробвали други фет бърнъри и търсят следващото ниво на интензивност."
-        },
-        {
-            "question": "Подходящ ли е за мен ако не съм пробвала термогенни продукти преди?",
-            "answer": "НЕ, не е препоръчително. Започнете с по-меки продукти като Essential Fat Burner или Thermo Caps, за да оцените толерантността си към стимуланти."
-        },
-        {
-            "question": "Какви усещания да очаквам?",
-            "answer": "Силен прилив на енергия, повишена концентрация, усещане за топлина и изпотяване, пълно липса на апетит. Ако усещанията са прекалено силни (треперене, сърцебиене), намалете дозата."
-        },
-        {
-            "question": "Колко дълго мога да го приемам?",
-            "answer": "Максимум 8 седмици, след което е задължителна почивка от 4-6 седмици. Това предотвратява свикване и дава почивка на нервната система."
-        }
-    ])
-    
-    # 5. Fat Transporter - Enhanced description
-    update_product_description('prod-5177',
-        "Fat Transporter е уникален липотропен продукт, който работи по различен механизъм от класическите термогенни фет бърнъри. Вместо да разчита основно на стимуланти, той съдържа специализирани липотропни съставки - холин, инозитол, метионин, L-карнитин - които подпомагат транспорта на мазнините от тъканите към черния дроб, където се метаболизират и превръщат в енергия. Продуктът е идеален за жени, които искат да отслабват без нервност и сърцебиене, или за тези, които са чувствителни към кофеин и стимуланти. Fat Transporter работи особено добре за подпомагане на чернодробната функция и детоксикация, което е критично важно при всяка програма за отслабване. Подходящ е за дългосрочна употреба и може да се комбинира безопасно с други продукти. Перфектен избор за жени, които водят здравословен живот и искат да подкрепят естествените процеси на тялото си.")
-    
-    # Fat Transporter FAQ
-    update_faq('prod-5177', [
-        {
-            "question": "Какво означава 'липотропен'?",
-            "answer": "Липотропните съставки са вещества, които помагат на черния дроб да метаболизира и елиминира мазнините по-ефективно. Те 'транспортират' мазнините и предотвратяват натрупването им в черния дроб."
-        },
-        {
-            "question": "Подходящ ли е за хора, които не могат да пият кафе?",
-            "answer": "Да, това е един от най-добрите избори за чувствителни към кофеин хора. Fat Transporter не съдържа силни стимуланти и не предизвиква нервност или безсъние."
-        },
-        {
-            "question": "Ще видя ли бързи резултати?",
-            "answer": "Резултатите са по-плавни и постепенни в сравнение с термогенните продукти, но са устойчиви. Очаквайте видима промяна след 4-6 седмици. Оптимално е 12+ седмици."
-        },
-        {
-            "question": "Може ли да се комбинира с други продукти?",
-            "answer": "Да, работи отлично в комбинация с леки термогенни продукти като Thermo Master или дори с по-силни като Lida/MeiziMax за синергичен ефект."
-        }
-    ])
-    
-    # 6. Lipo 6 / L-Carnitine - Enhanced description
-    update_product_description('prod-31',
-        "Lipo 6 L-Carnitine е чист L-карнитин тартрат в течна форма (liqui-caps) от водещия производител Nutrex Research. L-карнитинът е естествена аминокиселина, която играе ключова роля в транспортирането на мастните киселини към митохондриите на клетките, където се изгарят за енергия. За разлика от стимулантните фет бърнъри, L-карнитинът работи меко и безопасно, като просто подпомага естествения процес на използване на мазнините като гориво. Продуктът е особено ефективен при физическа активност - помага за по-бързо изгаряне на мазнини по време на тренировки, увеличава издръжливостта и ускорява възстановяването. Lipo 6 L-Carnitine е идеален за жени, които тренират редовно (фитнес, йога, бягане, плуване) и искат да оптимизират използването на мазнините като енергиен източник. Подходящ е за дългосрочна употреба, няма странични ефекти и може безопасно да се комбинира с всички други продукти.")
-    
-    # Lipo 6 L-Carnitine FAQ
-    update_faq('prod-31', [
-        {
-            "question": "Каква е разликата между L-карнитин и термогенните продукти?",
-            "answer": "L-карнитинът не е стимулант и не повишава метаболизма директно. Той работи като 'транспортна система', която помага на тялото да използва мазнините по-ефективно, особено по време на тренировка."
-        },
-        {
-            "question": "Кога да приемам L-карнитин за най-добри резултати?",
-            "answer": "30-60 минути преди тренировка за максимален ефект. В дни без тренировка - сутрин и следобед. Работи най-добре при аеробни активности (кардио, ходене, бягане)."
-        },
-        {
-            "question": "Ще сваля ли килограми само от L-карнитин без тренировки?",
-            "answer": "Ефектът ще бъде минимален без физическа активност. L-карнитинът помага на тялото да изгаря мазнини ПО ВРЕМЕ на движение. За хора без тренировки са по-подходящи термогенните продукти."
-        },
-        {
-            "question": "Колко капсули има в опаковката?",
-            "answer": "120 liqui-caps (течни капсули), което е достатъчно за 60 дни при стандартен прием от 2 капсули дневно, или 30 дни при интензивен прием от 4 капсули."
-        }
-    ])
-    
-    # 7. Lipo 6 Black - Enhanced description
-    update_product_description('prod-742',
-        "Lipo 6 Black е флагманският екстремен термогенен продукт на Nutrex Research, създаден за максимални резултати при отслабване. Това е един от най-мощните и най-популярни фет бърнъри в света, използван от хиляди жени и мъже, които искат драматична трансформация. Формулата съдържа ултра-концентрирана смес от кофеин, теобромин, синефрин, йохимбин HCL, кайенски пипер и други активни съставки, които предизвикват интензивна термогенеза, мощно потискане на апетита и взривна енергия. Lipo 6 Black не само изгаря мазнини, но и подобрява фокуса и ментална яснота, което го прави идеален за жени с натоварен график, които искат да останат продуктивни докато отслабват. Продуктът е предназначен за опитни потребители с добра толерантност към стимуланти и изисква стриктно спазване на дозировката. Това е избор №1 за финалното оформяне и постигане на изваяна, спортна фигура.")
-    
-    # Lipo 6 Black FAQ
-    update_faq('prod-742', [
-        {
-            "question": "Каква е разликата между Lipo 6 Black и другите Lipo 6 продукти?",
-            "answer": "Lipo 6 Black е най-силната версия - 'Black' означава максимална концентрация. Има още Lipo 6 (стандартен), Lipo 6 Stim-Free (без стимуланти) и други варианти, но Black е топ по ефективност."
-        },
-        {
-            "question": "Безопасен ли е за жени?",
-            "answer": "Да, при спазване на препоръчителната доза. Много жени по света го използват успешно. Важно е да започнете с 1 капсула за оценка на толерантност и да НЕ превишавате 3 капсули дневно."
-        },
-        {
-            "question": "Какви резултати мога да очаквам?",
-            "answer": "При редовен прием, здравословно хранене и физическа активност, повечето потребители губят 3-6 кг за 8 седмици. Резултатите варират според стартовото тегло и начин на живот."
-        },
-        {
-            "question": "Може ли да предизвика странични ефекти?",
-            "answer": "При превишаване на дозата или при чувствителни към кофеин хора може да се появи силно сърцебиене, треперене, главоболие, безсъние. Ако сте нов потребител на термогеници, започнете с по-мек продукт първо."
-        }
-    ])
+    catalog = CatalogStore.load()
+    
+    # Every edit is staged in memory and flushed with one atomic write
+    with catalog.transaction():
+        # 1. Fat No More - Enhanced description
+        update_product_description(catalog, 'prod-16905', 
+            "Fat No More е мощен термогенен комплекс, създаден за жени, които искат да ускорят отслабването си чрез интензивно изгаряне на калории и повишаване на метаболизма. Формулата комбинира проверени термогенни съставки като екстракт от зелено кафе, L-карнитин и синефрин, които работят синергично за превръщане на натрупаните мазнини в енергия. Продуктът е идеален за жени с активен начин на живот, които спортуват редовно и искат да максимизират резултатите си. Освен изгарянето на мазнини, Fat No More дава мощен енергиен тласък, който помага да издържите на интензивни тренировки и да останете активни през целия ден. Подходящ е за тези, които искат видима промяна в проблемните зони - корем, бедра, седалище.")
+    
+        # Fat No More FAQ
+        update_faq(catalog, 'prod-16905', [
+            {
+                "question": "Какво прави Fat No More толкова ефективен?",
+                "answer": "Комбинацията от L-карнитин (за транспорт на мазнини към митохондриите), зелено кафе (за блокиране усвояването на въглехидрати) и синефрин (за термогенеза) създава тройно действие, което атакува мазнините от различни посоки."
+            },
+            {
+                "question": "Трябва ли да тренирам, докато приемам Fat No More?",
+                "answer": "За оптимални резултати да. Продуктът значително увеличава изгарянето на калории по време на физическа активност. Дори 30 минути ходене дневно ще даде много по-добри резултати в комбинация с продукта."
+            },
+            {
+                "question": "Кога ще видя първите резултати?",
+                "answer": "При редовен прием и поне 3-4 тренировки седмично, първите промени се забелязват след 2-3 седмици. Оптималните резултати се постигат след 8-12 седмици."
+            },
+            {
+                "question": "Може ли да се комбинира с други продукти?",
+                "answer": "Да, работи отлично в комбинация с L-карнитин за още по-силен ефект. Не комбинирайте с други термогенни продукти или високи дози кофеин."
+            }
+        ])
+    
+        # 2. Thermo Caps - Enhanced description
+        update_product_description(catalog, 'prod-24527',
+            "Thermo Caps е специално разработена термогенна формула за жени, която комбинира силата на натуралните екстракти за максимално ускоряване на метаболизма и изгаряне на мазнини. Продуктът съдържа мощна комбинация от екстракт от зелен чай (богат на катехини EGCG), кофеин, L-тирозин и екстракт от кайенски пипер, които работят заедно за повишаване на телесната температура и стимулиране на липолизата - процеса на разграждане на мазнините. Формулата е обогатена с витамини от група В, които подпомагат енергийния метаболизъм и намаляват умората. Thermo Caps е идеален за жени, които искат да постигнат по-стройна фигура, да намалят целулита и да имат повече енергия за ежедневните си дейности. Подходящ е както за активни жени, които тренират, така и за тези с по-заседнал начин на живот.")
+    
+        # Thermo Caps FAQ
+        update_faq(catalog, 'prod-24527', [
+            {
+                "question": "Защо Thermo Caps е специално за жени?",
+                "answer": "Формулата е балансирана да отговори на специфичните нужди на женския метаболизъм, който естествено е по-бавен от мъжкия. Съставките са подбрани да работят ефективно дори при хормонални колебания."
+            },
+            {
+                "question": "Ще усетя ли повишена температура?",
+                "answer": "Да, това е нормално - продуктът работи като повишава термогенезата (производството на топлина в тялото). Може да усетите леко затопляне, особено след хранене или по време на активност. Това е знак, че работи."
+            },
+            {
+                "question": "Мога ли да го приемам дългосрочно?",
+                "answer": "Препоръчва се курсове от 8-10 седмици с 2-4 седмици почивка между тях. Това позволява на тялото да не се адаптира към съставките и да запази ефективността."
+            },
+            {
+                "question": "Има ли ефект върху целулита?",
+                "answer": "Да, като ускорява изгарянето на мазнини и подобрява кръвообращението, Thermo Caps помага за намаляване на целулита, особено в комбинация с антицелулитен масаж и достатъчно вода."
+            }
+        ])
+    
+        # 3. Essential Fat Burner - Enhanced description
+        update_product_description(catalog, 'prod-37086',
+            "Essential Fat Burner от RAW Nutrition е премиум термогенна формула, създадена с акцент върху качеството и ефективността. Този продукт е предназначен за жени, които искат сериозни резултати без компромис с качеството на съставките. Формулата включва висококачествени екстракти от зелен чай, кофеин, йохимбин, синефрин и L-тирозин - комбинация, която стимулира метаболизма, увеличава изгарянето на калории и подпомага разграждането на упоритите мазнини в проблемните зони. Essential Fat Burner също така работи за контрол на апетита чрез стабилизиране на кръвната захар и намаляване на желанието за сладко. Подходящ е за жени, които водят здравословен начин на живот, обръщат внимание на произхода на съставките и искат да инвестират в качествен продукт. Перфектен за тези, които комбинират здравословно хранене със спорт и търсят допълнителен тласък към целите си.")
+    
+        # Essential Fat Burner FAQ
+        update_faq(catalog, 'prod-37086', [
+            {
+                "question": "Какво отличава Essential Fat Burner от другите термогенни продукти?",
+                "answer": "RAW Nutrition залага на прозрачност и качество. Всички съставки са с ясно посочени дози (не се крият зад 'патентовани смеси'), екстрактите са стандартизирани и с доказан произход. Това гарантира постоянно качество и ефективност."
+            },
+            {
+                "question": "Подходящ ли е за начинаещи?",
+                "answer": "Да, Essential Fat Burner е с умерена сила - по-силен от натуралните билкови продукти, но не толкова агресивен като екстремните термогеници. Идеален баланс за стартиране."
+            },
+            {
+                "question": "Може ли да помогне ако имам резистентност към инсулин?",
+                "answer": "Формулата подпомага чувствителността към инсулин чрез екстракт от канела и хром, което помага за по-стабилна кръвна захар. Винаги консултирайте с лекар ако имате диабет или предиабет."
+            },
+            {
+                "question": "Колко капсули има в опаковката?",
+                "answer": "60 капсули, което е достатъчно за 30 дни при прием от 2 капсули дневно."
+            }
+        ])
+    
+        # 4. Burn4All Extreme - Enhanced description  
+        update_product_description(catalog, 'prod-24605',
+            "Burn4All Extreme е един от най-силните термогенни продукти на пазара, създаден за жени с опит в използването на фет бърнъри, които търсят екстремни резултати. Това не е продукт за начинаещи - формулата съдържа високи дози стимуланти и термогенни съставки, които предизвикват интензивна термогенеза, драстично ускоряване на метаболизма и мощно потискане на апетита. Сред активните съставки са синефрин, йохимбин HCL, кофеин, екстракт от горчив портокал и черен пипер, които работят в синергия за максимално изгаряне на калории и мобилизиране на упоритите мазнинни депа. Burn4All Extreme е идеален за финалната фаза на оформяне - последните 3-5 кг, които са най-трудни за сваляне, или за подготовка за специално събитие. Изисква се добра толерантност към стимуланти и задължително спазване на препоръчителните дози.")
+    
+        # Burn4All Extreme FAQ
+        update_faq(catalog, 'prod-24605', [
+            {
+                "question": "Защо се нарича 'Extreme'?",
+                "answer": "Заради високите концентрации на активни съставки. Това е продукт за опитни потребители, които вече са пробвали други фет бърнъри и търсят следващото ниво на интензивност."
+            },
+            {
+                "question": "Подходящ ли е за мен ако не съм пробвала термогенни продукти преди?",
+                "answer": "НЕ, не е препоръчително. Започнете с по-меки продукти като Essential Fat Burner или Thermo Caps, за да оцените толерантността си към стимуланти."
+            },
+            {
+                "question": "Какви усещания да очаквам?",
+                "answer": "Силен прилив на енергия, повишена концентрация, усещане за топлина и изпотяване, пълно липса на апетит. Ако усещанията са прекалено силни (треперене, сърцебиене), намалете дозата."
+            },
+            {
+                "question": "Колко дълго мога да го приемам?",
+                "answer": "Максимум 8 седмици, след което е задължителна почивка от 4-6 седмици. Това предотвратява свикване и дава почивка на нервната система."
+            }
+        ])
+    
+        # 5. Fat Transporter - Enhanced description
+        update_product_description(catalog, 'prod-5177',
+            "Fat Transporter е уникален липотропен продукт, който работи по различен механизъм от класическите термогенни фет бърнъри. Вместо да разчита основно на стимуланти, той съдържа специализирани липотропни съставки - холин, инозитол, метионин, L-карнитин - които подпомагат транспорта на мазнините от тъканите към черния дроб, където се метаболизират и превръщат в енергия. Продуктът е идеален за жени, които искат да отслабват без нервност и сърцебиене, или за тези, които са чувствителни към кофеин и стимуланти. Fat Transporter работи особено добре за подпомагане на чернодробната функция и детоксикация, което е критично важно при всяка програма за отслабване. Подходящ е за дългосрочна употреба и може да се комбинира безопасно с други продукти. Перфектен избор за жени, които водят здравословен живот и искат да подкрепят естествените процеси на тялото си.")
+    
+        # Fat Transporter FAQ
+        update_faq(catalog, 'prod-5177', [
+            {
+                "question": "Какво означава 'липотропен'?",
+                "answer": "Липотропните съставки са вещества, които помагат на черния дроб да метаболизира и елиминира мазнините по-ефективно. Те 'транспортират' мазнините и предотвратяват натрупването им в черния дроб."
+            },
+            {
+                "question": "Подходящ ли е за хора, които не могат да пият кафе?",
+                "answer": "Да, това е един от най-добрите избори за чувствителни към кофеин хора. Fat Transporter не съдържа силни стимуланти и не предизвиква нервност или безсъние."
+            },
+            {
+                "question": "Ще видя ли бързи резултати?",
+                "answer": "Резултатите са по-плавни и постепенни в сравнение с термогенните продукти, но са устойчиви. Очаквайте видима промяна след 4-6 седмици. Оптимално е 12+ седмици."
+            },
+            {
+                "question": "Може ли да се комбинира с други продукти?",
+                "answer": "Да, работи отлично в комбинация с леки термогенни продукти като Thermo Master или дори с по-силни като Lida/MeiziMax за синергичен ефект."
+            }
+        ])
+    
+        # 6. Lipo 6 / L-Carnitine - Enhanced description
+        update_product_description(catalog, 'prod-31',
+            "Lipo 6 L-Carnitine е чист L-карнитин тартрат в течна форма (liqui-caps) от водещия производител Nutrex Research. L-карнитинът е естествена аминокиселина, която играе ключова роля в транспортирането на мастните киселини към митохондриите на клетките, където се изгарят за енергия. За разлика от стимулантните фет бърнъри, L-карнитинът работи меко и безопасно, като просто подпомага естествения процес на използване на мазнините като гориво. Продуктът е особено ефективен при физическа активност - помага за по-бързо изгаряне на мазнини по време на тренировки, увеличава издръжливостта и ускорява възстановяването. Lipo 6 L-Carnitine е идеален за жени, които тренират редовно (фитнес, йога, бягане, плуване) и искат да оптимизират използването на мазнините като енергиен източник. Подходящ е за дългосрочна употреба, няма странични ефекти и може безопасно да се комбинира с всички други продукти.")
+    
+        # Lipo 6 L-Carnitine FAQ
+        update_faq(catalog, 'prod-31', [
+            {
+                "question": "Каква е разликата между L-карнитин и термогенните продукти?",
+                "answer": "L-карнитинът не е стимулант и не повишава метаболизма директно. Той работи като 'транспортна система', която помага на тялото да използва мазнините по-ефективно, особено по време на тренировка."
+            },
+            {
+                "question": "Кога да приемам L-карнитин за най-добри резултати?",
+                "answer": "30-60 минути преди тренировка за максимален ефект. В дни без тренировка - сутрин и следобед. Работи най-добре при аеробни активности (кардио, ходене, бягане)."
+            },
+            {
+                "question": "Ще сваля ли килограми само от L-карнитин без тренировки?",
+                "answer": "Ефектът ще бъде минимален без физическа активност. L-карнитинът помага на тялото да изгаря мазнини ПО ВРЕМЕ на движение. За хора без тренировки са по-подходящи термогенните продукти."
+            },
+            {
+                "question": "Колко капсули има в опаковката?",
+                "answer": "120 liqui-caps (течни капсули), което е достатъчно за 60 дни при стандартен прием от 2 капсули дневно, или 30 дни при интензивен прием от 4 капсули."
+            }
+        ])
+    
+        # 7. Lipo 6 Black - Enhanced description
+        update_product_description(catalog, 'prod-742',
+            "Lipo 6 Black е флагманският екстремен термогенен продукт на Nutrex Research, създаден за максимални резултати при отслабване. Това е един от най-мощните и най-популярни фет бърнъри в света, използван от хиляди жени и мъже, които искат драматична трансформация. Формулата съдържа ултра-концентрирана смес от кофеин, теобромин, синефрин, йохимбин HCL, кайенски пипер и други активни съставки, които предизвикват интензивна термогенеза, мощно потискане на апетита и взривна енергия. Lipo 6 Black не само изгаря мазнини, но и подобрява фокуса и ментална яснота, което го прави идеален за жени с натоварен график, които искат да останат продуктивни докато отслабват. Продуктът е предназначен за опитни потребители с добра толерантност към стимуланти и изисква стриктно спазване на дозировката. Това е избор №1 за финалното оформяне и постигане на изваяна, спортна фигура.")
+    
+        # Lipo 6 Black FAQ
+        update_faq(catalog, 'prod-742', [
+            {
+                "question": "Каква е разликата между Lipo 6 Black и другите Lipo 6 продукти?",
+                "answer": "Lipo 6 Black е най-силната версия - 'Black' означава максимална концентрация. Има още Lipo 6 (стандартен), Lipo 6 Stim-Free (без стимуланти) и други варианти, но Black е топ по ефективност."
+            },
+            {
+                "question": "Безопасен ли е за жени?",
+                "answer": "Да, при спазване на препоръчителната доза. Много жени по света го използват успешно. Важно е да започнете с 1 капсула за оценка на толерантност и да НЕ превишавате 3 капсули дневно."
+            },
+            {
+                "question": "Какви резултати мога да очаквам?",
+                "answer": "При редовен прием, здравословно хранене и физическа активност, повечето потребители губят 3-6 кг за 8 седмици. Резултатите варират според стартовото тегло и начин на живот."
+            },
+            {
+                "question": "Може ли да предизвика странични ефекти?",
+                "answer": "При превишаване на дозата или при чувствителни към кофеин хора може да се появи силно сърцебиене, треперене, главоболие, безсъние. Ако сте нов потребител на термогеници, започнете с по-мек продукт първо."
+            }
+        ])
     
     print("\n🎉 All descriptions and FAQs improved successfully!")
 
@@ -8,243 +8,215 @@ Script to improve product data in page_content.json based on the requirements:
 5. Add comprehensive warnings and contraindications
 """
 
-import json
-import sys
+from catalog_store import CatalogStore
 
-def load_page_content():
-    """Load the page_content.json file"""
-    with open('/home/runner/work/otslabvai/otslabvai/backend/page_content.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_page_content(data):
-    """Save the page_content.json file"""
-    with open('/home/runner/work/otslabvai/otslabvai/backend/page_content.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def update_product_effects(product_id, new_effects):
+def update_product_effects(catalog, product_id, new_effects):
     """Update the effects for a specific product"""
-    data = load_page_content()
-    
-    for component in data['page_content']:
-        if component.get('type') == 'product_category' and 'products' in component:
-            for product in component['products']:
-                if product.get('product_id') == product_id:
-                    product['public_data']['effects'] = new_effects
-                    print(f"Updated effects for {product_id}")
-                    save_page_content(data)
-                    return True
+    if catalog.update_product_field(product_id, 'public_data.effects', new_effects):
+        print(f"Updated effects for {product_id}")
+        return True
     return False
 
-def update_product_field(product_id, field_path, value):
+def update_product_field(catalog, product_id, field_path, value):
     """Update a specific field in a product"""
-    data = load_page_content()
-    
-    for component in data['page_content']:
-        if component.get('type') == 'product_category' and 'products' in component:
-            for product in component['products']:
-                if product.get('product_id') == product_id:
-                    # Navigate to the field
-                    obj = product
-                    keys = field_path.split('.')
-                    for key in keys[:-1]:
-                        if key not in obj:
-                            obj[key] = {}
-                        obj = obj[key]
-                    obj[keys[-1]] = value
-                    print(f"Updated {field_path} for {product_id}")
-                    save_page_content(data)
-                    return True
+    if catalog.update_product_field(product_id, field_path, value):
+        print(f"Updated {field_path} for {product_id}")
+        return True
     return False
 
 def main():
     """Main function to apply all improvements"""
     
-    # Fix effects for all products to be measurable and marketing-friendly
-    
-    # 1. Lida Green - already has good structure but effects need to be more measurable
-    update_product_effects('prod-lida-green', [
-        {"label": "Изгаряне на мазнини", "value": 95},
-        {"label": "Потискане на глада", "value": 100},
-        {"label": "Ускоряване на метаболизма", "value": 90}
-    ])
-    
-    # 2. MeiziMax
-    update_product_effects('prod-meizimax', [
-        {"label": "Изгаряне на мазнини", "value": 85},
-        {"label": "Потискане на апетита", "value": 90},
-        {"label": "Детокс и пречистване", "value": 90}
-    ])
-    
-    # 3. Eveslim Birch Bark
-    update_product_effects('prod-eveslim-birch', [
-        {"label": "Намаляване на целулит", "value": 90},
-        {"label": "Изхвърляне на течности", "value": 95},
-        {"label": "Детокс и пречистване", "value": 85}
-    ])
-    
-    # 4. Eveslim Cayenne Pepper
-    update_product_effects('prod-eveslim-cayenne', [
-        {"label": "Изгаряне на калории", "value": 90},
-        {"label": "Ускоряване на метаболизма", "value": 95},
-        {"label": "Повишаване на енергията", "value": 85}
-    ])
-    
-    # 5. Thermo Master
-    update_product_effects('prod-ethicsport-thermo-master', [
-        {"label": "Ускоряване на метаболизма", "value": 75},
-        {"label": "Детокс и пречистване", "value": 70},
-        {"label": "Повишаване на енергията", "value": 80}
-    ])
-    
-    # 6. Fat No More
-    update_product_effects('prod-16905', [
-        {"label": "Изгаряне на мазнини", "value": 85},
-        {"label": "Ускоряване на метаболизма", "value": 90},
-        {"label": "Повишаване на енергията", "value": 85}
-    ])
-    
-    # 7. Thermo Caps
-    update_product_effects('prod-24527', [
-        {"label": "Изгаряне на мазнини", "value": 85},
-        {"label": "Ускоряване на метаболизма", "value": 90},
-        {"label": "Повишаване на енергията", "value": 80}
-    ])
-    
-    # 8. Essential Fat Burner
-    update_product_effects('prod-37086', [
-        {"label": "Изгаряне на мазнини", "value": 85},
-        {"label": "Ускоряване на метаболизма", "value": 85},
-        {"label": "Контрол на апетита", "value": 75}
-    ])
-    
-    # 9. Burn4All Extreme
-    update_product_effects('prod-24605', [
-        {"label": "Изгаряне на мазнини", "value": 90},
-        {"label": "Ускоряване на метаболизма", "value": 95},
-        {"label": "Повишаване на енергията", "value": 90}
-    ])
-    
-    # 10. Fat Transporter
-    update_product_effects('prod-5177', [
-        {"label": "Транспорт на мазнини", "value": 85},
-        {"label": "Подпомагане на метаболизма", "value": 80},
-        {"label": "Повишаване на енергията", "value": 75}
-    ])
-    
-    # 11. Lipo 6 / L-Carnitine
-    update_product_effects('prod-31', [
-        {"label": "Транспорт на мазнини", "value": 90},
-        {"label": "Повишаване на енергията", "value": 85},
-        {"label": "Издръжливост при тренировка", "value": 80}
-    ])
-    
-    # 12. Lipo 6 Black
-    update_product_effects('prod-742', [
-        {"label": "Изгаряне на мазнини", "value": 95},
-        {"label": "Ускоряване на метаболизма", "value": 95},
-        {"label": "Интензивна енергия", "value": 95}
-    ])
-    
-    print("\n✅ All effects updated successfully!")
-    
-    # Update packaging info for Thermo Master
-    update_product_field('prod-ethicsport-thermo-master', 'public_data.variants', [
-        {
-            "title": "Thermo Master - 90 капсули (30 дни)",
-            "description": "Стандартна опаковка - 3 капсули дневно",
-            "url": "#"
-        }
-    ])
-    
-    # Update safety warnings - comprehensive for all products
-    # Lida Green
-    update_product_field('prod-lida-green', 'system_data.safety_warnings', 
-        "ПРОТИВОПОКАЗАНИЯ: Не е подходящ за бременни и кърмачки, хора със сърдечно-съдови заболявания, високо кръвно налягане, чернодробни или бъбречни проблеми. Не се препоръчва на лица под 18 и над 60 години. ВНИМАНИЕ: Съдържа мощни стимуланти. Може да причини сърцебиене, безсъние, повишено кръвно налягане. НЕ употребявайте с кафе или други стимуланти. Приемайте САМО 1 капсула сутрин.")
-    
-    # MeiziMax
-    update_product_field('prod-meizimax', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови проблеми, високо кръвно налягане, диабет. Не е подходящ за лица под 18 години. ВНИМАНИЕ: Може да причини сухота в устата, повишена жажда. Пийте поне 2.5 литра вода дневно. Не превишавайте препоръчителната доза от 1 капсула дневно.")
-    
-    # Eveslim Birch Bark
-    update_product_field('prod-eveslim-birch', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, бъбречни заболявания, сърдечна недостатъчност, електролитен дисбаланс. ВНИМАНИЕ: Има силен диуретичен ефект. Пийте много вода (поне 2.5-3 литра дневно). При прекалено силен диуретичен ефект намалете дозата. Не комбинирайте с други диуретици без медицински съвет.")
-    
-    # Eveslim Cayenne Pepper
-    update_product_field('prod-eveslim-cayenne', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, стомашни язви, гастрит, хиперацидитет, хеморойди, високо кръвно налягане. ВНИМАНИЕ: Може да причини усещане за топлина, изпотяване, леко стомашно дразнене. Приемайте с храна. Започнете с по-ниска доза (1 капсула) и наблюдавайте толерантността си.")
-    
-    # Thermo Master
-    update_product_field('prod-ethicsport-thermo-master', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечни проблеми, чувствителност към кофеин. ВНИМАНИЕ: Съдържа натурални стимуланти (гуарана, зелено кафе). Може да повлияе на съня ако се приема късно следобед. Безопасен за дългосрочна употреба благодарение на натуралния състав.")
-    
-    # Fat No More
-    update_product_field('prod-16905', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, проблеми с щитовидната жлеза, диабет, психични разстройства. Не е подходящ за лица под 18 години. ВНИМАНИЕ: Съдържа силни стимуланти и термогенни съставки. Може да причини сърцебиене, треперене, безсъние, главоболие. Приемайте само 3 капсули дневно. НЕ превишавайте дозата.")
-    
-    # Thermo Caps
-    update_product_field('prod-24527', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, щитовидни проблеми. ВНИМАНИЕ: Съдържа термогенни съставки. Може да причини повишена телесна температура, изпотяване, ускорен пулс. Приемайте с храна, пийте много вода. Не превишавайте 4 капсули дневно.")
-    
-    # Essential Fat Burner
-    update_product_field('prod-37086', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечни проблеми, високо кръвно налягане, диабет. ВНИМАНИЕ: Може да взаимодейства с медикаменти за кръвното налягане или диабет. Консултирайте се с лекар ако приемате лекарства. Приемайте 2 капсули дневно с храна.")
-    
-    # Burn4All Extreme
-    update_product_field('prod-24605', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, щитовидни проблеми, тревожност. ВНИМАНИЕ: Екстремно силна формула. Съдържа високи дози стимуланти. Може да причини много силно сърцебиене, треперене, главоболие, безсъние. НЕ комбинирайте с кафе. Приемайте максимум 3 капсули дневно.")
-    
-    # Fat Transporter
-    update_product_field('prod-5177', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, чернодробни заболявания. ВНИМАНИЕ: Съдържа липотропни съставки (холин, инозитол, метионин). Подпомага транспорта на мазнини в черния дроб. Приемайте 1-2 капсули 2-3 пъти дневно преди хранене. Пийте достатъчно вода.")
-    
-    # Lipo 6 / L-Carnitine
-    update_product_field('prod-31', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Няма особени противопоказания за здрави възрастни. Не се препоръчва при бременност и кърмене. ВНИМАНИЕ: L-Carnitine е безопасна аминокиселина. Може да причини леко стомашно разстройство при високи дози. Приемайте с храна за по-добра поносимост. Подходящ за дългосрочна употреба.")
-    
-    # Lipo 6 Black
-    update_product_field('prod-742', 'system_data.safety_warnings',
-        "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, щитовидни проблеми, чернодробни или бъбречни заболявания, психични разстройства. Не е подходящ за лица под 18 години. ВНИМАНИЕ: Изключително силна формула с високи дози стимуланти. Може да причини интензивно сърцебиене, треперене, силна изпотяване, главоболие, безсъние, тревожност. Започнете с 1 капсула за оценка на толерантност. НИКОГА не превишавайте 3 капсули дневно. НЕ комбинирайте с кафе или други стимуланти.")
-    
-    print("\n✅ All safety warnings updated!")
-    
-    # Update protocol hints with detailed intake recommendations
-    update_product_field('prod-lida-green', 'system_data.protocol_hint',
-        "ПРИЕМ: 1 капсула сутрин (6:00-8:00) преди закуска с 1-2 чаши вода. НИКОГА не приемайте повече от 1 капсула дневно. ПРОДЪЛЖИТЕЛНОСТ: Минимум 1 месец за видими резултати, оптимално 2-3 месеца. Правете 1 седмица почивка на всеки 2 месеца. ВАЖНО: Пийте поне 2.5-3 литра вода дневно. Избягвайте кафе и други стимуланти.")
-    
-    update_product_field('prod-meizimax', 'system_data.protocol_hint',
-        "ПРИЕМ: 1 капсула сутрин (преди 9:00) на празен стомах с 2 чаши вода. ПРОДЪЛЖИТЕЛНОСТ: Курс от 1-3 месеца за оптимални резултати. Може да се прави почивка от 2 седмици между курсовете. ВАЖНО: Задължително пийте поне 2.5 литра вода дневно за детокс ефект.")
-    
-    update_product_field('prod-eveslim-birch', 'system_data.protocol_hint',
-        "ПРИЕМ: Започнете с 1 капсула сутрин преди закуска. След 3-5 дни, ако толерирате добре, може да увеличите до 2 капсули (1 сутрин + 1 обяд). МАКСИМАЛНА ДОЗА: 2 капсули дневно. ПРОДЪЛЖИТЕЛНОСТ: 4-6 седмици, след това 2 седмици почивка. ВАЖНО: Пийте 3-3.5 литра вода дневно заради диуретичния ефект.")
+    catalog = CatalogStore.load()
+    
+    # Every edit is staged in memory and flushed with one atomic write
+    with catalog.transaction():
+        # Fix effects for all products to be measurable and marketing-friendly
+    
+        # 1. Lida Green - already has good structure but effects need to be more measurable
+        update_product_effects(catalog, 'prod-lida-green', [
+            {"label": "Изгаряне на мазнини", "value": 95},
+            {"label": "Потискане на глада", "value": 100},
+            {"label": "Ускоряване на метаболизма", "value": 90}
+        ])
+    
+        # 2. MeiziMax
+        update_product_effects(catalog, 'prod-meizimax', [
+            {"label": "Изгаряне на мазнини", "value": 85},
+            {"label": "Потискане на апетита", "value": 90},
+            {"label": "Детокс и пречистване", "value": 90}
+        ])
+    
+        # 3. Eveslim Birch Bark
+        update_product_effects(catalog, 'prod-eveslim-birch', [
+            {"label": "Намаляване на целулит", "value": 90},
+            {"label": "Изхвърляне на течности", "value": 95},
+            {"label": "Детокс и пречистване", "value": 85}
+        ])
+    
+        # 4. Eveslim Cayenne Pepper
+        update_product_effects(catalog, 'prod-eveslim-cayenne', [
+            {"label": "Изгаряне на калории", "value": 90},
+            {"label": "Ускоряване на метаболизма", "value": 95},
+            {"label": "Повишаване на енергията", "value": 85}
+        ])
+    
+        # 5. Thermo Master
+        update_product_effects(catalog, 'prod-ethicsport-thermo-master', [
+            {"label": "Ускоряване на метаболизма", "value": 75},
+            {"label": "Детокс и пречистване", "value": 70},
+            {"label": "Повишаване на енергията", "value": 80}
+        ])
+    
+        # 6. Fat No More
+        update_product_effects(catalog, 'prod-16905', [
+            {"label": "Изгаряне на мазнини", "value": 85},
+            {"label": "Ускоряване на метаболизма", "value": 90},
+            {"label": "Повишаване на енергията", "value": 85}
+        ])
+    
+        # 7. Thermo Caps
+        update_product_effects(catalog, 'prod-24527', [
+            {"label": "Изгаряне на мазнини", "value": 85},
+            {"label": "Ускоряване на метаболизма", "value": 90},
+            {"label": "Повишаване на енергията", "value": 80}
+        ])
+    
+        # 8. Essential Fat Burner
+        update_product_effects(catalog, 'prod-37086', [
+            {"label": "Изгаряне на мазнини", "value": 85},
+            {"label": "Ускоряване на метаболизма", "value": 85},
+            {"label": "Контрол на апетита", "value": 75}
+        ])
+    
+        # 9. Burn4All Extreme
+        update_product_effects(catalog, 'prod-24605', [
+            {"label": "Изгаряне на мазнини", "value": 90},
+            {"label": "Ускоряване на метаболизма", "value": 95},
+            {"label": "Повишаване на енергията", "value": 90}
+        ])
+    
+        # 10. Fat Transporter
+        update_product_effects(catalog, 'prod-5177', [
+            {"label": "Транспорт на мазнини", "value": 85},
+            {"label": "Подпомагане на метаболизма", "value": 80},
+            {"label": "Повишаване на енергията", "value": 75}
+        ])
+    
+        # 11. Lipo 6 / L-Carnitine
+        update_product_effects(catalog, 'prod-31', [
+            {"label": "Транспорт на мазнини", "value": 90},
+            {"label": "Повишаване на енергията", "value": 85},
+            {"label": "Издръжливост при тренировка", "value": 80}
+        ])
+    
+        # 12. Lipo 6 Black
+        update_product_effects(catalog, 'prod-742', [
+            {"label": "Изгаряне на мазнини", "value": 95},
+            {"label": "Ускоряване на метаболизма", "value": 95},
+            {"label": "Интензивна енергия", "value": 95}
+        ])
+    
+        print("\n✅ All effects updated successfully!")
+    
+        # Update packaging info for Thermo Master
+        update_product_field(catalog, 'prod-ethicsport-thermo-master', 'public_data.variants', [
+            {
+                "title": "Thermo Master - 90 капсули (30 дни)",
+                "description": "Стандартна опаковка - 3 капсули дневно",
+                "url": "#"
+            }
+        ])
+    
+        # Update safety warnings - comprehensive for all products
+        # Lida Green
+        update_product_field(catalog, 'prod-lida-green', 'system_data.safety_warnings', 
+            "ПРОТИВОПОКАЗАНИЯ: Не е подходящ за бременни и кърмачки, хора със сърдечно-съдови заболявания, високо кръвно налягане, чернодробни или бъбречни проблеми. Не се препоръчва на лица под 18 и над 60 години. ВНИМАНИЕ: Съдържа мощни стимуланти. Може да причини сърцебиене, безсъние, повишено кръвно налягане. НЕ употребявайте с кафе или други стимуланти. Приемайте САМО 1 капсула сутрин.")
+    
+        # MeiziMax
+        update_product_field(catalog, 'prod-meizimax', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови проблеми, високо кръвно налягане, диабет. Не е подходящ за лица под 18 години. ВНИМАНИЕ: Може да причини сухота в устата, повишена жажда. Пийте поне 2.5 литра вода дневно. Не превишавайте препоръчителната доза от 1 капсула дневно.")
+    
+        # Eveslim Birch Bark
+        update_product_field(catalog, 'prod-eveslim-birch', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, бъбречни заболявания, сърдечна недостатъчност, електролитен дисбаланс. ВНИМАНИЕ: Има силен диуретичен ефект. Пийте много вода (поне 2.5-3 литра дневно). При прекалено силен диуретичен ефект намалете дозата. Не комбинирайте с други диуретици без медицински съвет.")
+    
+        # Eveslim Cayenne Pepper
+        update_product_field(catalog, 'prod-eveslim-cayenne', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, стомашни язви, гастрит, хиперацидитет, хеморойди, високо кръвно налягане. ВНИМАНИЕ: Може да причини усещане за топлина, изпотяване, леко стомашно дразнене. Приемайте с храна. Започнете с по-ниска доза (1 капсула) и наблюдавайте толерантността си.")
+    
+        # Thermo Master
+        update_product_field(catalog, 'prod-ethicsport-thermo-master', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечни проблеми, чувствителност към кофеин. ВНИМАНИЕ: Съдържа натурални стимуланти (гуарана, зелено кафе). Може да повлияе на съня ако се приема късно следобед. Безопасен за дългосрочна употреба благодарение на натуралния състав.")
+    
+        # Fat No More
+        update_product_field(catalog, 'prod-16905', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, проблеми с щитовидната жлеза, диабет, психични разстройства. Не е подходящ за лица под 18 години. ВНИМАНИЕ: Съдържа силни стимуланти и термогенни съставки. Може да причини сърцебиене, треперене, безсъние, главоболие. Приемайте само 3 капсули дневно. НЕ превишавайте дозата.")
+    
+        # Thermo Caps
+        update_product_field(catalog, 'prod-24527', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, щитовидни проблеми. ВНИМАНИЕ: Съдържа термогенни съставки. Може да причини повишена телесна температура, изпотяване, ускорен пулс. Приемайте с храна, пийте много вода. Не превишавайте 4 капсули дневно.")
+    
+        # Essential Fat Burner
+        update_product_field(catalog, 'prod-37086', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечни проблеми, високо кръвно налягане, диабет. ВНИМАНИЕ: Може да взаимодейства с медикаменти за кръвното налягане или диабет. Консултирайте се с лекар ако приемате лекарства. Приемайте 2 капсули дневно с храна.")
+    
+        # Burn4All Extreme
+        update_product_field(catalog, 'prod-24605', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, щитовидни проблеми, тревожност. ВНИМАНИЕ: Екстремно силна формула. Съдържа високи дози стимуланти. Може да причини много силно сърцебиене, треперене, главоболие, безсъние. НЕ комбинирайте с кафе. Приемайте максимум 3 капсули дневно.")
+    
+        # Fat Transporter
+        update_product_field(catalog, 'prod-5177', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, чернодробни заболявания. ВНИМАНИЕ: Съдържа липотропни съставки (холин, инозитол, метионин). Подпомага транспорта на мазнини в черния дроб. Приемайте 1-2 капсули 2-3 пъти дневно преди хранене. Пийте достатъчно вода.")
+    
+        # Lipo 6 / L-Carnitine
+        update_product_field(catalog, 'prod-31', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Няма особени противопоказания за здрави възрастни. Не се препоръчва при бременност и кърмене. ВНИМАНИЕ: L-Carnitine е безопасна аминокиселина. Може да причини леко стомашно разстройство при високи дози. Приемайте с храна за по-добра поносимост. Подходящ за дългосрочна употреба.")
+    
+        # Lipo 6 Black
+        update_product_field(catalog, 'prod-742', 'system_data.safety_warnings',
+            "ПРОТИВОПОКАЗАНИЯ: Не се препоръчва при бременност, кърмене, сърдечно-съдови заболявания, високо кръвно налягане, щитовидни проблеми, чернодробни или бъбречни заболявания, психични разстройства. Не е подходящ за лица под 18 години. ВНИМАНИЕ: Изключително силна формула с високи дози стимуланти. Може да причини интензивно сърцебиене, треперене, силна изпотяване, главоболие, безсъние, тревожност. Започнете с 1 капсула за оценка на толерантност. НИКОГА не превишавайте 3 капсули дневно. НЕ комбинирайте с кафе или други стимуланти.")
+    
+        print("\n✅ All safety warnings updated!")
+    
+        # Update protocol hints with detailed intake recommendations
+        update_product_field(catalog, 'prod-lida-green', 'system_data.protocol_hint',
+            "ПРИЕМ: 1 капсула сутрин (6:00-8:00) преди закуска с 1-2 чаши вода. НИКОГА не приемайте повече от 1 капсула дневно. ПРОДЪЛЖИТЕЛНОСТ: Минимум 1 месец за видими резултати, оптимално 2-3 месеца. Правете 1 седмица почивка на всеки 2 месеца. ВАЖНО: Пийте поне 2.5-3 литра вода дневно. Избягвайте кафе и други стимуланти.")
+    
+        update_product_field(catalog, 'prod-meizimax', 'system_data.protocol_hint',
+            "ПРИЕМ: 1 капсула сутрин (преди 9:00) на празен стомах с 2 чаши вода. ПРОДЪЛЖИТЕЛНОСТ: Курс от 1-3 месеца за оптимални резултати. Може да се прави почивка от 2 седмици между курсовете. ВАЖНО: Задължително пийте поне 2.5 литра вода дневно за детокс ефект.")
+    
+        update_product_field(catalog, 'prod-eveslim-birch', 'system_data.protocol_hint',
+            "ПРИЕМ: Започнете с 1 капсула сутрин преди закуска. След 3-5 дни, ако толерирате добре, може да увеличите до 2 капсули (1 сутрин + 1 обяд). МАКСИМАЛНА ДОЗА: 2 капсули дневно. ПРОДЪЛЖИТЕЛНОСТ: 4-6 седмици, след това 2 седмици почивка. ВАЖНО: Пийте 3-3.5 литра вода дневно заради диуретичния ефект.")
     
-    update_product_field('prod-eveslim-cayenne', 'system_data.protocol_hint',
-        "ПРИЕМ: Започнете с 1 капсула по обяд с храна. След 3-5 дни, ако няма дискомфорт, може да увеличите до 2 капсули дневно (1 на обяд + 1 вечер). МАКСИМАЛНА ДОЗА: 2 капсули дневно. ПРОДЪЛЖИТЕЛНОСТ: 1-2 месеца. ВАЖНО: Винаги приемайте С ХРАНА за избягване на стомашно дразнене.")
+        update_product_field(catalog, 'prod-eveslim-cayenne', 'system_data.protocol_hint',
+            "ПРИЕМ: Започнете с 1 капсула по обяд с храна. След 3-5 дни, ако няма дискомфорт, може да увеличите до 2 капсули дневно (1 на обяд + 1 вечер). МАКСИМАЛНА ДОЗА: 2 капсули дневно. ПРОДЪЛЖИТЕЛНОСТ: 1-2 месеца. ВАЖНО: Винаги приемайте С ХРАНА за избягване на стомашно дразнене.")
     
-    update_product_field('prod-ethicsport-thermo-master', 'system_data.protocol_hint',
-        "ПРИЕМ: 3 капсули дневно - 2 капсули сутрин с вода преди закуска + 1 капсула преди обяд (не по-късно от 14:00). ПРОДЪЛЖИТЕЛНОСТ: Може да се приема продължително (3-6 месеца) без почивка благодарение на натуралния състав. ВАЖНО: За чувствителни към кофеин хора - започнете с 2 капсули дневно.")
+        update_product_field(catalog, 'prod-ethicsport-thermo-master', 'system_data.protocol_hint',
+            "ПРИЕМ: 3 капсули дневно - 2 капсули сутрин с вода преди закуска + 1 капсула преди обяд (не по-късно от 14:00). ПРОДЪЛЖИТЕЛНОСТ: Може да се приема продължително (3-6 месеца) без почивка благодарение на натуралния състав. ВАЖНО: За чувствителни към кофеин хора - започнете с 2 капсули дневно.")
     
-    update_product_field('prod-16905', 'system_data.protocol_hint',
-        "ПРИЕМ: 3 капсули дневно - 1 капсула 30 минути преди закуска, обяд и вечеря с вода. ВАЖНО: Приемайте последната доза не по-късно от 17:00 часа за избягване на безсъние. ПРОДЪЛЖИТЕЛНОСТ: Курс от 8-12 седмици, след това 4 седмици почивка. Пийте поне 2 литра вода дневно.")
+        update_product_field(catalog, 'prod-16905', 'system_data.protocol_hint',
+            "ПРИЕМ: 3 капсули дневно - 1 капсула 30 минути преди закуска, обяд и вечеря с вода. ВАЖНО: Приемайте последната доза не по-късно от 17:00 часа за избягване на безсъние. ПРОДЪЛЖИТЕЛНОСТ: Курс от 8-12 седмици, след това 4 седмици почивка. Пийте поне 2 литра вода дневно.")
     
-    update_product_field('prod-24527', 'system_data.protocol_hint',
-        "ПРИЕМ: 4 капсули дневно - 2 капсули сутрин преди закуска + 2 капсули следобед (преди 15:00) с вода и храна. МАКСИМАЛНА ДОЗА: 4 капсули. ПРОДЪЛЖИТЕЛНОСТ: 8-10 седмици, след това 2-4 седмици почивка. ВАЖНО: Не приемайте късно следобед заради стимуланти.")
+        update_product_field(catalog, 'prod-24527', 'system_data.protocol_hint',
+            "ПРИЕМ: 4 капсули дневно - 2 капсули сутрин преди закуска + 2 капсули следобед (преди 15:00) с вода и храна. МАКСИМАЛНА ДОЗА: 4 капсули. ПРОДЪЛЖИТЕЛНОСТ: 8-10 седмици, след това 2-4 седмици почивка. ВАЖНО: Не приемайте късно следобед заради стимуланти.")
     
-    update_product_field('prod-37086', 'system_data.protocol_hint',
-        "ПРИЕМ: 2 капсули дневно - 1 капсула преди закуска + 1 капсула преди обяд с вода и храна. ПРОДЪЛЖИТЕЛНОСТ: 12 седмици за оптимални резултати, може да се прави почивка от 2 седмици. ВАЖНО: За по-добра поносимост винаги приемайте с храна.")
+        update_product_field(catalog, 'prod-37086', 'system_data.protocol_hint',
+            "ПРИЕМ: 2 капсули дневно - 1 капсула преди закуска + 1 капсула преди обяд с вода и храна. ПРОДЪЛЖИТЕЛНОСТ: 12 седмици за оптимални резултати, може да се прави почивка от 2 седмици. ВАЖНО: За по-добра поносимост винаги приемайте с храна.")
     
-    update_product_field('prod-24605', 'system_data.protocol_hint',
-        "ПРИЕМ: Започнете с 1 капсула сутрин за оценка на толерантност. След 3 дни може да увеличите до 3 капсули дневно (1 сутрин + 1 преди обяд + 1 следобед преди 15:00). МАКСИМАЛНА ДОЗА: 3 капсули. ПРОДЪЛЖИТЕЛНОСТ: Не повече от 8 седмици, след това задължителна почивка от 4 седмици. ВАЖНО: Не комбинирайте с кафе!")
+        update_product_field(catalog, 'prod-24605', 'system_data.protocol_hint',
+            "ПРИЕМ: Започнете с 1 капсула сутрин за оценка на толерантност. След 3 дни може да увеличите до 3 капсули дневно (1 сутрин + 1 преди обяд + 1 следобед преди 15:00). МАКСИМАЛНА ДОЗА: 3 капсули. ПРОДЪЛЖИТЕЛНОСТ: Не повече от 8 седмици, след това задължителна почивка от 4 седмици. ВАЖНО: Не комбинирайте с кафе!")
     
-    update_product_field('prod-5177', 'system_data.protocol_hint',
-        "ПРИЕМ: 2 капсули 3 пъти дневно (общо 6 капсули) - 30 минути преди закуска, обяд и вечеря на празен стомах с вода. ПРОДЪЛЖИТЕЛНОСТ: Минимум 12 седмици за оптимални резултати. Може да се използва дългосрочно. ВАЖНО: За най-добър ефект приемайте на празен стомах.")
+        update_product_field(catalog, 'prod-5177', 'system_data.protocol_hint',
+            "ПРИЕМ: 2 капсули 3 пъти дневно (общо 6 капсули) - 30 минути преди закуска, обяд и вечеря на празен стомах с вода. ПРОДЪЛЖИТЕЛНОСТ: Минимум 12 седмици за оптимални резултати. Може да се използва дългосрочно. ВАЖНО: За най-добър ефект приемайте на празен стомах.")
     
-    update_product_field('prod-31', 'system_data.protocol_hint',
-        "ПРИЕМ: 2 капсули 2 пъти дневно (общо 4 капсули) - сутрин преди закуска и 30-60 минути преди тренировка с вода. В дни без тренировка приемайте преди обяд. ПРОДЪЛЖИТЕЛНОСТ: Може да се приема дългосрочно (6+ месеца) без почивка. ВАЖНО: Ефектът е най-добър при физическа активност.")
+        update_product_field(catalog, 'prod-31', 'system_data.protocol_hint',
+            "ПРИЕМ: 2 капсули 2 пъти дневно (общо 4 капсули) - сутрин преди закуска и 30-60 минути преди тренировка с вода. В дни без тренировка приемайте преди обяд. ПРОДЪЛЖИТЕЛНОСТ: Може да се приема дългосрочно (6+ месеца) без почивка. ВАЖНО: Ефектът е най-добър при физическа активност.")
     
-    update_product_field('prod-742', 'system_data.protocol_hint',
-        "ПРИЕМ: Започнете с 1 капсула сутрин за оценка на толерантност първите 2-3 дни. След това може да увеличите до 2-3 капсули дневно (1 сутрин на празен стомах + 1-2 преди обяд, не по-късно от 14:00). МАКСИМАЛНА ДОЗА: 3 капсули дневно. ПРОДЪЛЖИТЕЛНОСТ: Не повече от 8 седмици, задължителна почивка 4-6 седмици. ВАЖНО: Това е екстремно силна формула - НЕ ПРЕВИШАВАЙТЕ дозата!")
+        update_product_field(catalog, 'prod-742', 'system_data.protocol_hint',
+            "ПРИЕМ: Започнете с 1 капсула сутрин за оценка на толерантност първите 2-3 дни. След това може да увеличите до 2-3 капсули дневно (1 сутрин на празен стомах + 1-2 преди обяд, не по-късно от 14:00). МАКСИМАЛНА ДОЗА: 3 капсули дневно. ПРОДЪЛЖИТЕЛНОСТ: Не повече от 8 седмици, задължителна почивка 4-6 седмици. ВАЖНО: Това е екстремно силна формула - НЕ ПРЕВИШАВАЙТЕ дозата!")
     
-    print("\n✅ All protocol hints updated!")
+        print("\n✅ All protocol hints updated!")
     
     print("\n🎉 All product improvements completed successfully!")
 
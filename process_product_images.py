@@ -3,88 +3,87 @@
 Process product images from zip files and update product data.
 
 This script:
-1. Extracts images from zip files in the products/ folder
+1. Streams images from the zip files in the products/ folder straight into
+   the content-addressed store images/store/ (archives are processed in
+   parallel, identical images are stored once)
 2. Maps images to existing products based on product IDs
-3. Identifies new products from Excel file
-4. Validates products have required fields
-5. Ensures each product has main image and label image
+3. Skips archives whose size/mtime/SHA-256 match the import manifest and
+   merges the results into backend/image_mapping.json incrementally
+4. Identifies new products from Excel file
+5. Validates products have required fields
+6. Ensures each product has main image and label image
 """
 
+import argparse
 import json
 import os
 import zipfile
-import shutil
-import pandas as pd
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from catalog_store import write_json_atomic
 from fix_products_json import load_products_json
+from image_classifier import extract_features, is_label
+from image_derivatives import update_mapping_derivatives
+from image_similarity import build_index, fingerprint_images, pick_best_copies
+from image_store import ImageStore
+from product_rules import missing_product_fields
+from supplier_feed import EXCEL_FILE, FeedIndex, file_sha256, load_feed
 
 # Configuration
 PRODUCTS_DIR = Path('products')
 IMAGES_DIR = Path('images/products')
 BACKEND_DIR = Path('backend')
-EXCEL_FILE = PRODUCTS_DIR / 'b2b-109838-products-22-01-2026.xlsx'
 PRODUCTS_JSON = BACKEND_DIR / 'products.json'
+MAPPING_FILE = BACKEND_DIR / 'image_mapping.json'
+MANIFEST_FILE = BACKEND_DIR / 'image_import_manifest.json'
 
-# Required fields for non-bestseller products
-REQUIRED_FIELDS = {
-    'description': 'Общо описание',
-    'price': 'Цена',
-    'manufacturer': 'Производител',
-    'capsules_count': 'Брой капсули/таблетки/грамаж',
-    'doses_count': 'Брой дози',
-    'ingredients': 'Състав',
-    'protocol_hint': 'Препоръки за прием',
-    'image_url': 'Основна снимка',
-    'label_image': 'Снимка на етикета'
-}
+# Archives imported concurrently (override with --workers)
+IMPORT_WORKERS = os.cpu_count() or 4
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
 
 def extract_product_id_from_filename(filename):
     """Extract product ID from zip filename like f1_b2b_16905.zip"""
     match = re.search(r'f1_b2b_(\d+)\.zip', filename)
     return match.group(1) if match else None
 
-def extract_zip_files():
-    """Extract all zip files in products directory"""
-    extracted_data = {}
-    
-    for zip_file in PRODUCTS_DIR.glob('*.zip'):
+def find_archives():
+    """List (product_id, zip_file) pairs for the supplier archives in products/"""
+    archives = []
+    for zip_file in sorted(PRODUCTS_DIR.glob('*.zip')):
         product_id = extract_product_id_from_filename(zip_file.name)
         if not product_id:
             print(f"Skipping {zip_file.name} - cannot extract product ID")
             continue
-        
-        print(f"Extracting {zip_file.name} (Product ID: {product_id})...")
-        
-        # Create temporary extraction directory
-        extract_dir = PRODUCTS_DIR / f'extracted_{product_id}'
-        extract_dir.mkdir(exist_ok=True)
-        
-        with zipfile.ZipFile(zip_file, 'r') as zf:
-            zf.extractall(extract_dir)
-            
-        # List extracted files
-        files = list(extract_dir.glob('*'))
-        extracted_data[product_id] = {
-            'zip_file': zip_file,
-            'extract_dir': extract_dir,
-            'files': files
-        }
-        
-        print(f"  Extracted {len(files)} files")
-        for f in files:
-            print(f"    - {f.name}")
-    
-    return extracted_data
+        archives.append((product_id, zip_file))
+    return archives
 
-def load_excel_products():
-    """Load products from Excel file"""
-    df = pd.read_excel(EXCEL_FILE)
+def stream_archive_images(zip_file, product_dir, store):
+    """
+    Copy the image members of zip_file into the content-addressed store.
     
-    # Extract product ID from Image URL
-    df['product_id_from_url'] = df['Image'].astype(str).str.extract(r'/p(\d+)/')
+    Each member is decompressed from the archive straight into the store,
+    so nothing is written to an intermediate extraction folder, and an
+    image identical to one already stored is not written again. Members
+    are indexed under product_dir/<file name>; flattening to the file name
+    also keeps '../' entries from escaping product_dir.
     
-    return df
+    Returns a list of (file_name, canonical_path) tuples.
+    """
+    images = []
+    with zipfile.ZipFile(zip_file, 'r') as zf:
+        for member in zf.infolist():
+            if member.is_dir():
+                continue
+            name = Path(member.filename).name
+            if not name or Path(name).suffix.lower() not in IMAGE_EXTENSIONS:
+                continue
+            
+            with zf.open(member) as src:
+                canonical = store.put_stream(src, product_dir / name)
+            
+            images.append((name, canonical))
+    return images
 
 def find_product_by_id(products_data, product_id):
     """
@@ -97,8 +96,13 @@ def find_product_by_id(products_data, product_id):
     # TODO: Implement ID-based product matching if needed
     return None
 
-def identify_image_type(filename):
-    """Identify if an image is a main image or label based on filename"""
+def identify_image_type(filename, features=None):
+    """
+    Identify if an image is a main image or label.
+    
+    The filename is checked first; otherwise the content features from
+    image_classifier.image_features() decide when they are available.
+    """
     filename_lower = filename.lower()
     
     # Common label indicators
@@ -106,46 +110,138 @@ def identify_image_type(filename):
     if any(indicator in filename_lower for indicator in label_indicators):
         return 'label'
     
+    # Mostly white, colourless, text-dense images are labels
+    if features and is_label(features):
+        return 'label'
+    
     # Main product image (usually larger files or product names)
     return 'main'
 
-def organize_product_images(extracted_data, excel_df):
-    """Organize extracted images into proper structure"""
-    image_mapping = {}
+def product_dir_for(product_name):
+    """images/products/<sanitized product name>"""
+    safe_name = re.sub(r'[^\w\s-]', '', product_name).strip().replace(' ', '_')
+    return IMAGES_DIR / safe_name
+
+def load_json_file(path, default):
+    """Read a JSON file, or return default if it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def _outputs_exist(entry):
+    """True if every file an earlier import produced is still on disk"""
+    return all(Path(rel_path).exists() for rel_path in entry.get('files', []))
+
+def plan_imports(manifest, force=False):
+    """
+    Split the archives into those that need importing and those that don't.
+    
+    An archive is unchanged when its manifest entry has the same size and
+    mtime, or - after a checkout/copy touched it - the same SHA-256, and
+    the files it produced last time still exist.
+    
+    Returns (changed, unchanged): changed is a list of dicts with
+    product_id, zip_file, size, mtime_ns and sha256; unchanged is a list of
+    (product_id, manifest key) pairs.
+    """
+    changed = []
+    unchanged = []
+    for product_id, zip_file in find_archives():
+        key = zip_file.as_posix()
+        entry = manifest.get(key)
+        stat = zip_file.stat()
+        
+        if entry and not force and _outputs_exist(entry):
+            if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                unchanged.append((product_id, key))
+                continue
+            sha256 = file_sha256(zip_file)
+            if entry.get('sha256') == sha256:
+                entry['size'] = stat.st_size
+                entry['mtime_ns'] = stat.st_mtime_ns
+                unchanged.append((product_id, key))
+                continue
+        else:
+            sha256 = file_sha256(zip_file)
+        
+        changed.append({
+            'product_id': product_id,
+            'zip_file': zip_file,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256
+        })
+    return changed, unchanged
+
+def organize_product_images(excel_df, archives, workers=IMPORT_WORKERS, store=None):
+    """
+    Import the given archives into the image store, in parallel.
+    
+    Args:
+        excel_df: Supplier feed DataFrame
+        archives: (product_id, zip_file) pairs, e.g. from find_archives()
+        workers: Archives imported concurrently
+        store: ImageStore to write to (its index is saved afterwards)
+    
+    Returns:
+        {product_id: mapping entry} in archive order; image paths are the
+        canonical store paths
+    """
+    feed_index = FeedIndex(excel_df)
+    store = store or ImageStore()
     
-    for product_id, data in extracted_data.items():
+    jobs = []
+    for product_id, zip_file in archives:
         # Find product info from Excel
-        product_info = excel_df[excel_df['product_id_from_url'] == product_id]
+        rows = feed_index.rows_for_supplier_id(product_id)
         
-        if product_info.empty:
+        if not rows:
             print(f"Warning: No product found in Excel for ID {product_id}")
             product_name = f"product_{product_id}"
         else:
-            product_name = product_info.iloc[0]['Product']
-            print(f"\nProcessing: {product_name} (ID: {product_id})")
+            product_name = excel_df['Product'].iat[rows[0]]
+            print(f"Queued: {product_name} (ID: {product_id})")
         
-        # Create product-specific directory
-        # Sanitize product name for directory
-        safe_name = re.sub(r'[^\w\s-]', '', product_name).strip().replace(' ', '_')
-        product_dir = IMAGES_DIR / safe_name
-        product_dir.mkdir(parents=True, exist_ok=True)
+        product_dir = product_dir_for(product_name)
+        jobs.append((product_id, zip_file, product_name, product_dir))
+    
+    # zlib decompression and file writes release the GIL, so threads
+    # keep several archives busy at once
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(stream_archive_images, zip_file, product_dir, store): (product_id, zip_file)
+            for product_id, zip_file, _, product_dir in jobs
+        }
+        for future in as_completed(futures):
+            product_id, zip_file = futures[future]
+            results[product_id] = future.result()
+            print(f"  Imported {len(results[product_id])} images from {zip_file.name}")
+    store.save()
+    
+    # Classify and fingerprint all imported images in one batch
+    imported = [canonical for images in results.values() for _, canonical in images]
+    features = extract_features(imported, workers)
+    fingerprints = fingerprint_images(imported, workers)
+    similarity_index = build_index(fingerprints)
+    
+    # Build the mapping in archive order so the output is stable
+    image_mapping = {}
+    for product_id, _, product_name, product_dir in jobs:
+        names = {}
+        for name, canonical in results[product_id]:
+            names.setdefault(canonical, name)
         
-        images = {'main': [], 'label': []}
+        # One image per visual: keep the best-resolution copy
+        kept, dropped = pick_best_copies(list(names), fingerprints, similarity_index)
+        if dropped:
+            print(f"  {product_id}: dropped {len(dropped)} near-duplicate images")
         
-        # Categorize and copy images
-        for img_file in data['files']:
-            if img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp']:
-                img_type = identify_image_type(img_file.name)
-                
-                # Copy to organized location
-                dest_file = product_dir / img_file.name
-                shutil.copy2(img_file, dest_file)
-                
-                # Store relative path
-                rel_path = dest_file.relative_to(Path('.'))
-                images[img_type].append(str(rel_path))
-                
-                print(f"  Copied {img_type} image: {img_file.name}")
+        images = {'main': [], 'label': []}
+        for canonical in kept:
+            images[identify_image_type(names[canonical], features.get(canonical))].append(canonical)
         
         image_mapping[product_id] = {
             'product_name': product_name,
@@ -155,6 +251,77 @@ def organize_product_images(extracted_data, excel_df):
     
     return image_mapping
 
+def import_archives(excel_df, workers=IMPORT_WORKERS, force=False):
+    """
+    Incrementally import the supplier archives.
+    
+    Only new or changed archives are streamed; the results are merged into
+    the existing image_mapping.json and the manifest records each archive's
+    size, mtime, SHA-256 and the files it produced. Mapping entries of
+    skipped archives are always taken from the manifest, so an entry left
+    stale by an interrupted run is repaired on the next one. Manifest and
+    mapping entries of archives no longer in products/ are dropped.
+    
+    Nothing is written here; save with save_import_state() once the
+    mapping is complete.
+    
+    Returns (image_mapping, manifest, imported_count, skipped_count,
+    changed) where changed tells whether the mapping or manifest need saving.
+    """
+    manifest = load_json_file(MANIFEST_FILE, {})
+    image_mapping = load_json_file(MAPPING_FILE, {})
+    manifest_before = json.dumps(manifest, sort_keys=True)
+    mapping_before = json.dumps(image_mapping, sort_keys=True)
+    
+    changed, unchanged = plan_imports(manifest, force)
+    
+    for product_id, key in unchanged:
+        if 'mapping' in manifest[key]:
+            image_mapping[product_id] = manifest[key]['mapping']
+    
+    # Archives deleted from products/ take their entries with them, as a
+    # full rebuild of the mapping would
+    present = {key for _, key in unchanged} | {item['zip_file'].as_posix() for item in changed}
+    live_ids = {product_id for product_id, _ in unchanged} | {item['product_id'] for item in changed}
+    removed = [key for key in manifest if key not in present]
+    for key in removed:
+        del manifest[key]
+    for product_id in [product_id for product_id in image_mapping if product_id not in live_ids]:
+        del image_mapping[product_id]
+    if removed:
+        print(f"   Removed {len(removed)} archives no longer in {PRODUCTS_DIR}/")
+    
+    if changed:
+        archives = [(item['product_id'], item['zip_file']) for item in changed]
+        imported = organize_product_images(excel_df, archives, workers)
+        for item in changed:
+            entry = imported[item['product_id']]
+            image_mapping[item['product_id']] = entry
+            manifest[item['zip_file'].as_posix()] = {
+                'product_id': item['product_id'],
+                'size': item['size'],
+                'mtime_ns': item['mtime_ns'],
+                'sha256': item['sha256'],
+                'files': entry['images']['main'] + entry['images']['label'],
+                'mapping': entry
+            }
+    
+    dirty = (
+        json.dumps(manifest, sort_keys=True) != manifest_before
+        or json.dumps(image_mapping, sort_keys=True) != mapping_before
+    )
+    return image_mapping, manifest, len(changed), len(unchanged), dirty
+
+def save_import_state(image_mapping, manifest):
+    """
+    Write image_mapping.json, then the manifest.
+    
+    The manifest marks archives as imported, so it goes last: a crash in
+    between leaves archives that are simply imported again.
+    """
+    write_json_atomic(MAPPING_FILE, image_mapping)
+    write_json_atomic(MANIFEST_FILE, manifest)
+
 def validate_product_fields(product, category_id):
     """Validate that a product has all required fields"""
     is_bestseller = 'weight-loss-products' in category_id or 'bestseller' in category_id.lower()
@@ -162,43 +329,8 @@ def validate_product_fields(product, category_id):
     if is_bestseller:
         return []  # Skip validation for bestsellers
     
-    missing_fields = []
-    public_data = product.get('public_data', {})
-    system_data = product.get('system_data', {})
-    
-    # Check description
-    if not public_data.get('description'):
-        missing_fields.append('description')
-    
-    # Check price
-    if not public_data.get('price'):
-        missing_fields.append('price')
-    
-    # Check manufacturer (might be in system_data or derived from product name)
-    # This would need to be added if not present
-    
-    # Check capsules/weight info (in variants or description)
-    # This is often in the product name or variants
-    
-    # Check doses
-    # Often in system_data or can be calculated
-    
-    # Check ingredients
-    if not public_data.get('ingredients'):
-        missing_fields.append('ingredients')
-    
-    # Check intake recommendations
-    if not system_data.get('protocol_hint'):
-        missing_fields.append('protocol_hint')
-    
-    # Check images
-    if not public_data.get('image_url'):
-        missing_fields.append('image_url')
-    
-    # Check for label image (might be in a separate field or in additional images)
-    # This would need to be added
-    
-    return missing_fields
+    # Same rules as validate_products.validate_product (product_rules.RULES)
+    return missing_product_fields(product)
 
 def generate_validation_report(products_data):
     """Generate a report of products with missing fields"""
@@ -227,7 +359,7 @@ def generate_validation_report(products_data):
     
     return report
 
-def main():
+def main(workers=IMPORT_WORKERS, force=False):
     """Main processing function"""
     print("="*80)
     print("PRODUCT IMAGE PROCESSING SCRIPT")
@@ -246,22 +378,24 @@ def main():
     
     # Step 2: Load Excel data
     print("\n2. Loading Excel product data...")
-    excel_df = load_excel_products()
+    excel_df = load_feed(EXCEL_FILE)
     print(f"   Found {len(excel_df)} product rows in Excel")
     unique_products = excel_df['product_id_from_url'].nunique()
     print(f"   Unique product IDs: {unique_products}")
     
-    # Step 3: Extract zip files
-    print("\n3. Extracting product images from zip files...")
-    extracted_data = extract_zip_files()
-    print(f"   Extracted {len(extracted_data)} zip files")
+    # Step 3: Import new or changed zip files
+    print(f"\n3. Importing product images from zip files ({workers} workers)...")
+    image_mapping, manifest, imported, skipped, mapping_changed = import_archives(excel_df, workers, force)
+    print(f"   Imported {imported} zip files, skipped {skipped} unchanged")
     
-    # Step 4: Organize images
-    print("\n4. Organizing product images...")
-    image_mapping = organize_product_images(extracted_data, excel_df)
+    # Step 3b: Responsive WebP/AVIF derivatives for main and label images
+    print("\n   Generating image derivatives...")
+    generated = update_mapping_derivatives(image_mapping, workers)
+    print(f"   Generated derivatives for {generated} images")
+    mapping_changed = mapping_changed or generated > 0
     
-    # Step 5: Validate products
-    print("\n5. Validating product data...")
+    # Step 4: Validate products
+    print("\n4. Validating product data...")
     validation_report = generate_validation_report(products_data)
     
     if validation_report:
@@ -273,18 +407,19 @@ def main():
     else:
         print("   All products have required fields!")
     
-    # Step 6: Save image mapping
-    print("\n6. Saving image mapping...")
-    mapping_file = BACKEND_DIR / 'image_mapping.json'
-    with open(mapping_file, 'w', encoding='utf-8') as f:
-        json.dump(image_mapping, f, ensure_ascii=False, indent=2)
-    print(f"   Saved to {mapping_file}")
+    # Step 5: Save image mapping
+    print("\n5. Saving image mapping...")
+    if mapping_changed:
+        save_import_state(image_mapping, manifest)
+        print(f"   Saved to {MAPPING_FILE}")
+    else:
+        print(f"   {MAPPING_FILE} is up to date")
     
-    # Step 7: Generate summary report
+    # Step 6: Generate summary report
     print("\n" + "="*80)
     print("SUMMARY")
     print("="*80)
-    print(f"Processed {len(extracted_data)} product image archives")
+    print(f"Processed {imported} product image archives ({skipped} unchanged)")
     print(f"Organized images for {len(image_mapping)} products")
     print(f"Found {len(validation_report)} products needing updates")
     print("\nNext steps:")
@@ -292,13 +427,12 @@ def main():
     print("2. Update products.json with image paths")
     print("3. Add missing product information")
     print("4. Ensure all products have main and label images")
-    
-    # Cleanup extraction directories
-    print("\n7. Cleaning up temporary files...")
-    for data in extracted_data.values():
-        if data['extract_dir'].exists():
-            shutil.rmtree(data['extract_dir'])
-    print("   Cleanup complete")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Import supplier product images')
+    parser.add_argument('--workers', type=int, default=IMPORT_WORKERS,
+                        help=f'archives imported in parallel (default: {IMPORT_WORKERS})')
+    parser.add_argument('--force', action='store_true',
+                        help='re-import every archive, ignoring the manifest')
+    args = parser.parse_args()
+    main(args.workers, args.force)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Declarative required-field rules for catalog products.
+
+RULES is the single description of what a complete product needs; it is
+shared by validate_products.validate_product (which reports the messages)
+and process_product_images.validate_product_fields (which reports the
+field names). compile_validator() turns the rules into the source of one
+specialized Python function - every field is read once, every check is an
+inline expression - and compiles it at import time, so validating a
+100k-product catalog costs no per-rule interpretation.
+"""
+
+import hashlib
+import json
+
+MIN_DESCRIPTION_LENGTH = 50
+MIN_PROTOCOL_LENGTH = 10
+
+# Each rule:
+#   field:   dotted path inside the product
+#   check:   'required' (truthy), 'positive' (truthy and > 0) or
+#            'min_length' (truthy and at least `length` long)
+#   when:    optional condition on another field: {'field', 'contains_any',
+#            'contains_none'} with substring tests
+#   message: issue text reported by validate_product
+RULES = [
+    {'field': 'public_data.description', 'check': 'min_length', 'length': MIN_DESCRIPTION_LENGTH,
+     'message': f'Липсва подробно общо описание (минимум {MIN_DESCRIPTION_LENGTH} символа)'},
+    {'field': 'public_data.price', 'check': 'positive',
+     'message': 'Липсва цена или цената е невалидна'},
+    {'field': 'system_data.manufacturer', 'check': 'required',
+     'message': 'Липсва производител'},
+    {'field': 'system_data.capsules_count', 'check': 'required',
+     'when': {'field': 'system_data.application_type', 'contains_any': ['Capsule', 'Tablet']},
+     'message': 'Липсва брой капсули/таблетки'},
+    {'field': 'system_data.weight_grams', 'check': 'required',
+     'when': {'field': 'system_data.application_type', 'contains_any': ['Powder'],
+              'contains_none': ['Capsule', 'Tablet']},
+     'message': 'Липсва грамаж на прах'},
+    {'field': 'system_data.doses_count', 'check': 'required',
+     'message': 'Липсва брой дози'},
+    {'field': 'public_data.ingredients', 'check': 'required',
+     'message': 'Липсва състав (ingredients)'},
+    {'field': 'system_data.protocol_hint', 'check': 'min_length', 'length': MIN_PROTOCOL_LENGTH,
+     'message': 'Липсват препоръки за прием'},
+    {'field': 'public_data.image_url', 'check': 'required',
+     'message': 'Липсва основна снимка'},
+    {'field': 'public_data.label_image', 'check': 'required',
+     'message': 'Липсва снимка на етикета'},
+]
+
+# Changes whenever RULES change (used to invalidate cached validation results)
+RULES_FINGERPRINT = hashlib.blake2b(
+    json.dumps(RULES, ensure_ascii=False, sort_keys=True).encode('utf-8'), digest_size=8
+).hexdigest()
+
+_CHECKS = {
+    'required': 'not {v}',
+    'positive': 'not {v} or {v} <= 0',
+    'min_length': 'not {v} or len({v}) < {length}',
+}
+
+
+def _generate_source(rules, report):
+    """Source of `def validate(product)` returning the failed rules' `report` values"""
+    containers = {'': 'product'}
+    fields = {}
+    lines = []
+
+    def container(path):
+        if path not in containers:
+            parent, _, key = path.rpartition('.')
+            name = f'c{len(containers)}'
+            lines.append(f'    {name} = {container(parent)}.get({key!r}, {{}})')
+            containers[path] = name
+        return containers[path]
+
+    def field(path, default):
+        # The same field read as a rule subject (default None) and as a
+        # `when` subject (default '') needs two variables
+        if (path, default) not in fields:
+            parent, _, key = path.rpartition('.')
+            name = f'f{len(fields)}'
+            lines.append(f'    {name} = {container(parent)}.get({key!r}, {default!r})')
+            fields[path, default] = name
+        return fields[path, default]
+
+    body = []
+    for rule in rules:
+        if rule['check'] not in _CHECKS:
+            raise ValueError(f"Unknown check {rule['check']!r} for {rule['field']}")
+        test = _CHECKS[rule['check']].format(v=field(rule['field'], None), length=rule.get('length'))
+        indent = '    '
+        when = rule.get('when')
+        if when:
+            subject = field(when['field'], '')
+            terms = [f'{token!r} in {subject}' for token in when.get('contains_none', [])]
+            condition = ' or '.join(f'{token!r} in {subject}' for token in when.get('contains_any', []))
+            if terms:
+                condition = f"({condition or 'True'}) and not ({' or '.join(terms)})"
+            body.append(f'    if {condition or "True"}:')
+            indent += '    '
+        body.append(f'{indent}if {test}:')
+        body.append(f'{indent}    issues.append({rule[report]!r})')
+
+    return '\n'.join(['def validate(product):', '    issues = []'] + lines + body + ['    return issues', ''])
+
+
+def compile_validator(rules=RULES, report='message'):
+    """
+    Compile rules into a function product -> list of issues.
+
+    report selects what is listed for each failed rule: 'message' for the
+    issue text or 'field' for the last part of its field path.
+    """
+    if report == 'field':
+        rules = [dict(rule, field_name=rule['field'].rpartition('.')[2]) for rule in rules]
+        report = 'field_name'
+    source = _generate_source(rules, report)
+    namespace = {}
+    exec(compile(source, f'<product_rules:{report}>', 'exec'), namespace)
+    validate = namespace['validate']
+    validate.source = source
+    return validate
+
+
+# Compiled once at import
+check_product = compile_validator()
+missing_product_fields = compile_validator(report='field')
+
+
+if __name__ == '__main__':
+    print(check_product.source)
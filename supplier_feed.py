@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Supplier feed ingestion shared by the product and image scripts.
+
+The B2B export (products/b2b-*.xlsx) is parsed with openpyxl once; the
+resulting DataFrame, with the `product_id_from_url` column already derived
+from the Image URL, is cached as Parquet next to the workbook. Re-runs on
+an unchanged feed read the Parquet file instead of re-parsing the .xlsx.
+
+The cache is keyed on the workbook's size, mtime and SHA-256: a matching
+size+mtime is trusted as is, otherwise the hash decides whether the
+workbook really changed. Parquet needs pyarrow (or fastparquet); without
+it the feed is simply parsed on every call.
+"""
+
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+PRODUCTS_DIR = Path('products')
+EXCEL_FILE = PRODUCTS_DIR / 'b2b-109838-products-22-01-2026.xlsx'
+
+# Bump when the derived columns change so old caches are rebuilt
+FEED_CACHE_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(feed_path):
+    """Hidden Parquet + metadata files next to the workbook"""
+    prefix = '.' + feed_path.name + '.feed-cache'
+    return (
+        feed_path.with_name(prefix + '.parquet'),
+        feed_path.with_name(prefix + '.json')
+    )
+
+
+def parse_feed(feed_path):
+    """Parse the workbook and derive product_id_from_url from the Image URL"""
+    df = pd.read_excel(feed_path)
+    df['product_id_from_url'] = df['Image'].astype(str).str.extract(r'/p(\d+)/')
+    return df
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_feed(feed_path=EXCEL_FILE, use_cache=True):
+    """
+    Return the supplier feed as a DataFrame with `product_id_from_url`.
+
+    Args:
+        feed_path: Path to the .xlsx export
+        use_cache: Set to False to force a fresh parse (the cache is still
+                   rewritten afterwards)
+    """
+    feed_path = Path(feed_path)
+    cache_path, meta_path = _cache_paths(feed_path)
+    stat = feed_path.stat()
+    meta = _read_meta(meta_path) if use_cache else None
+
+    sha256 = None
+    if meta and meta.get('version') == FEED_CACHE_VERSION and cache_path.exists():
+        unchanged = meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns
+        if not unchanged:
+            # Touched (checkout, copy) but maybe not modified
+            sha256 = file_sha256(feed_path)
+            unchanged = meta.get('sha256') == sha256
+            if unchanged:
+                meta['size'] = stat.st_size
+                meta['mtime_ns'] = stat.st_mtime_ns
+                _write_meta(meta_path, meta)
+        if unchanged:
+            try:
+                return pd.read_parquet(cache_path)
+            except (ImportError, OSError, ValueError):
+                pass
+
+    df = parse_feed(feed_path)
+
+    try:
+        df.to_parquet(cache_path, index=False)
+    except (ImportError, OSError, ValueError, TypeError) as e:
+        print(f"   Feed cache disabled ({e.__class__.__name__}: {e})")
+        return df
+
+    _write_meta(meta_path, {
+        'version': FEED_CACHE_VERSION,
+        'source': feed_path.name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256 or file_sha256(feed_path),
+        'rows': len(df)
+    })
+    return df
+
+
+def clear_feed_cache(feed_path=EXCEL_FILE):
+    """Delete the cached Parquet/metadata for a workbook"""
+    for path in _cache_paths(Path(feed_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_TOKEN_RE = re.compile(r'\w+')
+_IMAGE_SUPPLIER_ID_RE = re.compile(r'/p(\d+)/')
+
+# Result of FeedIndex.resolve():
+#   row        - the matched feed row (pandas Series) or None
+#   status     - 'id', 'name', 'ambiguous' or 'not_found'
+#   candidates - distinct product names that matched (for reporting)
+FeedMatch = namedtuple('FeedMatch', ['row', 'status', 'candidates'])
+
+
+def normalize_name(text):
+    """Lowercase and reduce a product name to space-separated word tokens"""
+    if not isinstance(text, str):
+        return ''
+    return ' '.join(_TOKEN_RE.findall(text.lower()))
+
+
+def supplier_id_for_product(product):
+    """
+    Numeric supplier ID of a catalog product, or None.
+
+    Taken from an explicit system_data.supplier_id, else from a supplier
+    image URL (.../products/v3/p41108/...) when the product still points at
+    one. Catalog IDs are not used: 'prod-40337' is not feed product 40337.
+    """
+    supplier_id = product.get('system_data', {}).get('supplier_id')
+    if supplier_id not in (None, ''):
+        return str(supplier_id)
+    image_url = product.get('public_data', {}).get('image_url') or ''
+    match = _IMAGE_SUPPLIER_ID_RE.search(image_url)
+    return match.group(1) if match else None
+
+
+class FeedIndex:
+    """
+    Lookup index over the supplier feed.
+
+    Rows are indexed by the numeric supplier ID from the Image URL and by
+    the word tokens of the Product column (inverted index plus a sorted
+    vocabulary for prefix lookups), so resolving a catalog product costs a
+    few dict/bisect lookups instead of a regex scan over every row.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._names = [normalize_name(name) for name in df['Product']]
+        self._by_supplier_id = {}
+        self._postings = {}
+
+        for position, supplier_id in enumerate(df['product_id_from_url']):
+            if isinstance(supplier_id, str) and supplier_id:
+                self._by_supplier_id.setdefault(supplier_id, []).append(position)
+
+        for position, name in enumerate(self._names):
+            for token in set(name.split()):
+                self._postings.setdefault(token, []).append(position)
+
+        self._vocabulary = sorted(self._postings)
+
+    def _prefix_rows(self, prefix):
+        """Rows containing a token that starts with prefix"""
+        rows = set()
+        start = bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            rows.update(self._postings[token])
+        return rows
+
+    def search(self, text):
+        """
+        Row positions whose name contains text as a run of words.
+
+        All words of text must appear whole and in sequence; the last one
+        may be cut short (catalog code matches on truncated names).
+        """
+        tokens = normalize_name(text).split()
+        if not tokens:
+            return []
+
+        *whole, last = tokens
+        candidates = None
+        for token in sorted(whole, key=lambda t: len(self._postings.get(t, ()))):
+            rows = self._postings.get(token)
+            if not rows:
+                return []
+            candidates = set(rows) if candidates is None else candidates & set(rows)
+            if not candidates:
+                return []
+
+        last_rows = self._prefix_rows(last)
+        candidates = last_rows if candidates is None else candidates & last_rows
+
+        needle = ' ' + ' '.join(tokens)
+        return sorted(
+            position for position in candidates
+            if needle in ' ' + self._names[position]
+        )
+
+    def rows_for_supplier_id(self, supplier_id):
+        """Row positions for a numeric supplier ID (str or int)"""
+        return list(self._by_supplier_id.get(str(supplier_id), ()))
+
+    def _product_key(self, position):
+        supplier_id = self.df['product_id_from_url'].iat[position]
+        if isinstance(supplier_id, str) and supplier_id:
+            return supplier_id
+        return self._names[position]
+
+    def resolve(self, name=None, supplier_id=None, pick_first=False):
+        """
+        Find the feed row for a catalog product.
+
+        The supplier ID wins when it is present in the feed. Otherwise the
+        name is searched; rows belonging to one product (flavours/options of
+        the same supplier ID) count as a single match, and matches spanning
+        several products are reported as 'ambiguous' with no row chosen,
+        unless exactly one of them has the searched name verbatim. With
+        pick_first, an ambiguous match still returns a row: an exact name
+        match if there is one, else the first matching row of the feed.
+        """
+        if supplier_id is not None:
+            rows = self.rows_for_supplier_id(supplier_id)
+            if rows:
+                return FeedMatch(self.df.iloc[rows[0]], 'id', [self.df['Product'].iat[rows[0]]])
+
+        if not name:
+            return FeedMatch(None, 'not_found', [])
+
+        groups = {}
+        for position in self.search(name):
+            groups.setdefault(self._product_key(position), []).append(position)
+
+        if not groups:
+            return FeedMatch(None, 'not_found', [])
+
+        candidates = [self.df['Product'].iat[rows[0]] for rows in groups.values()]
+        if len(groups) == 1:
+            first = next(iter(groups.values()))[0]
+            return FeedMatch(self.df.iloc[first], 'name', candidates)
+
+        wanted = normalize_name(name)
+        exact = [rows for rows in groups.values() if self._names[rows[0]] == wanted]
+        if len(exact) == 1:
+            return FeedMatch(self.df.iloc[exact[0][0]], 'name', candidates)
+
+        if pick_first:
+            first = min(rows[0] for rows in (exact or groups.values()))
+            return FeedMatch(self.df.iloc[first], 'ambiguous', candidates)
+        return FeedMatch(None, 'ambiguous', candidates)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    feed = Path(sys.argv[1]) if len(sys.argv) > 1 else EXCEL_FILE
+    started = time.perf_counter()
+    df = load_feed(feed)
+    elapsed = time.perf_counter() - started
+    print(f"Loaded {len(df)} rows from {feed} in {elapsed:.3f}s")
+    print(f"Unique product IDs: {df['product_id_from_url'].nunique()}")
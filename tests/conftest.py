@@ -0,0 +1,31 @@
+"""
+Shared fixtures for the Python catalog tooling tests.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PAGE_CONTENT = REPO_ROOT / 'backend' / 'page_content.json'
+
+
+@pytest.fixture(scope='session')
+def _page_content():
+    with open(PAGE_CONTENT, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def page_content(_page_content):
+    """A fresh copy of the committed backend/page_content.json"""
+    return copy.deepcopy(_page_content)
+
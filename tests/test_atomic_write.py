@@ -0,0 +1,57 @@
+"""atomic_write / write_json_atomic"""
+
+import json
+import os
+
+import pytest
+
+from catalog_store import atomic_write, write_json_atomic
+
+
+def temp_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+def test_replaces_target(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old', encoding='utf-8')
+    with atomic_write(path) as f:
+        f.write('new')
+    assert path.read_text(encoding='utf-8') == 'new'
+    assert temp_files(tmp_path) == []
+
+
+def test_target_intact_when_block_raises(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old', encoding='utf-8')
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write('partial')
+            raise RuntimeError('interrupted')
+    assert path.read_text(encoding='utf-8') == 'old'
+    assert temp_files(tmp_path) == []
+
+
+def test_no_file_created_when_block_raises(tmp_path):
+    path = tmp_path / 'new.json'
+    with pytest.raises(KeyboardInterrupt):
+        with atomic_write(path) as f:
+            f.write('partial')
+            raise KeyboardInterrupt
+    assert os.listdir(tmp_path) == []
+
+
+def test_keeps_file_mode(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old', encoding='utf-8')
+    os.chmod(path, 0o600)
+    with atomic_write(path) as f:
+        f.write('new')
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_write_json_atomic_is_canonical(tmp_path):
+    path = tmp_path / 'data.json'
+    data = {'name': 'Фет бърнър', 'items': [1, {'a': None}], 'empty': {}}
+    write_json_atomic(path, data)
+    assert path.read_text(encoding='utf-8') == json.dumps(data, ensure_ascii=False, indent=2) + '\n'
@@ -0,0 +1,90 @@
+"""Merkle diff, KV sync planning and reassembly"""
+
+import copy
+
+import catalog_diff
+from catalog_diff import LAYOUT_KEY, MANIFEST_KEY, LocalKV
+
+
+class RecordingKV(LocalKV):
+    """LocalKV that records the order of writes and deletes"""
+
+    def __init__(self):
+        super().__init__()
+        self.log = []
+
+    def put(self, key, value):
+        super().put(key, value)
+        self.log.append(('put', key))
+
+    def delete(self, key):
+        super().delete(key)
+        self.log.append(('delete', key))
+
+
+def categories(data):
+    return [c for c in data['page_content'] if catalog_diff._is_category(c) and c['products']]
+
+
+def test_identical_catalogs_have_no_diff(page_content):
+    assert catalog_diff.diff_catalogs(page_content, page_content) == []
+
+
+def test_diff_finds_product_changes(page_content):
+    old = copy.deepcopy(page_content)
+    category = categories(page_content)[0]
+    key = catalog_diff.component_key(category, page_content['page_content'].index(category))
+    changed, removed = category['products'][0], category['products'].pop()
+    changed['public_data']['price'] = 999.5
+    added = dict(changed, product_id='new-product')
+    category['products'].append(added)
+
+    summary = catalog_diff.summarize(catalog_diff.diff_catalogs(old, page_content))
+    assert summary['added_products'] == [(key, 'new-product')]
+    assert summary['removed_products'] == [(key, str(removed['product_id']))]
+    assert summary['changed_products'][(key, str(changed['product_id']))] == [('change', 'public_data.price')]
+
+
+def test_sync_round_trip(page_content):
+    kv = LocalKV()
+    plan = catalog_diff.sync(kv, page_content)
+    assert plan['put'] and not plan['delete']
+    assert catalog_diff.assemble(kv) == page_content
+
+    assert catalog_diff.sync(kv, page_content)['put'] == {}
+
+    category = categories(page_content)[0]
+    category['products'][0]['public_data']['price'] = 12.34
+    removed = category['products'].pop()
+    plan = catalog_diff.sync(kv, page_content)
+    assert len(plan['delete']) == 1 and str(removed['product_id']) in plan['delete'][0]
+    # The edited product and its category (product list changed); the layout is untouched
+    assert len(plan['put']) == 2 and LAYOUT_KEY not in plan['put']
+    assert catalog_diff.assemble(kv) == page_content
+    assert set(kv.values) == set(plan['manifest']) | {MANIFEST_KEY}
+
+
+def test_layout_and_manifest_written_after_values(page_content):
+    kv = RecordingKV()
+    catalog_diff.sync(kv, page_content)
+    page_content['page_content'].reverse()
+    removed = page_content['page_content'].pop()
+    kv.log.clear()
+
+    catalog_diff.sync(kv, page_content)
+    ops = kv.log
+    layout, manifest = ops.index(('put', LAYOUT_KEY)), ops.index(('put', MANIFEST_KEY))
+    deletes = [i for i, (op, _) in enumerate(ops) if op == 'delete']
+    puts = [i for i, (op, key) in enumerate(ops) if op == 'put' and key not in (LAYOUT_KEY, MANIFEST_KEY)]
+    assert deletes and all(i < layout for i in puts)
+    assert layout < manifest < min(deletes)
+    assert catalog_diff.assemble(kv) == page_content
+    assert removed not in catalog_diff.assemble(kv)['page_content']
+
+
+def test_non_dict_components_round_trip(page_content):
+    page_content['page_content'].insert(1, 'divider')
+    page_content['page_content'].append(['raw', 1])
+    kv = LocalKV()
+    catalog_diff.sync(kv, page_content)
+    assert catalog_diff.assemble(kv) == page_content
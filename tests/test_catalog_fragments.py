@@ -0,0 +1,70 @@
+"""Incremental saves stay byte-identical to a full canonical encode"""
+
+import shutil
+
+import pytest
+
+from catalog_fragments import FragmentCache, parse_with_spans, write_document
+from catalog_serializer import dumps
+from catalog_store import CatalogStore, read_snapshot
+from conftest import PAGE_CONTENT
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    path = tmp_path / 'page_content.json'
+    shutil.copy(PAGE_CONTENT, path)
+    return path
+
+
+def saved_matches_full_encode(store, path):
+    return path.read_text(encoding='utf-8') == dumps(store.data)
+
+
+def product_ids(store):
+    return [product['product_id'] for _, product in store.iter_products()]
+
+
+def test_parse_and_rewrite_unchanged(catalog_file):
+    text = catalog_file.read_text(encoding='utf-8')
+    data, spans = parse_with_spans(text)
+    cache = FragmentCache()
+    cache.attach(data, spans, str(catalog_file), None, text)
+    cache.prepare()
+    chunks = []
+    write_document(data, chunks.append, cache)
+    assert ''.join(chunks) == dumps(data)
+
+
+@pytest.mark.parametrize('use_snapshot', [False, True])
+def test_single_product_edit(catalog_file, use_snapshot):
+    if use_snapshot:
+        CatalogStore.load(str(catalog_file))
+        assert read_snapshot(str(catalog_file)) is not None
+    store = CatalogStore.load(str(catalog_file), use_snapshot=use_snapshot)
+    product_id = product_ids(store)[len(store) // 2]
+
+    store.update_product_field(product_id, 'public_data.effects', [{'label': 'Енергия', 'value': 90}])
+    assert store.save()
+    assert saved_matches_full_encode(store, catalog_file)
+
+    # A second save after the spans moved
+    store.update_product_field(product_ids(store)[0], 'public_data.name', 'Ново име с "кавички"')
+    assert store.save()
+    assert saved_matches_full_encode(store, catalog_file)
+
+
+def test_direct_edits_with_mark_dirty(catalog_file):
+    CatalogStore.load(str(catalog_file))
+    store = CatalogStore.load(str(catalog_file))
+    product_id = product_ids(store)[-1]
+    store.get_product(product_id)['public_data']['price'] = 1e-07
+    store.mark_dirty(product_id)
+    assert store.save()
+    assert saved_matches_full_encode(store, catalog_file)
+
+    store.data['settings']['site_name'] = 'Друго име'
+    store.category_of(product_id)['products'].pop(0)
+    store.mark_dirty()
+    assert store.save()
+    assert saved_matches_full_encode(store, catalog_file)
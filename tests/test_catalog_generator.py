@@ -0,0 +1,35 @@
+"""Synthetic catalog generator"""
+
+import io
+import json
+
+from catalog_generator import CatalogProfile, generate_page_content, write_page_content
+from catalog_serializer import dumps
+from conftest import PAGE_CONTENT
+
+
+def write(n_products, seed, template=PAGE_CONTENT, profile=None):
+    out = io.StringIO()
+    write_page_content(out, n_products, seed, template, profile)
+    return out.getvalue()
+
+
+def test_deterministic_and_canonical():
+    text = write(300, 11)
+    assert text == write(300, 11)
+    assert text != write(300, 12)
+    doc = json.loads(text)
+    assert text == dumps(doc)
+    assert doc == generate_page_content(300, 11, PAGE_CONTENT)
+    products = [p for c in doc['page_content'] if c.get('type') == 'product_category' for p in c.get('products', [])]
+    assert len(products) == 300
+    assert len({p['product_id'] for p in products}) == 300
+
+
+def test_empty_template(tmp_path):
+    template = tmp_path / 'empty.json'
+    template.write_text('{}', encoding='utf-8')
+    profile = CatalogProfile.from_page_content(PAGE_CONTENT)
+    text = write(10, 1, template, profile)
+    assert text == '{}\n'
+    assert json.loads(text) == {}
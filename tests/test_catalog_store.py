@@ -0,0 +1,109 @@
+"""CatalogStore indexes, edits and transactions"""
+
+import json
+import shutil
+
+import pytest
+
+from catalog_store import CatalogStore
+from conftest import PAGE_CONTENT
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    path = tmp_path / 'page_content.json'
+    shutil.copy(PAGE_CONTENT, path)
+    return path
+
+
+@pytest.fixture
+def store(catalog_file):
+    return CatalogStore.load(str(catalog_file), use_snapshot=False)
+
+
+def first_product_id(store):
+    return next(iter(store.iter_products()))[1]['product_id']
+
+
+def test_indexes_match_linear_scan(store, page_content):
+    products = [
+        (component, product)
+        for component in page_content['page_content'] if component.get('type') == 'product_category'
+        for product in component.get('products', [])
+    ]
+    assert len(store) == len({product['product_id'] for _, product in products})
+    for component, product in products:
+        assert store.get_product(product['product_id']) == product
+        assert store.category_of(product['product_id'])['id'] == component.get('id', '')
+    assert store.get_product('no-such-product') is None
+
+
+def test_manufacturer_index_follows_edits(store):
+    product_id = first_product_id(store)
+    assert store.update_product_field(product_id, 'system_data.manufacturer', 'Test Labs')
+    assert [p['product_id'] for p in store.products_by_manufacturer('Test Labs')] == [product_id]
+    assert not store.update_product_field('no-such-product', 'public_data.price', 1)
+
+
+def test_save_writes_edits(store, catalog_file):
+    product_id = first_product_id(store)
+    store.update_product_field(product_id, 'public_data.price', 12.5)
+    assert store.save()
+    assert not store.save()
+    assert CatalogStore.load(str(catalog_file), use_snapshot=False).get_product(product_id)['public_data']['price'] == 12.5
+
+
+def test_transaction_commits_once(store, catalog_file):
+    product_id = first_product_id(store)
+    with store.transaction():
+        store.update_product_field(product_id, 'public_data.price', 7)
+        store.update_product_field(product_id, 'system_data.manufacturer', 'Test Labs')
+    saved = CatalogStore.load(str(catalog_file), use_snapshot=False).get_product(product_id)
+    assert saved['public_data']['price'] == 7
+    assert saved['system_data']['manufacturer'] == 'Test Labs'
+    assert not store.dirty
+
+
+def test_failed_transaction_rolls_back_and_writes_nothing(store, catalog_file):
+    before = catalog_file.read_bytes()
+    product_id = first_product_id(store)
+    original = json.loads(json.dumps(store.get_product(product_id)))
+    manufacturer = original['system_data'].get('manufacturer') or ''
+
+    with pytest.raises(ValueError):
+        with store.transaction():
+            store.update_product_field(product_id, 'public_data.price', 7)
+            store.update_product_field(product_id, 'system_data.manufacturer', 'Test Labs')
+            raise ValueError('abort')
+
+    assert catalog_file.read_bytes() == before
+    assert store.get_product(product_id) == original
+    assert store.products_by_manufacturer('Test Labs') == []
+    assert product_id in [p['product_id'] for p in store.products_by_manufacturer(manufacturer)]
+    assert not store.dirty
+    assert not store.save()
+
+
+def test_failed_transaction_without_rollback_keeps_edits_unsaved(store, catalog_file):
+    before = catalog_file.read_bytes()
+    product_id = first_product_id(store)
+    with pytest.raises(ValueError):
+        with store.transaction(rollback=False):
+            store.update_product_field(product_id, 'public_data.price', 7)
+            raise ValueError('abort')
+    assert catalog_file.read_bytes() == before
+    assert store.get_product(product_id)['public_data']['price'] == 7
+    assert store.dirty
+
+
+def test_nested_transaction_is_rejected(store, catalog_file):
+    before = catalog_file.read_bytes()
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.update_product_field(first_product_id(store), 'public_data.price', 7)
+            with store.transaction():
+                pass
+    assert catalog_file.read_bytes() == before
+    # The store accepts a new transaction afterwards
+    with store.transaction():
+        pass
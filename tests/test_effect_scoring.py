@@ -0,0 +1,58 @@
+"""Batch effect scoring matches the per-product path"""
+
+import random
+
+import pytest
+
+from catalog_generator import CatalogProfile, generate_product
+from conftest import PAGE_CONTENT
+from effect_scoring import score_catalog
+from unified_effects import analyze_product_effects, get_top_3_effects
+from validate_products import iter_catalog_products
+
+SEED = 6
+
+
+@pytest.fixture(scope='module')
+def products():
+    profile = CatalogProfile.from_page_content(PAGE_CONTENT)
+    return [generate_product(profile, index, SEED) for index in range(3000)]
+
+
+def expected(products, flags):
+    return [get_top_3_effects(analyze_product_effects(p, flag)) for p, flag in zip(products, flags)]
+
+
+def top_n(product, is_bestseller, n):
+    """get_top_3_effects' ordering (stable sort by value) for any n"""
+    effects = analyze_product_effects(product, is_bestseller).items()
+    ranked = sorted(effects, key=lambda item: item[1]['value'], reverse=True)
+    return [{'label': label, 'value': data['value']} for label, data in ranked[:n]]
+
+
+def test_generated_catalog_parity(products):
+    rng = random.Random(SEED)
+    flags = [rng.random() < 0.3 for _ in products]
+    assert score_catalog(products, flags) == expected(products, flags)
+
+
+def test_committed_catalog_parity(page_content):
+    rows = list(iter_catalog_products(page_content))
+    products, flags = [product for *_, product in rows], [flag for _, flag, _ in rows]
+    assert score_catalog(products, flags) == expected(products, flags)
+
+
+def test_ties_duplicates_and_unmapped_labels():
+    products = [
+        {'public_data': {'name': 'Lipo Burn', 'effects': [
+            {'label': 'Непознат ефект', 'value': 80},
+            {'label': 'Горене на мазнини', 'value': 60},
+            {'label': 'Горене на мазнини (бързо)', 'value': 85},
+            {'label': 'Друг непознат', 'value': 80},
+        ]}, 'system_data': {'goals': ['energy']}},
+        {'public_data': {'name': 'Празен', 'effects': []}, 'system_data': {}},
+        {'public_data': {'name': 'Число', 'effects': [{'label': 'Енергия', 'value': 72.5}]}},
+    ]
+    for flags in ([False] * 3, [True] * 3):
+        assert score_catalog(products, flags) == expected(products, flags)
+        assert score_catalog(products, flags, n=5) == [top_n(p, f, 5) for p, f in zip(products, flags)]
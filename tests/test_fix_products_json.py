@@ -0,0 +1,68 @@
+"""Streaming products.json loader"""
+
+import json
+
+import pytest
+
+from fix_products_json import iter_products_json, load_products_json, save_products_json
+
+
+@pytest.fixture(scope='module')
+def products_doc():
+    from conftest import REPO_ROOT
+
+    with open(REPO_ROOT / 'backend' / 'products.json.DEPRECATED', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def indent(text, spaces):
+    return '\n'.join(' ' * spaces + line if line else line for line in text.split('\n'))
+
+
+def write_legacy(path, categories, footer):
+    """The layout the old line-joining scripts wrote: bare categories, '  ],', then the footer"""
+    body = ',\n'.join(indent(json.dumps(category, ensure_ascii=False, indent=2), 4) for category in categories)
+    footer_text = indent(json.dumps(footer, ensure_ascii=False, indent=2), 2).lstrip()
+    path.write_text(f'{body}\n  ],\n  "footer": {footer_text}\n}}\n', encoding='utf-8')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64 * 1024])
+def test_current_layout(products_doc, tmp_path, chunk_size):
+    path = tmp_path / 'products.json'
+    save_products_json(path, products_doc['product_categories'], products_doc.get('footer'))
+
+    products = [value for kind, _, value in iter_products_json(path, chunk_size) if kind == 'product']
+    assert products == [p for c in products_doc['product_categories'] for p in c.get('products', [])]
+    assert load_products_json(path) == {
+        'categories': products_doc['product_categories'], 'footer': products_doc.get('footer')
+    }
+
+
+@pytest.mark.parametrize('chunk_size', [1, 13, 64 * 1024])
+def test_legacy_layout(products_doc, tmp_path, chunk_size):
+    categories = products_doc['product_categories']
+    footer = {'copyright_text': '© 2026', 'links': [{'text': 'Контакти', 'url': '#'}]}
+    path = tmp_path / 'products.json'
+    write_legacy(path, categories, footer)
+
+    events = list(iter_products_json(path, chunk_size))
+    assert [value for kind, _, value in events if kind == 'footer'] == [footer]
+    assert [i for kind, i, _ in events if kind == 'category'] == list(range(len(categories)))
+    assert load_products_json(path) == {'categories': categories, 'footer': footer}
+
+
+def test_long_values_and_numbers_across_chunks(tmp_path):
+    doc = {'product_categories': [{'products': [{'description': 'ж' * 5000, 'price': 123456.789}]}]}
+    path = tmp_path / 'products.json'
+    path.write_text(json.dumps(doc, ensure_ascii=False), encoding='utf-8')
+    for chunk_size in (1, 2, 3, 4096):
+        assert list(iter_products_json(path, chunk_size))[0] == ('product', 0, doc['product_categories'][0]['products'][0])
+
+
+def test_invalid_file_loads_empty(tmp_path):
+    path = tmp_path / 'products.json'
+    path.write_text('{"product_categories": [{"products": [', encoding='utf-8')
+    assert load_products_json(path) == {'categories': [], 'footer': None}
+    path.write_text('{"other": 1}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_products_json(path))
@@ -0,0 +1,62 @@
+"""Responsive derivatives for the image mapping"""
+
+import os
+
+import pytest
+
+import image_derivatives
+
+PIL = pytest.importorskip('PIL.Image')
+
+pytestmark = pytest.mark.skipif(not image_derivatives.available_formats(), reason='no WebP encoder')
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('images/store')
+    os.makedirs('images/products/a')
+    os.makedirs('images/products/b')
+    PIL.linear_gradient('L').resize((700, 500)).save('images/store/0123456789abcdef.png')
+    PIL.new('RGB', (400, 300), 'red').save('images/products/a/1.jpg')
+    PIL.new('RGB', (300, 400), 'blue').save('images/products/b/1.jpg')
+    with open('images/products/b/broken.png', 'wb') as f:
+        f.write(b'not an image')
+    return tmp_path
+
+
+def entry(*main):
+    return {'images': {'main': list(main), 'label': []}}
+
+
+def test_shared_blob_is_generated_once_for_every_entry(sources):
+    blob = 'images/store/0123456789abcdef.png'
+    mapping = {str(i): entry(blob) for i in range(8)}
+    assert image_derivatives.update_mapping_derivatives(mapping, workers=4) == 1
+    records = [mapping[key]['derivatives'][blob] for key in mapping]
+    assert all(record == records[0] for record in records)
+    assert [v['width'] for v in records[0]['variants'] if v['format'] == 'webp'] == [320, 640]
+    assert not [name for name in os.listdir('images/derived') if name.endswith('.tmp')]
+    assert image_derivatives.update_mapping_derivatives(mapping, workers=4) == 0
+
+
+def test_same_file_names_do_not_collide(sources):
+    mapping = {'a': entry('images/products/a/1.jpg'), 'b': entry('images/products/b/1.jpg')}
+    assert image_derivatives.update_mapping_derivatives(mapping, workers=2) == 2
+    a = mapping['a']['derivatives']['images/products/a/1.jpg']['variants']
+    b = mapping['b']['derivatives']['images/products/b/1.jpg']['variants']
+    assert not {v['path'] for v in a} & {v['path'] for v in b}
+    assert (a[0]['width'], a[0]['height']) == (320, 240)
+    assert (b[0]['width'], b[0]['height']) == (300, 400)
+
+
+def test_broken_and_missing_sources_are_skipped(sources, capsys):
+    mapping = {
+        'b': entry('images/products/b/broken.png', 'images/products/b/gone.png', 'images/products/b/1.jpg'),
+        'c': entry('images/products/b/gone.png'),
+    }
+    assert image_derivatives.update_mapping_derivatives(mapping, workers=2) == 1
+    assert list(mapping['b']['derivatives']) == ['images/products/b/1.jpg']
+    out = capsys.readouterr().out
+    assert 'skipped images/products/b/broken.png' in out
+    assert out.count('missing source image images/products/b/gone.png') == 1
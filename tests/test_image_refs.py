@@ -0,0 +1,63 @@
+"""Image reference resolution, scanning and the header cache"""
+
+import json
+
+import pytest
+
+import image_refs
+
+PIL = pytest.importorskip('PIL.Image')
+
+REPO_URL = image_refs.LOCAL_URL_PREFIXES[0]
+
+
+@pytest.mark.parametrize('ref, path', [
+    ('images/a.jpg', 'images/a.jpg'),
+    ('./images/a.jpg', 'images/a.jpg'),
+    ('/images/a.jpg', 'images/a.jpg'),
+    ('../shared/a.jpg', '../shared/a.jpg'),
+    ('.well-known/icon.png', '.well-known/icon.png'),
+    (REPO_URL + 'images/a%20b.jpg?v=2', 'images/a b.jpg'),
+    ('https://cdn.example.com/a.jpg', None),
+    ('//cdn.example.com/a.jpg', None),
+])
+def test_resolve_ref(ref, path):
+    assert image_refs.resolve_ref(ref) == path
+
+
+def catalog(*refs):
+    products = [
+        {'product_id': f'p{i}', 'public_data': {'image_url': ref}} for i, ref in enumerate(refs)
+    ]
+    return {'page_content': [{'type': 'product_category', 'products': products}]}
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for path in ['images/products/p1/1.png', 'assets/logo.png', 'root.png']:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        PIL.new('RGB', (40, 30)).save(tmp_path / path)
+    return tmp_path
+
+
+def test_refs_outside_images_are_found(repo):
+    data = catalog('/images/products/p1/1.png', 'assets/logo.png', 'root.png', 'assets/gone.png',
+                   'https://cdn.example.com/a.jpg')
+    result = image_refs.check_images(data, cache_file='cache.json')
+    assert [p['path'] for p in result['problems']] == ['assets/gone.png']
+    assert result['checked'] == 4
+    assert result['remote'] == 1
+
+
+def test_header_cache(repo):
+    data = catalog('images/products/p1/1.png', 'assets/logo.png')
+    assert image_refs.check_images(data, cache_file='cache.json')['headers_read'] == 2
+    assert image_refs.check_images(data, cache_file='cache.json')['headers_read'] == 0
+
+    PIL.new('RGB', (3000, 20)).save(repo / 'assets/logo.png')
+    result = image_refs.check_images(data, cache_file='cache.json')
+    assert result['headers_read'] == 1
+    assert [p['problem'] for p in result['problems']] == ['oversized (3000x20)']
+    with open('cache.json', 'r', encoding='utf-8') as f:
+        assert json.load(f)['assets/logo.png']['width'] == 3000
@@ -0,0 +1,81 @@
+"""Content-addressed image store: ingest and garbage collection"""
+
+import os
+
+import pytest
+
+from image_store import ImageStore, collect_garbage, ingest
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for path, data in {
+        'images/products/a/1.png': b'same bytes',
+        'images/products/b/1.png': b'same bytes',
+        'images/products/b/label.png': b'label bytes',
+        'images/products/c/orphan.png': b'orphan bytes',
+    }.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    os.makedirs('backend')
+    with open('backend/image_mapping.json', 'w', encoding='utf-8') as f:
+        f.write('{"a": ["images/products/a/1.png"], "b": ["images/products/b/1.png", "images/products/b/label.png"]}')
+    with open('product.js', 'w', encoding='utf-8') as f:
+        f.write("const label = 'images/products/b/label.png';")
+    return tmp_path
+
+
+def store():
+    return ImageStore('images/store', 'backend/image_store_index.json')
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_ingest_links_originals_by_default(repo):
+    result = ingest('images/products', store())
+    assert result['files'] == 4
+    assert result['removed'] == []
+    # Only product.js still names an original once the mapping is rewritten
+    assert result['unreferenced'] == ['images/products/a/1.png', 'images/products/b/1.png',
+                                      'images/products/c/orphan.png']
+    assert len(os.listdir('images/store')) == 3
+
+    mapping = read('backend/image_mapping.json').decode('utf-8')
+    assert 'images/products' not in mapping
+    assert len(result['linked']) == 4
+    for path in result['linked']:
+        assert os.path.samefile(path, store().canonical_path(path))
+    assert read('images/products/a/1.png') == b'same bytes'
+
+
+def test_ingest_prune_deletes_unreferenced_only(repo):
+    result = ingest('images/products', store(), prune=True)
+    assert result['removed'] == ['images/products/a/1.png', 'images/products/b/1.png', 'images/products/c/orphan.png']
+    assert not os.path.exists('images/products/c/orphan.png')
+    # Still named in product.js, so it stays (as a link to its blob)
+    assert read('images/products/b/label.png') == b'label bytes'
+
+
+def test_dry_run_changes_nothing(repo):
+    before = read('backend/image_mapping.json')
+    result = ingest('images/products', store(), dry_run=True, prune=True)
+    assert result['rewritten'] == ['backend/image_mapping.json']
+    assert len(result['removed']) == 3
+    assert read('backend/image_mapping.json') == before
+    assert os.path.exists('images/products/c/orphan.png')
+    assert not os.path.exists('images/store')
+
+
+def test_gc_deletes_unreferenced_blobs(repo):
+    ingest('images/products', store())
+    orphan_blob = [name for name in os.listdir('images/store') if read(f'images/store/{name}') == b'orphan bytes']
+    assert collect_garbage(store(), dry_run=True) == [f'images/store/{orphan_blob[0]}']
+    assert collect_garbage(store()) == [f'images/store/{orphan_blob[0]}']
+    assert len(os.listdir('images/store')) == 2
+    # The original keeps its data through its own link
+    assert read('images/products/c/orphan.png') == b'orphan bytes'
@@ -0,0 +1,94 @@
+"""Incremental archive import"""
+
+import io
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+import process_product_images as ppi
+
+PIL = pytest.importorskip('PIL.Image')
+
+
+def png(angle, size=(64, 64)):
+    """A gradient image; different angles give visually different images"""
+    out = io.BytesIO()
+    PIL.linear_gradient('L').rotate(angle).resize(size).convert('RGB').save(out, 'PNG')
+    return out.getvalue()
+
+
+def write_archive(path, images):
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, data in images.items():
+            zf.writestr(name, data)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'products').mkdir()
+    (tmp_path / 'backend').mkdir()
+    write_archive(tmp_path / 'products' / 'f1_b2b_100.zip', {'1.png': png(0), 'supp-facts.png': png(90)})
+    write_archive(tmp_path / 'products' / 'f1_b2b_200.zip', {'1.png': png(180, (80, 40))})
+    return tmp_path
+
+
+@pytest.fixture
+def feed():
+    return pd.DataFrame({
+        'Product': ['Product One', 'Product Two'],
+        'product_id_from_url': ['100', '200'],
+    })
+
+
+def run_import(feed):
+    image_mapping, manifest, imported, skipped, dirty = ppi.import_archives(feed, workers=1)
+    if dirty:
+        ppi.save_import_state(image_mapping, manifest)
+    return image_mapping, manifest, imported, skipped, dirty
+
+
+def test_second_run_is_a_no_op(workspace, feed):
+    mapping, manifest, imported, skipped, dirty = run_import(feed)
+    assert (imported, skipped, dirty) == (2, 0, True)
+    assert sorted(mapping) == ['100', '200']
+    assert all(os.path.exists(path) for entry in manifest.values() for path in entry['files'])
+
+    changed, unchanged = ppi.plan_imports(ppi.load_json_file(ppi.MANIFEST_FILE, {}))
+    assert changed == []
+    assert sorted(product_id for product_id, _ in unchanged) == ['100', '200']
+
+    before = {path: os.stat(path).st_mtime_ns for path in (ppi.MAPPING_FILE, ppi.MANIFEST_FILE)}
+    again, _, imported, skipped, dirty = run_import(feed)
+    assert (imported, skipped, dirty) == (0, 2, False)
+    assert again == mapping
+    assert {path: os.stat(path).st_mtime_ns for path in before} == before
+
+
+def test_touched_archive_is_skipped_by_hash(workspace, feed):
+    run_import(feed)
+    archive = workspace / 'products' / 'f1_b2b_100.zip'
+    stat = os.stat(archive)
+    os.utime(archive, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _, _, imported, skipped, _ = run_import(feed)
+    assert (imported, skipped) == (0, 2)
+
+
+def test_changed_archive_is_reimported(workspace, feed):
+    run_import(feed)
+    write_archive(workspace / 'products' / 'f1_b2b_200.zip', {'1.png': png(45), '2.png': png(270)})
+    mapping, _, imported, skipped, dirty = run_import(feed)
+    assert (imported, skipped, dirty) == (1, 1, True)
+    assert len(mapping['200']['images']['main'] + mapping['200']['images']['label']) == 2
+
+
+def test_deleted_archive_is_pruned(workspace, feed):
+    run_import(feed)
+    os.remove(workspace / 'products' / 'f1_b2b_200.zip')
+    mapping, manifest, imported, skipped, dirty = run_import(feed)
+    assert (imported, skipped, dirty) == (0, 1, True)
+    assert sorted(mapping) == ['100']
+    assert list(manifest) == ['products/f1_b2b_100.zip']
+    assert sorted(ppi.load_json_file(ppi.MAPPING_FILE, {})) == ['100']
@@ -0,0 +1,21 @@
+"""Compiled product rules"""
+
+import product_rules
+
+RULES = [
+    {'field': 'system_data.application_type', 'check': 'required', 'message': 'no type'},
+    {'field': 'system_data.capsules_count', 'check': 'required', 'message': 'no capsules',
+     'when': {'field': 'system_data.application_type', 'contains_any': ['Capsule']}},
+]
+
+
+def test_field_used_with_two_defaults():
+    validate = product_rules.compile_validator(RULES)
+    assert validate({'system_data': {}}) == ['no type']
+    assert validate({'system_data': {'application_type': 'Capsule'}}) == ['no capsules']
+    assert validate({'system_data': {'application_type': 'Capsule', 'capsules_count': 60}}) == []
+
+
+def test_field_report():
+    validate = product_rules.compile_validator(RULES, report='field')
+    assert validate({'system_data': {'application_type': 'Capsule'}}) == ['capsules_count']
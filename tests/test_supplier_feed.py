@@ -0,0 +1,135 @@
+"""Supplier feed cache and lookup index"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import supplier_feed
+from supplier_feed import FeedIndex, load_feed
+
+
+def feed_frame(rows):
+    return pd.DataFrame(rows, columns=['Product', 'Image', 'Price'])
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    pytest.importorskip('openpyxl')
+    path = tmp_path / 'feed.xlsx'
+    feed_frame([
+        ['Lipo 6 Black 60 caps', 'https://cdn.example.com/products/v3/p41108/a.jpg', 30],
+        ['Whey Gold 2 kg', 'https://cdn.example.com/products/v3/p500/b.jpg', 70],
+    ]).to_excel(path, index=False)
+    return path
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    calls = []
+    parse = supplier_feed.parse_feed
+    monkeypatch.setattr(supplier_feed, 'parse_feed', lambda path: calls.append(path) or parse(path))
+    return calls
+
+
+def test_feed_is_parsed_once(workbook, parse_count):
+    pytest.importorskip('pyarrow')
+    first = load_feed(workbook)
+    assert list(first['product_id_from_url']) == ['41108', '500']
+    second = load_feed(workbook)
+    assert len(parse_count) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_touched_feed_is_not_reparsed(workbook, parse_count):
+    pytest.importorskip('pyarrow')
+    load_feed(workbook)
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_feed(workbook)
+    assert len(parse_count) == 1
+
+
+def test_changed_feed_is_reparsed(workbook, parse_count):
+    load_feed(workbook)
+    feed_frame([['New product', 'https://cdn.example.com/products/v3/p7/c.jpg', 1]]).to_excel(workbook, index=False)
+    assert list(load_feed(workbook)['Product']) == ['New product']
+    assert len(parse_count) == 2
+
+
+def test_use_cache_false_forces_parse(workbook, parse_count):
+    load_feed(workbook)
+    load_feed(workbook, use_cache=False)
+    assert len(parse_count) == 2
+
+
+@pytest.fixture
+def index():
+    df = feed_frame([
+        ['Lipo 6 Black 60 caps', 'https://cdn.example.com/products/v3/p41108/a.jpg', 30],
+        ['Lipo 6 Black 60 caps (Cherry)', 'https://cdn.example.com/products/v3/p41108/b.jpg', 30],
+        ['Lipo 6 Black Ultra Concentrate', 'https://cdn.example.com/products/v3/p41200/c.jpg', 35],
+        ['Lipo 6', 'https://cdn.example.com/products/v3/p41300/d.jpg', 25],
+        ['Whey Gold 2 kg', 'https://cdn.example.com/products/v3/p500/e.jpg', 70],
+        ['Green Tea Extract', 'no image', 10],
+        ['Green Tea Extract Plus', 'no image', 12],
+    ])
+    df['product_id_from_url'] = df['Image'].astype(str).str.extract(r'/p(\d+)/')
+    return FeedIndex(df)
+
+
+def test_search_matches_whole_words_and_a_prefix(index):
+    assert index.search('lipo 6 black') == [0, 1, 2]
+    assert index.search('Whey Go') == [4]
+    assert index.search('black lipo') == []
+    assert index.search('') == []
+
+
+def test_supplier_id_wins(index):
+    match = index.resolve('Whey Gold', '41200')
+    assert match.status == 'id'
+    assert match.row['Product'] == 'Lipo 6 Black Ultra Concentrate'
+
+
+def test_options_of_one_product_are_one_match(index):
+    match = index.resolve('Lipo 6 Black 60')
+    assert match.status == 'name'
+    assert match.row['Product'] == 'Lipo 6 Black 60 caps'
+
+
+def test_ambiguous_name(index):
+    match = index.resolve('Lipo 6 Black')
+    assert match.status == 'ambiguous'
+    assert match.row is None
+    assert match.candidates == ['Lipo 6 Black 60 caps', 'Lipo 6 Black Ultra Concentrate']
+
+    picked = index.resolve('Lipo 6 Black', pick_first=True)
+    assert picked.status == 'ambiguous'
+    assert picked.row['Product'] == 'Lipo 6 Black 60 caps'
+
+
+def test_ambiguous_without_supplier_ids(index):
+    match = index.resolve('Green Tea')
+    assert match.status == 'ambiguous'
+    assert match.candidates == ['Green Tea Extract', 'Green Tea Extract Plus']
+
+
+def test_exact_name_breaks_the_tie(index):
+    match = index.resolve('Lipo 6')
+    assert match.status == 'name'
+    assert match.row['Product'] == 'Lipo 6'
+    assert index.resolve('Green Tea Extract').row['Product'] == 'Green Tea Extract'
+
+
+def test_not_found(index):
+    assert index.resolve('Creatine').status == 'not_found'
+    assert index.resolve(None, '999').status == 'not_found'
+
+
+def test_catalog_ids_are_not_supplier_ids():
+    product = {'product_id': 'prod-41108', 'public_data': {'image_url': 'images/store/abc.png'}, 'system_data': {}}
+    assert supplier_feed.supplier_id_for_product(product) is None
+    product['public_data']['image_url'] = 'https://cdn.example.com/products/v3/p41108/a.jpg'
+    assert supplier_feed.supplier_id_for_product(product) == '41108'
+    product['system_data']['supplier_id'] = 500
+    assert supplier_feed.supplier_id_for_product(product) == '500'
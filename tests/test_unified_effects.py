@@ -0,0 +1,93 @@
+"""Effect normalization: compiled synonym index and memoization"""
+
+import random
+
+import pytest
+
+import unified_effects
+from unified_effects import UNIFIED_EFFECTS, map_effect_to_unified
+
+
+def reference_mapping(label, table=UNIFIED_EFFECTS):
+    """Linear scan with the documented priority: whole-label match, then table order"""
+    lower = label.lower()
+    synonyms = [(synonym.lower(), data['label']) for data in table.values() for synonym in data['synonyms']]
+    for synonym, unified in synonyms:
+        if synonym == lower:
+            return unified, label
+    for synonym, unified in synonyms:
+        if synonym and synonym in lower:
+            return unified, label
+    return label, label
+
+
+@pytest.fixture(autouse=True)
+def original_table():
+    saved = {key: dict(value, synonyms=list(value['synonyms'])) for key, value in UNIFIED_EFFECTS.items()}
+    unified_effects.invalidate_effect_cache()
+    yield
+    unified_effects.reload_unified_effects(saved)
+
+
+def effect_labels(page_content):
+    return [
+        effect.get('label', '')
+        for component in page_content['page_content'] if component.get('type') == 'product_category'
+        for product in component.get('products', [])
+        for effect in product.get('public_data', {}).get('effects', [])
+    ]
+
+
+def test_index_matches_linear_scan(page_content):
+    synonyms = [synonym for data in UNIFIED_EFFECTS.values() for synonym in data['synonyms']]
+    rng = random.Random(4)
+    labels = effect_labels(page_content) + synonyms + [s.upper() for s in synonyms]
+    labels += [f'{rng.choice(synonyms)} и {rng.choice(synonyms).lower()}' for _ in range(300)]
+    labels += ['', 'Нещо съвсем друго', 'Подобрява ' + synonyms[-1].lower()]
+    for label in labels:
+        assert map_effect_to_unified(label) == reference_mapping(label), label
+
+
+def test_reload_recompiles_index():
+    assert map_effect_to_unified('Горене на мазнини')[0] != 'Тест'
+    unified_effects.reload_unified_effects({
+        'Тест': {'label': 'Тест', 'synonyms': ['горене на мазнини'], 'description': ''}
+    })
+    assert map_effect_to_unified('Горене на мазнини') == ('Тест', 'Горене на мазнини')
+    assert map_effect_to_unified('Енергия') == ('Енергия', 'Енергия')
+
+
+def test_lru_evicts_least_recently_used():
+    cache = unified_effects.LRUCache(2)
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        return key.upper()
+
+    for key in ['a', 'b', 'a', 'c', 'b', 'a']:
+        assert cache.get_or_compute(key, lambda: compute(key)) == key.upper()
+    # 'b' was evicted by 'c' ('a' had just been used), then 'a' by 'b'
+    assert calls == ['a', 'b', 'c', 'b', 'a']
+    assert cache.stats() == {'hits': 1, 'misses': 5, 'evictions': 3, 'size': 2, 'maxsize': 2, 'hit_rate': 1 / 6}
+
+
+def test_reload_invalidates_memoized_results():
+    product = {'public_data': {'name': 'Lipo Test', 'effects': [{'label': 'Горене на мазнини', 'value': 70}]},
+               'system_data': {'goals': []}}
+    before = unified_effects.analyze_product_effects(product)
+    assert unified_effects.analyze_product_effects(product) == before
+    assert unified_effects.effect_cache_stats()['labels']['hits'] >= 1
+
+    unified_effects.reload_unified_effects({
+        'Тест': {'label': 'Тест', 'synonyms': ['горене на мазнини'], 'description': ''}
+    })
+    assert unified_effects.effect_cache_stats()['labels']['size'] == 0
+    assert 'Тест' in unified_effects.analyze_product_effects(product)
+
+
+def test_in_place_edit_needs_rebuild():
+    map_effect_to_unified('Съвсем нов ефект')
+    UNIFIED_EFFECTS['Нов'] = {'label': 'Нов', 'synonyms': ['съвсем нов ефект'], 'description': ''}
+    unified_effects.rebuild_effect_index()
+    assert map_effect_to_unified('Съвсем нов ефект') == ('Нов', 'Съвсем нов ефект')
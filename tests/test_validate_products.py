@@ -0,0 +1,139 @@
+"""Incremental validation: cache reuse and invalidation, report freshness"""
+
+import json
+import os
+
+import pytest
+
+import validate_products
+
+
+@pytest.fixture
+def files(tmp_path):
+    return {'report_file': str(tmp_path / 'report.json'), 'cache_file': str(tmp_path / 'cache.json')}
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_second_run_uses_cache(page_content, files):
+    report, checked = validate_products.run_validation(page_content, **files)
+    assert len(checked) == report['total_products'] > 0
+
+    again, checked = validate_products.run_validation(page_content, **files)
+    assert checked == []
+    assert again == report
+
+
+def test_edited_product_is_revalidated(page_content, files):
+    validate_products.run_validation(page_content, **files)
+    product = next(
+        product for _, is_bestseller, product in validate_products.iter_catalog_products(page_content)
+        if not is_bestseller
+    )
+    product['public_data']['description'] = ''
+
+    report, checked = validate_products.run_validation(page_content, **files)
+    assert [p['product_id'] for _, p, _ in checked] == [product['product_id']]
+    assert read_json(files['report_file']) == report
+    assert any('описание' in issue for issue in report['issues'][product['product_id']]['issues'])
+
+
+def test_removed_product_leaves_cache_and_report(page_content, files):
+    validate_products.run_validation(page_content, **files)
+    removed = None
+    for component in page_content['page_content']:
+        if component.get('type') == 'product_category' and component.get('products'):
+            removed = component['products'].pop()
+            break
+
+    report, checked = validate_products.run_validation(page_content, **files)
+    assert checked == []
+    assert removed['product_id'] not in read_json(files['cache_file'])['products']
+    assert removed['product_id'] not in report['issues']
+
+
+def test_rules_change_invalidates_cache(page_content, files, monkeypatch):
+    validate_products.run_validation(page_content, **files)
+    monkeypatch.setattr(validate_products, 'RULES_VERSION', 'other-rules')
+
+    report, checked = validate_products.run_validation(page_content, **files)
+    assert len(checked) == report['total_products']
+    assert read_json(files['cache_file'])['rules_version'] == 'other-rules'
+
+
+def test_stale_report_on_disk_is_rewritten(page_content, files):
+    report, _ = validate_products.run_validation(page_content, **files)
+    with open(files['report_file'], 'w', encoding='utf-8') as f:
+        json.dump({'total_products': 0, 'products_with_issues': 0, 'issues': {}}, f)
+
+    again, checked = validate_products.run_validation(page_content, **files)
+    assert checked == []
+    assert read_json(files['report_file']) == report
+
+
+def test_up_to_date_report_is_not_rewritten(page_content, files):
+    validate_products.run_validation(page_content, **files)
+    mtimes = {name: os.stat(path).st_mtime_ns for name, path in files.items()}
+
+    validate_products.run_validation(page_content, **files)
+    assert {name: os.stat(path).st_mtime_ns for name, path in files.items()} == mtimes
+
+
+@pytest.fixture(scope='module')
+def large_catalog():
+    from catalog_generator import generate_page_content
+    from conftest import PAGE_CONTENT
+
+    return generate_page_content(1500, 7, PAGE_CONTENT)
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+
+def test_jsonl_ordered_matches_serial(large_catalog, tmp_path):
+    serial, ordered = tmp_path / 'serial.jsonl', tmp_path / 'ordered.jsonl'
+    counts = validate_products.validate_to_jsonl(large_catalog, str(serial), workers=0, chunk_size=50)
+    assert validate_products.validate_to_jsonl(
+        large_catalog, str(ordered), workers=2, chunk_size=50, ordered=True
+    ) == counts
+    assert counts[1] > 0
+    assert ordered.read_bytes() == serial.read_bytes()
+
+
+def test_jsonl_unordered_has_same_records(large_catalog, tmp_path):
+    serial, unordered = tmp_path / 'serial.jsonl', tmp_path / 'unordered.jsonl'
+    counts = validate_products.validate_to_jsonl(large_catalog, str(serial), workers=0, chunk_size=50)
+    assert validate_products.validate_to_jsonl(
+        large_catalog, str(unordered), workers=2, chunk_size=50
+    ) == counts
+    records = [json.loads(line) for line in read_lines(unordered)]
+    assert sorted(records, key=lambda record: record['seq']) == [json.loads(line) for line in read_lines(serial)]
+
+
+def test_other_catalog_keeps_default_report(page_content, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    catalog = tmp_path / 'shop.json'
+    catalog.write_text(json.dumps(page_content, ensure_ascii=False), encoding='utf-8')
+
+    validate_products.main(['--catalog', str(catalog)])
+    assert (tmp_path / 'shop.validation_report.json').exists()
+    assert (tmp_path / 'shop.validation_cache.json').exists()
+    assert not (tmp_path / validate_products.REPORT_FILE).exists()
+
+    validate_products.main(['--catalog', str(catalog), '--jsonl'])
+    assert (tmp_path / 'shop.validation_report.jsonl').exists()
+    assert not (tmp_path / validate_products.JSONL_REPORT_FILE).exists()
+
+
+def test_jsonl_mode_runs_image_check(page_content, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    catalog = tmp_path / 'shop.json'
+    catalog.write_text(json.dumps(page_content, ensure_ascii=False), encoding='utf-8')
+
+    assert validate_products.main(['--catalog', str(catalog), '--jsonl', '--images']) is False
+    assert 'IMAGE REFERENCES' in capsys.readouterr().out
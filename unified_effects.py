@@ -19,8 +19,9 @@ Effect Categories:
 - Skin Quality (Качество на кожата)
 """
 
-import json
-from fix_products_json import load_products_json
+import re
+from collections import OrderedDict
+from fix_products_json import load_products_json, save_products_json
 
 # Unified effect categories with their synonyms/related effects
 UNIFIED_EFFECTS = {
@@ -95,20 +96,166 @@ UNIFIED_EFFECTS = {
     }
 }
 
+def compile_effect_index(unified_effects):
+    """
+    Compile an UNIFIED_EFFECTS-style table for fast lookups.
+
+    Returns a dict with:
+    - 'exact':    lowercased synonym -> unified label
+    - 'priority': lowercased synonym -> (rank, unified label), rank being the
+                  synonym's position in table order (category, then synonym)
+    - 'pattern':  one alternation regex that finds every synonym occurring
+                  inside a label, alternatives ordered by rank
+    """
+    exact = {}
+    priority = {}
+    rank = 0
+    for unified_data in unified_effects.values():
+        for synonym in unified_data['synonyms']:
+            key = synonym.lower()
+            if key and key not in priority:
+                priority[key] = (rank, unified_data['label'])
+                exact[key] = unified_data['label']
+            rank += 1
+    
+    pattern = None
+    if priority:
+        # The lookahead lets matches overlap, so a synonym hidden inside a
+        # longer one is still seen; at a given position the alternation
+        # returns the highest-priority synonym that starts there.
+        alternation = '|'.join(re.escape(key) for key in priority)
+        pattern = re.compile(f'(?=({alternation}))')
+    
+    return {
+        'exact': exact,
+        'priority': priority,
+        'pattern': pattern
+    }
+
+_EFFECT_INDEX = compile_effect_index(UNIFIED_EFFECTS)
+
+# Upper bound on memoized labels / name+goals combinations
+EFFECT_CACHE_SIZE = 4096
+
+_MISSING = object()
+
+class LRUCache:
+    """Bounded least-recently-used cache that counts hits, misses and evictions"""
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() on a miss"""
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+        
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+    
+    def clear(self):
+        """Drop all entries (counters are kept, see reset_stats)"""
+        self._entries.clear()
+    
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+# Lowercased effect label -> unified label (None when nothing matches)
+_label_cache = LRUCache(EFFECT_CACHE_SIZE)
+# (lowercased product name, goals) -> effects inferred for non-bestsellers
+_inference_cache = LRUCache(EFFECT_CACHE_SIZE)
+
+def effect_cache_stats():
+    """Hit/miss/eviction counters of the effect normalization caches"""
+    return {
+        'labels': _label_cache.stats(),
+        'inference': _inference_cache.stats()
+    }
+
+def invalidate_effect_cache():
+    """Forget every memoized mapping (e.g. after UNIFIED_EFFECTS changed)"""
+    _label_cache.clear()
+    _inference_cache.clear()
+
+def rebuild_effect_index():
+    """Recompile the lookup index after UNIFIED_EFFECTS has been modified"""
+    global _EFFECT_INDEX
+    _EFFECT_INDEX = compile_effect_index(UNIFIED_EFFECTS)
+    invalidate_effect_cache()
+
+def reload_unified_effects(unified_effects):
+    """Replace the UNIFIED_EFFECTS table in place and recompile/invalidate"""
+    UNIFIED_EFFECTS.clear()
+    UNIFIED_EFFECTS.update(unified_effects)
+    rebuild_effect_index()
+
 def map_effect_to_unified(effect_label):
     """
     Map a specific effect label to its unified category.
     Returns tuple: (unified_label, original_label)
+    
+    Matching is case-insensitive. Priority when several synonyms match:
+    1. a synonym equal to the whole label wins;
+    2. otherwise the synonym contained in the label that comes first in
+       UNIFIED_EFFECTS (category order, then synonym order) wins.
     """
     effect_label_lower = effect_label.lower()
-    
-    for unified_key, unified_data in UNIFIED_EFFECTS.items():
-        for synonym in unified_data['synonyms']:
-            if synonym.lower() == effect_label_lower or synonym.lower() in effect_label_lower:
-                return (unified_data['label'], effect_label)
+    unified_label = _label_cache.get_or_compute(
+        effect_label_lower,
+        lambda: _lookup_unified_label(effect_label_lower)
+    )
     
     # If no match found, return as is
-    return (effect_label, effect_label)
+    if unified_label is None:
+        return (effect_label, effect_label)
+    return (unified_label, effect_label)
+
+def _lookup_unified_label(effect_label_lower):
+    """Uncached index lookup; returns the unified label or None"""
+    unified_label = _EFFECT_INDEX['exact'].get(effect_label_lower)
+    if unified_label is not None:
+        return unified_label
+    
+    pattern = _EFFECT_INDEX['pattern']
+    if pattern is not None:
+        priority = _EFFECT_INDEX['priority']
+        best = None
+        for match in pattern.finditer(effect_label_lower):
+            candidate = priority[match.group(1)]
+            if best is None or candidate < best:
+                best = candidate
+        if best is not None:
+            return best[1]
+    
+    return None
 
 def analyze_product_effects(product, is_bestseller=False):
     """
@@ -151,28 +298,37 @@ def analyze_product_effects(product, is_bestseller=False):
     
     # Infer effects from product name and goals
     if not is_bestseller:
-        # Weight loss products
-        if 'weight-loss' in goals or 'отслабване' in name:
-            if 'Отслабване' not in unified_effects_map:
-                unified_effects_map['Отслабване'] = {'value': 80, 'sources': ['inferred']}
-        
-        # Thermogenic products
-        if 'thermo' in name or 'burn' in name or 'термо' in name:
-            if 'Термогенеза' not in unified_effects_map:
-                unified_effects_map['Термогенеза'] = {'value': 85, 'sources': ['inferred']}
-        
-        # Energy products
-        if 'energy' in goals or 'енергия' in name:
-            if 'Енергия' not in unified_effects_map:
-                unified_effects_map['Енергия'] = {'value': 80, 'sources': ['inferred']}
-        
-        # Fat burning
-        if 'fat' in name or 'lipo' in name:
-            if 'Метаболизъм' not in unified_effects_map:
-                unified_effects_map['Метаболизъм'] = {'value': 85, 'sources': ['inferred']}
+        inferred = _inference_cache.get_or_compute(
+            (name, tuple(goals)),
+            lambda: _infer_effects(name, goals)
+        )
+        for label, value in inferred:
+            if label not in unified_effects_map:
+                unified_effects_map[label] = {'value': value, 'sources': ['inferred']}
     
     return unified_effects_map
 
+# Name/goal rules for non-bestsellers, checked in order:
+# (unified label, value, goal that implies it, name substrings that imply it)
+INFERENCE_RULES = [
+    # Weight loss products
+    ('Отслабване', 80, 'weight-loss', ('отслабване',)),
+    # Thermogenic products
+    ('Термогенеза', 85, None, ('thermo', 'burn', 'термо')),
+    # Energy products
+    ('Енергия', 80, 'energy', ('енергия',)),
+    # Fat burning
+    ('Метаболизъм', 85, None, ('fat', 'lipo'))
+]
+
+def _infer_effects(name, goals):
+    """Effects implied by a lowercased product name and its goals, as (label, value) pairs"""
+    inferred = []
+    for label, value, goal, name_parts in INFERENCE_RULES:
+        if (goal is not None and goal in goals) or any(part in name for part in name_parts):
+            inferred.append((label, value))
+    return tuple(inferred)
+
 def get_top_3_effects(unified_effects_map):
     """
     Get the top 3 most prominent effects from the unified effects map.
@@ -203,6 +359,8 @@ def update_products_with_unified_effects():
     Update all products with unified effect categories,
     showing only the top 3 most prominent effects.
     """
+    from effect_scoring import build_score_matrix, ranked_effects, top_effects
+    
     print("=" * 80)
     print("UPDATING PRODUCTS WITH UNIFIED EFFECT CATEGORIES")
     print("=" * 80)
@@ -215,73 +373,61 @@ def update_products_with_unified_effects():
         'categories_used': set()
     }
     
-    for cat in data['categories']:
-        if cat.get('type') != 'product_category':
-            continue
-        
-        cat_title = cat.get('title', '')
-        is_bestseller_cat = 'БЕСТСЕЛЪР' in cat_title
-        
-        print(f"\n{cat_title}:")
+    product_categories = [
+        cat for cat in data['categories']
+        if cat.get('type') == 'product_category'
+    ]
+    
+    # Score the whole catalog in one batch
+    products = []
+    bestseller_flags = []
+    for cat in product_categories:
+        is_bestseller_cat = 'БЕСТСЕЛЪР' in cat.get('title', '')
+        for product in cat.get('products', []):
+            products.append(product)
+            bestseller_flags.append(is_bestseller_cat)
+    
+    scores = build_score_matrix(products, bestseller_flags, with_sources=True)
+    top_3_per_product = top_effects(scores, 3)
+    columns = {label: col for col, label in enumerate(scores['labels'])}
+    
+    row = 0
+    for cat in product_categories:
+        print(f"\n{cat.get('title', '')}:")
         print("-" * 80)
         
         for product in cat.get('products', []):
             pub_data = product.get('public_data', {})
             name = pub_data.get('name', '')
             
-            # Analyze and get unified effects
-            unified_effects_map = analyze_product_effects(product, is_bestseller_cat)
-            
-            # Get top 3
-            top_3_effects = get_top_3_effects(unified_effects_map)
+            all_effects = ranked_effects(scores, row)
+            top_3_effects = top_3_per_product[row]
             
             # Update product
             pub_data['effects'] = top_3_effects
             
             stats['products_updated'] += 1
-            stats['effects_unified'] += len(unified_effects_map)
+            stats['effects_unified'] += len(all_effects)
             
             print(f"\n{name}:")
-            print(f"  Unified effects found: {len(unified_effects_map)}")
-            for eff_label, eff_data in sorted(
-                unified_effects_map.items(),
-                key=lambda x: x[1]['value'],
-                reverse=True
-            ):
-                sources = ', '.join(eff_data['sources'][:2])  # Show first 2 sources
-                print(f"    • {eff_label}: {eff_data['value']} (from: {sources})")
+            print(f"  Unified effects found: {len(all_effects)}")
+            for eff_label, eff_value in all_effects:
+                eff_sources = scores['sources'][(row, columns[eff_label])]
+                sources = ', '.join(eff_sources[:2])  # Show first 2 sources
+                print(f"    • {eff_label}: {eff_value} (from: {sources})")
             
             print(f"  Top 3 selected:")
             for eff in top_3_effects:
                 print(f"    ✓ {eff['label']}: {eff['value']}")
                 stats['categories_used'].add(eff['label'])
+            
+            row += 1
     
     # Save updated products
     categories = data.get('categories', [])
     footer = data.get('footer', {})
     
-    lines = []
-    
-    for i, cat in enumerate(categories):
-        cat_json = json.dumps(cat, ensure_ascii=False, indent=2)
-        cat_lines = cat_json.split('\n')
-        for line in cat_lines:
-            lines.append('    ' + line)
-        
-        if i < len(categories) - 1:
-            lines[-1] = lines[-1] + ','
-    
-    lines.append('  ],')
-    footer_json = json.dumps(footer, ensure_ascii=False, indent=2)
-    footer_lines = footer_json.split('\n')
-    for i, line in enumerate(footer_lines):
-        if i == 0:
-            lines.append('  "footer": ' + line)
-        else:
-            lines.append('  ' + line)
-    
-    with open('backend/products.json', 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    save_products_json('backend/products.json', categories, footer)
     
     print("\n" + "=" * 80)
     print("UPDATE SUMMARY")
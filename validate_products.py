@@ -6,10 +6,28 @@ UPDATED: Now uses backend/page_content.json (single source of truth).
 backend/products.json has been DEPRECATED.
 """
 
+import argparse
+import hashlib
+import itertools
 import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
-# Validation constants
-MIN_DESCRIPTION_LENGTH = 50
+from catalog_serializer import dumps
+from catalog_store import atomic_write, write_json_atomic
+from product_rules import RULES_FINGERPRINT, check_product
+
+# Cached results are discarded whenever product_rules.RULES change
+RULES_VERSION = RULES_FINGERPRINT
+
+PAGE_CONTENT_FILE = 'backend/page_content.json'
+REPORT_FILE = 'backend/validation_report.json'
+# Per-product content hashes and results of the last run
+VALIDATION_CACHE_FILE = 'backend/validation_cache.json'
+# One JSON line per product with issues (--workers / --jsonl)
+JSONL_REPORT_FILE = 'backend/validation_report.jsonl'
+# Products per chunk sent to a worker process
+CHUNK_SIZE = 500
 
 def validate_product(product, is_bestseller=False):
     """
@@ -22,128 +40,298 @@ def validate_product(product, is_bestseller=False):
     Returns:
         List of validation issues (empty if all valid)
     """
-    issues = []
-    
-    public_data = product.get('public_data', {})
-    system_data = product.get('system_data', {})
-    
     # Skip detailed validation for bestsellers (as per requirements)
     # Bestsellers are manually curated and pre-validated
     if is_bestseller:
         return []
     
-    # 1. General description
-    description = public_data.get('description', '')
-    if not description or len(description) < MIN_DESCRIPTION_LENGTH:
-        issues.append(f'Липсва подробно общо описание (минимум {MIN_DESCRIPTION_LENGTH} символа)')
-    
-    # 2. Price
-    price = public_data.get('price')
-    if not price or price <= 0:
-        issues.append('Липсва цена или цената е невалидна')
-    
-    # 3. Manufacturer
-    manufacturer = system_data.get('manufacturer', '')
-    if not manufacturer:
-        issues.append('Липсва производител')
-    
-    # 4. Capsules/tablets/weight
-    capsules = system_data.get('capsules_count')
-    grams = system_data.get('weight_grams')
-    app_type = system_data.get('application_type', '')
-    
-    if 'Capsule' in app_type or 'Tablet' in app_type:
-        if not capsules:
-            issues.append('Липсва брой капсули/таблетки')
-    elif 'Powder' in app_type:
-        if not grams:
-            issues.append('Липсва грамаж на прах')
-    
-    # 5. Number of doses
-    doses = system_data.get('doses_count')
-    if not doses:
-        issues.append('Липсва брой дози')
-    
-    # 6. Composition (ingredients)
-    ingredients = public_data.get('ingredients', [])
-    if not ingredients or len(ingredients) == 0:
-        issues.append('Липсва състав (ingredients)')
-    
-    # 7. Intake recommendations
-    protocol = system_data.get('protocol_hint', '')
-    if not protocol or len(protocol) < 10:
-        issues.append('Липсват препоръки за прием')
-    
-    # 8. Main image
-    image_url = public_data.get('image_url', '')
-    if not image_url:
-        issues.append('Липсва основна снимка')
-    
-    # 9. Label image
-    label_image = public_data.get('label_image', '')
-    if not label_image:
-        issues.append('Липсва снимка на етикета')
-    
-    return issues
+    # Required-field rules live in product_rules.RULES
+    return check_product(product)
+
+def product_hash(product):
+    """Stable content hash of a product (key order does not matter)"""
+    encoded = json.dumps(product, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+def is_bestseller_category(category):
+    title = category.get('title', '').lower()
+    return 'bestseller' in title or 'бестселър' in title
+
+def iter_catalog_products(data):
+    """(category_title, is_bestseller, product) for every product, in catalog order"""
+    for category in data.get('page_content', []):
+        if category.get('type') != 'product_category':
+            continue
+        category_title = category.get('title', '')
+        is_bestseller = is_bestseller_category(category)
+        for product in category.get('products', []):
+            yield category_title, is_bestseller, product
+
+def load_validation_cache(path=VALIDATION_CACHE_FILE):
+    """Cached results by product_id, or {} if missing or made by other rules"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('rules_version') != RULES_VERSION:
+        return {}
+    return cache.get('products', {})
+
+def validate_catalog(data, cache=None):
+    """
+    Validate every product of a page_content document, re-running
+    validate_product only for products whose hash (or bestseller status)
+    differs from the cache.
+
+    Returns (report, new_cache, checked) where report has the layout of
+    validation_report.json and checked lists (category_title, product,
+    issues) for the products that were actually re-validated.
+    """
+    cache = cache or {}
+    new_cache = {}
+    all_issues = {}
+    checked = []
+    total_products = 0
+    products_with_issues = 0
+
+    for category_title, is_bestseller, product in iter_catalog_products(data):
+        total_products += 1
+        product_id = product.get('product_id', '')
+        digest = product_hash(product)
+
+        entry = cache.get(product_id)
+        if entry is None or entry.get('hash') != digest or entry.get('bestseller') != is_bestseller:
+            entry = {
+                'hash': digest,
+                'bestseller': is_bestseller,
+                'issues': validate_product(product, is_bestseller)
+            }
+            checked.append((category_title, product, entry['issues']))
+        new_cache[product_id] = entry
+
+        if entry['issues']:
+            products_with_issues += 1
+            all_issues[product_id] = {
+                'name': product.get('public_data', {}).get('name', ''),
+                'category': category_title,
+                'issues': entry['issues']
+            }
+
+    report = {
+        'total_products': total_products,
+        'products_with_issues': products_with_issues,
+        'issues': all_issues
+    }
+    return report, new_cache, checked
+
+def run_validation(data, full=False, report_file=REPORT_FILE, cache_file=VALIDATION_CACHE_FILE):
+    """
+    Incrementally validate data and update the report and cache files.
+
+    Cheap enough to run before every catalog save: unchanged products are
+    only hashed. The report is rewritten whenever it differs from the file
+    on disk (also when that was edited or left behind by another catalog),
+    the cache whenever a product was re-validated or removed.
+    Returns (report, checked) as in validate_catalog().
+    """
+    cache = {} if full else load_validation_cache(cache_file)
+    report, new_cache, checked = validate_catalog(data, cache)
+
+    try:
+        with open(report_file, 'r', encoding='utf-8') as f:
+            current = f.read()
+    except (OSError, ValueError):
+        current = None
+    if current != dumps(report):
+        write_json_atomic(report_file, report)
+    if full or checked or new_cache.keys() != cache.keys():
+        write_json_atomic(cache_file, {'rules_version': RULES_VERSION, 'products': new_cache})
+    return report, checked
 
-def main():
+def _validate_chunk(chunk):
+    """Worker: validate (start, items) and return (start, count, records with issues)"""
+    start, items = chunk
+    records = []
+    for offset, (category_title, is_bestseller, product) in enumerate(items):
+        issues = validate_product(product, is_bestseller)
+        if issues:
+            records.append({
+                'seq': start + offset,
+                'product_id': product.get('product_id', ''),
+                'name': product.get('public_data', {}).get('name', ''),
+                'category': category_title,
+                'issues': issues
+            })
+    return start, len(items), records
+
+def iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """(start, items) chunks of iter_catalog_products(data)"""
+    products = iter_catalog_products(data)
+    start = 0
+    while True:
+        items = list(itertools.islice(products, chunk_size))
+        if not items:
+            return
+        yield start, items
+        start += len(items)
+
+def validate_to_jsonl(data, output=JSONL_REPORT_FILE, workers=0, chunk_size=CHUNK_SIZE, ordered=False):
+    """
+    Validate every product and write one JSON line per product with issues.
+
+    With workers > 1 chunks are validated in a process pool and lines are
+    written as chunks finish; at most 2 * workers chunks are in flight, so
+    memory does not grow with the catalog. ordered=True holds finished
+    chunks back until every earlier chunk is written, giving the catalog
+    order of the serial path (workers <= 1). Each line carries `seq`, the
+    product's position in the catalog.
+
+    Returns (total_products, products_with_issues).
+    """
+    total_products = 0
+    products_with_issues = 0
+
+    with atomic_write(output) as f:
+        def write(records):
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        if workers <= 1:
+            for chunk in iter_chunks(data, chunk_size):
+                _, count, records = _validate_chunk(chunk)
+                total_products += count
+                products_with_issues += len(records)
+                write(records)
+            return total_products, products_with_issues
+
+        chunks = iter_chunks(data, chunk_size)
+        window = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            held = {}
+            next_start = 0
+            while True:
+                for chunk in itertools.islice(chunks, max(0, window - len(pending) - len(held))):
+                    pending.add(pool.submit(_validate_chunk, chunk))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, count, records = future.result()
+                    total_products += count
+                    products_with_issues += len(records)
+                    if ordered:
+                        held[start] = (count, records)
+                    else:
+                        write(records)
+                while next_start in held:
+                    count, records = held.pop(next_start)
+                    write(records)
+                    next_start += count
+
+    return total_products, products_with_issues
+
+def output_paths(catalog):
+    """
+    (report, cache, JSON Lines report) paths for a catalog file.
+
+    The default catalog uses REPORT_FILE, VALIDATION_CACHE_FILE and
+    JSONL_REPORT_FILE; any other catalog gets its own files next to it
+    (<name>.validation_report.json, ...) so it never overwrites those.
+    """
+    if os.path.abspath(catalog) == os.path.abspath(PAGE_CONTENT_FILE):
+        return REPORT_FILE, VALIDATION_CACHE_FILE, JSONL_REPORT_FILE
+    base = os.path.splitext(catalog)[0]
+    return (f'{base}.validation_report.json', f'{base}.validation_cache.json',
+            f'{base}.validation_report.jsonl')
+
+def check_image_refs(data):
+    """Print the image reference check for data; False if an image is missing"""
+    from image_refs import MAPPING_FILE, check_images, load_json
+
+    print(f"\n{'='*80}")
+    print("IMAGE REFERENCES")
+    print(f"{'='*80}")
+    result = check_images(data, load_json(MAPPING_FILE))
+    for problem in result['problems']:
+        print(f"⚠️  {problem['owner']} {problem['field']}: {problem['problem']} - {problem['path']}")
+    print(f"Local references checked: {result['checked']}, remote: {result['remote']}, "
+          f"problems: {len(result['problems'])}")
+    return not any(p['problem'] == 'missing' for p in result['problems'])
+
+def main(argv=None):
     """Generate validation report"""
+    parser = argparse.ArgumentParser(description='Validate products and update the validation report')
+    parser.add_argument('--full', action='store_true',
+                        help='ignore the validation cache and re-check every product')
+    parser.add_argument('--catalog', default=PAGE_CONTENT_FILE,
+                        help=f'page_content.json to validate (default: {PAGE_CONTENT_FILE})')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='validate in N processes and write a JSON Lines report')
+    parser.add_argument('--jsonl', nargs='?', const='',
+                        help=f'write a JSON Lines report (default path: {JSONL_REPORT_FILE}, '
+                             'or <catalog>.validation_report.jsonl for another --catalog)')
+    parser.add_argument('--sort', action='store_true',
+                        help='write JSON Lines in catalog order (with --workers)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--images', action='store_true',
+                        help='also check that referenced image files exist and are sane')
+    args = parser.parse_args(argv)
+
     print("="*80)
     print("PRODUCT VALIDATION REPORT")
     print("="*80)
-    print("⚠️  Using backend/page_content.json (single source of truth)")
+    print(f"⚠️  Using {args.catalog} (single source of truth)")
     print()
     
     # Load products from page_content.json
-    with open('backend/page_content.json', 'r', encoding='utf-8') as f:
+    with open(args.catalog, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    all_issues = {}
-    total_products = 0
-    products_with_issues = 0
+    report_file, cache_file, jsonl_file = output_paths(args.catalog)
     
-    for category in data.get('page_content', []):
-        if category.get('type') != 'product_category':
-            continue
-        
-        category_title = category.get('title', '')
-        category_id = category.get('id', '')
-        
-        # Check if this is the bestsellers category
-        is_bestseller_category = 'bestseller' in category_title.lower() or 'бестселър' in category_title.lower()
-        
-        print(f"\n{'='*80}")
-        print(f"Category: {category_title}")
-        print(f"Bestseller Category: {'Yes (skipping detailed validation)' if is_bestseller_category else 'No'}")
-        print(f"{'='*80}")
+    if args.workers or args.jsonl is not None:
+        # Scale mode: no per-product output, report streamed as JSON Lines
+        output = args.jsonl or jsonl_file
+        total_products, products_with_issues = validate_to_jsonl(
+            data, output, args.workers, args.chunk_size, args.sort
+        )
+        print(f"Total products checked: {total_products}")
+        print(f"Products with issues: {products_with_issues}")
+        print(f"Products valid: {total_products - products_with_issues}")
+        print(f"\nReport saved to {output}")
+        images_ok = check_image_refs(data) if args.images else True
+        return products_with_issues == 0 and images_ok
+    
+    report, checked = run_validation(data, args.full, report_file, cache_file)
+    total_products = report['total_products']
+    products_with_issues = report['products_with_issues']
+    all_issues = report['issues']
+    
+    current_category = None
+    for category_title, product, issues in checked:
+        if category_title != current_category:
+            current_category = category_title
+            print(f"\n{'='*80}")
+            print(f"Category: {category_title}")
+            print(f"{'='*80}")
         
-        for product in category.get('products', []):
-            total_products += 1
-            
-            product_id = product.get('product_id', '')
-            product_name = product.get('public_data', {}).get('name', '')
-            
-            issues = validate_product(product, is_bestseller_category)
-            
-            if issues:
-                products_with_issues += 1
-                all_issues[product_id] = {
-                    'name': product_name,
-                    'category': category_title,
-                    'issues': issues
-                }
-                
-                print(f"\n⚠️  {product_name} ({product_id})")
-                for issue in issues:
-                    print(f"     - {issue}")
-            else:
-                print(f"\n✅  {product_name} ({product_id}) - Всички полета са налични")
+        product_id = product.get('product_id', '')
+        product_name = product.get('public_data', {}).get('name', '')
+        if issues:
+            print(f"\n⚠️  {product_name} ({product_id})")
+            for issue in issues:
+                print(f"     - {issue}")
+        else:
+            print(f"\n✅  {product_name} ({product_id}) - Всички полета са налични")
     
     # Summary
     print(f"\n{'='*80}")
     print("SUMMARY")
     print(f"{'='*80}")
     print(f"Total products checked: {total_products}")
+    print(f"Re-validated: {len(checked)} (unchanged, from cache: {total_products - len(checked)})")
     print(f"Products with issues: {products_with_issues}")
     print(f"Products valid: {total_products - products_with_issues}")
     
@@ -159,18 +347,11 @@ def main():
             for issue in info['issues']:
                 print(f"  - {issue}")
     
-    # Save report
-    report_file = 'backend/validation_report.json'
-    with open(report_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'total_products': total_products,
-            'products_with_issues': products_with_issues,
-            'issues': all_issues
-        }, f, ensure_ascii=False, indent=2)
-    
     print(f"\nReport saved to {report_file}")
     
-    return len(all_issues) == 0
+    images_ok = check_image_refs(data) if args.images else True
+    
+    return len(all_issues) == 0 and images_ok
 
 if __name__ == '__main__':
     success = main()